@@ -0,0 +1,131 @@
+"""Benchmark suite of the earthquake computation core.
+
+The earthquake package is loaded without Home Assistant and without network access,
+the timings are measured by pytest-benchmark.
+
+Usage:
+    pytest benchmarks                               # compare with the baseline
+    pytest benchmarks --baseline-save               # update the baseline
+    pytest benchmarks --baseline-tolerance 0.5
+
+The run fails if any benchmark is slower than its baseline by more than the tolerance,
+the fastest round of each benchmark is compared.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import sys
+import types
+
+import pytest
+
+PACKAGE_PATH = Path(__file__).resolve().parents[1] / "custom_components" / "trem"
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_TOLERANCE = 0.5
+
+# The fastest round in seconds of each benchmark of this run
+_results: dict[str, float] = {}
+_regressions: list[str] = []
+
+
+def load_package() -> None:
+    """Register the integration package without running its Home Assistant setup."""
+
+    if "trem" in sys.modules:
+        return
+    package = types.ModuleType("trem")
+    package.__path__ = [str(PACKAGE_PATH)]
+    sys.modules["trem"] = package
+
+
+load_package()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add the baseline options."""
+
+    group = parser.getgroup("baseline")
+    group.addoption(
+        "--baseline-save", action="store_true", help="update the benchmark baseline"
+    )
+    group.addoption(
+        "--baseline-tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="allowed slowdown ratio over the baseline",
+    )
+
+
+def _load_baseline() -> dict[str, float]:
+    """Load the baseline seconds of each benchmark."""
+
+    if not BASELINE_PATH.exists():
+        return {}
+    return json.loads(BASELINE_PATH.read_text(encoding="utf-8"))
+
+
+@pytest.fixture(autouse=True)
+def _record_result(request: pytest.FixtureRequest):
+    """Record the fastest round of the benchmark of the test."""
+
+    yield
+    fixture = request.node.funcargs.get("benchmark")
+    if fixture is not None and fixture.stats is not None:
+        _results[request.node.name.removeprefix("test_")] = fixture.stats.stats.min
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    """Compare the results with the baseline, or save them as the baseline."""
+
+    if not _results:
+        return
+
+    config = session.config
+    if config.getoption("--baseline-save"):
+        baseline = _load_baseline()
+        baseline.update({name: round(seconds, 9) for name, seconds in _results.items()})
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=2) + "\n", encoding="utf-8")
+        return
+
+    baseline = _load_baseline()
+    tolerance = config.getoption("--baseline-tolerance")
+    for name, seconds in _results.items():
+        base = baseline.get(name)
+        if base and seconds / base > 1 + tolerance:
+            _regressions.append(name)
+    if _regressions and exitstatus == pytest.ExitCode.OK:
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus: int, config) -> None:
+    """Report the results against the baseline."""
+
+    if not _results:
+        return
+
+    if config.getoption("--baseline-save"):
+        terminalreporter.write_line(f"Baseline saved to {BASELINE_PATH}")
+        return
+
+    baseline = _load_baseline()
+    terminalreporter.section("baseline")
+    terminalreporter.write_line(
+        f"{'benchmark':<34}{'current':>12}{'baseline':>12}{'ratio':>8}"
+    )
+    for name, seconds in _results.items():
+        base = baseline.get(name)
+        terminalreporter.write_line(
+            f"{name:<34}{seconds * 1000:>10.3f}ms"
+            + (
+                f"{base * 1000:>10.3f}ms{seconds / base:>8.2f}"
+                if base
+                else f"{'-':>12}{'-':>8}"
+            )
+        )
+    if _regressions:
+        tolerance = config.getoption("--baseline-tolerance")
+        terminalreporter.write_line(
+            f"Regression over {tolerance:.0%}: {', '.join(_regressions)}", red=True
+        )
@@ -0,0 +1,259 @@
+"""Replay recorded websocket frames against the integration.
+
+A local websocket server stands in for the ExpTech server: it sends the `verify`
+frame, answers the `start` request with an `info` frame and then replays the
+recorded `data` frames (rts, eew, intensity, tsunami), stamped with the send time.
+
+The frames are recorded with the `trem.record` service, or generated with
+`--synthetic SECONDS` (1 Hz RTS frames with an EEW every 5 seconds).
+
+Usage:
+    python benchmarks/replay.py frames.jsonl --speed 10
+    python benchmarks/replay.py --synthetic 120 --speed 0 --drive connection
+
+`--speed 0` replays as fast as possible. `--drive coordinator` reads the frames
+through the coordinator update interval, `--drive connection` reads them as fast
+as the websocket connection can parse them.
+
+Home Assistant is required, no network access is needed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import timedelta
+import json
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+from aiohttp import WSMsgType, web
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.trem.const import CONF_PASS  # noqa: E402
+from custom_components.trem.latency import LatencyHistogram  # noqa: E402
+from custom_components.trem.replay import load_frames  # noqa: E402
+from custom_components.trem.session import WebSocketConnection  # noqa: E402
+from custom_components.trem.update_coordinator import (  # noqa: E402
+    tremUpdateCoordinator,
+)
+
+CREDENTIALS = {"email": "replay@localhost", CONF_PASS: "replay"}
+
+
+def synthetic_frames(seconds: int) -> list[tuple[float, dict]]:
+    """Generate 1 Hz RTS frames with an EEW serial every 5 seconds."""
+
+    frames: list[tuple[float, dict]] = []
+    origin = int(time.time() * 1000)
+    for second in range(seconds):
+        frames.append(
+            (
+                float(second),
+                {
+                    "type": "data",
+                    "data": {
+                        "type": "rts",
+                        "data": {
+                            "time": origin + second * 1000,
+                            "int": [
+                                {"code": code, "i": (second + code) % 5}
+                                for code in range(100, 400)
+                            ],
+                        },
+                    },
+                },
+            )
+        )
+        if second % 5 == 0:
+            frames.append(
+                (
+                    second + 0.5,
+                    {
+                        "type": "data",
+                        "data": {
+                            "type": "eew",
+                            "author": "cwa",
+                            "id": "replay",
+                            "serial": second // 5 + 1,
+                            "final": 0,
+                            "eq": {
+                                "time": origin,
+                                "lon": 121.6 + second * 0.001,
+                                "lat": 23.8,
+                                "depth": 10,
+                                "mag": 6.0 + second * 0.01,
+                                "loc": "replay",
+                                "max": 5,
+                            },
+                        },
+                    },
+                )
+            )
+    return frames
+
+
+class ReplayServer:
+    """A local websocket stand-in server replaying the frames."""
+
+    def __init__(self, frames: list[tuple[float, dict]], speed: float) -> None:
+        """Initialize the server."""
+
+        self._frames = [
+            (offset, frame)
+            for offset, frame in frames
+            if frame.get("type") not in ("verify", "info")
+        ]
+        self._speed = speed
+        self.sent = 0
+        self.done = asyncio.Event()
+        self._runner: web.AppRunner | None = None
+        self.url = ""
+
+    async def start(self) -> None:
+        """Start the server on a random local port."""
+
+        app = web.Application()
+        app.router.add_get("/websocket", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]  # noqa: SLF001
+        self.url = f"ws://127.0.0.1:{port}/websocket"
+
+    async def stop(self) -> None:
+        """Stop the server."""
+
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    async def _handle(self, request: web.Request) -> web.WebSocketResponse:
+        """Handle a websocket client."""
+
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        await ws.send_json({"type": "verify"})
+
+        msg = await ws.receive()
+        if msg.type != WSMsgType.TEXT:
+            return ws
+        services = json.loads(msg.data).get("service", [])
+        await ws.send_json({"type": "info", "data": {"code": 200, "list": services}})
+
+        start = time.monotonic()
+        first = self._frames[0][0] if self._frames else 0
+        for offset, frame in self._frames:
+            if self._speed > 0:
+                delay = start + (offset - first) / self._speed - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            frame["time"] = int(time.time() * 1000)
+            await ws.send_str(json.dumps(frame))
+            self.sent += 1
+        self.done.set()
+
+        async for _ in ws:
+            pass
+        return ws
+
+
+async def replay(args: argparse.Namespace) -> None:
+    """Replay the frames and print the measurement."""
+
+    frames = (
+        synthetic_frames(args.synthetic) if args.synthetic else load_frames(args.file)
+    )
+    server = ReplayServer(frames, args.speed)
+    await server.start()
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        coordinator = tremUpdateCoordinator(
+            hass, CREDENTIALS, timedelta(seconds=args.interval)
+        )
+        connection = WebSocketConnection(
+            hass, server.url, dict(CREDENTIALS), coordinator.latency
+        )
+        connection._access_token = "replay"  # noqa: SLF001
+        await connection.connect()
+        coordinator.connection = connection
+
+        latency = LatencyHistogram()
+        received = 0
+        max_backlog = 0
+        recv = connection.recv
+
+        async def _recv() -> dict:
+            nonlocal received
+            resp = await recv()
+            data: dict = resp.get("data", {})
+            if data.get("type") == "data":
+                received += 1
+                latency.record(time.time() - data["time"] / 1000)
+            return resp
+
+        connection.recv = _recv
+
+        start = time.monotonic()
+        while not (server.done.is_set() and received >= server.sent):
+            if args.drive == "coordinator":
+                await coordinator._async_update_data()  # noqa: SLF001
+                await asyncio.sleep(args.interval)
+            else:
+                await connection.recv()
+            max_backlog = max(max_backlog, server.sent - received)
+        elapsed = time.monotonic() - start
+
+        await connection.close()
+        await hass.async_stop(force=True)
+    await server.stop()
+
+    summary = latency.summary()
+    print(f"frames          {received}")
+    print(f"elapsed         {elapsed:.2f}s")
+    print(f"throughput      {received / elapsed:.1f} frames/s")
+    print(f"max backlog     {max_backlog} frames")
+    print(
+        f"latency (ms)    p50 {summary['p50']}  p95 {summary['p95']}"
+        f"  p99 {summary['p99']}  max {summary['max']}"
+    )
+    for stage, stage_summary in coordinator.latency.summary().items():
+        if stage_summary["count"]:
+            print(
+                f"{stage:<16}p50 {stage_summary['p50']}ms"
+                f"  p99 {stage_summary['p99']}ms"
+            )
+
+
+def main() -> None:
+    """Parse the arguments and replay."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("file", nargs="?", help="recorded frames (JSON lines)")
+    parser.add_argument(
+        "--synthetic", type=int, default=0, help="generate frames of N seconds"
+    )
+    parser.add_argument(
+        "--speed", type=float, default=1, help="replay speed, 0 for max speed"
+    )
+    parser.add_argument(
+        "--drive", choices=["coordinator", "connection"], default="coordinator"
+    )
+    parser.add_argument(
+        "--interval", type=float, default=1, help="coordinator update interval"
+    )
+    args = parser.parse_args()
+    if not args.file and not args.synthetic:
+        parser.error("either a recorded file or --synthetic is required")
+
+    asyncio.run(replay(args))
+
+
+if __name__ == "__main__":
+    main()
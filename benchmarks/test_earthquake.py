@@ -0,0 +1,166 @@
+"""Benchmarks of the earthquake computation core."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+from trem.earthquake import model
+from trem.earthquake.eew import EEW, EarthquakeData
+from trem.earthquake.table import get_intensity_table
+
+PACKAGE_PATH = Path(__file__).resolve().parents[1] / "custom_components" / "trem"
+
+SAMPLE_EEW = {
+    "author": "cwa",
+    "id": "1130418",
+    "serial": 1,
+    "status": 0,
+    "final": 0,
+    "eq": {
+        "time": 1712102038000,
+        "lon": 121.67,
+        "lat": 23.77,
+        "depth": 15,
+        "mag": 7.1,
+        "loc": "花蓮縣壽豐鄉",
+        "max": 7,
+    },
+    "time": 1712102056000,
+}
+
+IMPORT_CODE = (
+    "import sys, types\n"
+    f"package = types.ModuleType('trem'); package.__path__ = [{str(PACKAGE_PATH)!r}]\n"
+    "sys.modules['trem'] = package\n"
+    "import trem.earthquake.eew\n"
+)
+
+
+@pytest.fixture(scope="module")
+def earthquake() -> EarthquakeData:
+    """The earthquake of the sample EEW, with the expected intensity and maps drawn once."""
+
+    earthquake = EEW.from_dict(SAMPLE_EEW).earthquake
+    earthquake.calc_expected_intensity()
+    earthquake.map.draw()
+    earthquake.raster.draw()
+    return earthquake
+
+
+@pytest.fixture(scope="module")
+def intensity_samples() -> tuple[np.ndarray, np.ndarray]:
+    """The distances and site effects of 36700 regions."""
+
+    rng = np.random.default_rng(0)
+    return rng.uniform(1, 600, 36700), rng.uniform(0.5, 3, 36700)
+
+
+def test_import(benchmark) -> None:
+    """Import of the earthquake package in a new interpreter."""
+
+    benchmark.pedantic(
+        subprocess.run,
+        args=([sys.executable, "-c", IMPORT_CODE],),
+        kwargs={"check": True},
+        rounds=3,
+        iterations=1,
+    )
+
+
+def test_get_wave_model_cold(benchmark) -> None:
+    """Wave model of a depth without the cached TauP models."""
+
+    benchmark.pedantic(
+        model.get_wave_model,
+        setup=lambda: (model.clear_wave_models(15), ((15,), {}))[1],
+        rounds=3,
+        iterations=1,
+    )
+
+
+def test_get_wave_model_warm(benchmark) -> None:
+    """Wave model of a cached depth."""
+
+    model.get_wave_model(15)
+    benchmark(model.get_wave_model, 15)
+
+
+def test_eew_from_dict(benchmark) -> None:
+    """Parse the EEW of the api format."""
+
+    benchmark(EEW.from_dict, SAMPLE_EEW)
+
+
+def test_expected_intensity_all_regions(benchmark, earthquake) -> None:
+    """Expected intensity and travel time of all regions."""
+
+    benchmark(model.calculate_expected_intensity_and_travel_time, earthquake)
+
+
+def test_intensity_exact_36k(benchmark, intensity_samples) -> None:
+    """Intensity formula of 36700 regions."""
+
+    distance, site_effect = intensity_samples
+    benchmark(model._calculate_intensity_array, distance, 6.3, 10, site_effect)
+
+
+def test_intensity_table_36k(benchmark, intensity_samples) -> None:
+    """Intensity lookup table of 36700 regions."""
+
+    distance, site_effect = intensity_samples
+    table = get_intensity_table()
+    benchmark(table.lookup, distance, 6.3, 10, site_effect)
+
+
+def test_intensity_table_error() -> None:
+    """The lookup table stays within its error bound against the exact formula."""
+
+    table = get_intensity_table()
+    rng = np.random.default_rng(0)
+    distance = rng.uniform(1, 1000, 100000)
+    site_effect = rng.uniform(0.5, 3, 100000)
+    for magnitude in rng.uniform(0, 9.5, 50):
+        depth = int(rng.integers(1, 300))
+        exact = model._calculate_intensity_array(distance, magnitude, depth, site_effect)
+        approximate = table.lookup(distance, magnitude, depth, site_effect)
+        assert np.max(np.abs(exact - approximate)) <= table.max_error + 1e-9
+
+
+def test_map_draw(benchmark, earthquake) -> None:
+    """Draw the isoseismal map with matplotlib."""
+
+    benchmark.pedantic(earthquake.map.draw, rounds=3, iterations=1)
+
+
+def test_map_draw_wave(benchmark, earthquake) -> None:
+    """Draw the wave fronts with matplotlib."""
+
+    benchmark(earthquake.map.draw_wave, 10)
+
+
+def test_map_save(benchmark, earthquake) -> None:
+    """Encode the matplotlib map."""
+
+    benchmark.pedantic(earthquake.map.save, rounds=3, iterations=1)
+
+
+def test_raster_draw(benchmark, earthquake) -> None:
+    """Draw the isoseismal map with the raster renderer."""
+
+    benchmark.pedantic(earthquake.raster.draw, rounds=3, iterations=1)
+
+
+def test_raster_draw_wave(benchmark, earthquake) -> None:
+    """Draw the wave fronts with the raster renderer."""
+
+    benchmark(earthquake.raster.draw_wave, 10)
+
+
+def test_raster_save(benchmark, earthquake) -> None:
+    """Encode the raster map."""
+
+    benchmark.pedantic(earthquake.raster.save, rounds=3, iterations=1)
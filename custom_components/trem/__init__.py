@@ -3,9 +3,7 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
-import os
 from typing import Any
 
 from homeassistant.components import persistent_notification
@@ -19,47 +17,48 @@ from homeassistant.const import (
 )
 from homeassistant.core import HomeAssistant
 
+from .assets import async_get_assets
 from .const import (
     CLIENT_NAME,
+    CONF_COORDINATES,
     CONF_NODE,
     CONF_PASS,
     DOMAIN,
+    HISTORY_FILENAME,
+    HISTORY_RETENTION,
     HTTPS_API_COORDINATOR_UPDATE_INTERVAL,
     MIN_HA_MAJ_VER,
     MIN_HA_MIN_VER,
     PLATFORMS,
     STARTUP,
     TREM_COORDINATOR,
+    TREM_HISTORY,
     TREM_NAME,
+    TREM_REGIONS,
     UPDATE_LISTENER,
     WEBSOCKET_COORDINATOR_UPDATE_INTERVAL,
     __min_ha_version__,
     __version__,
 )
+from .earthquake.location import REGIONS, RegionLocation
+from .earthquake.spatial import create_custom_region
+from .history import HistoryStore
 from .services import register_services
+from .snapshot import async_restore_snapshot, get_snapshot_store
 from .update_coordinator import tremUpdateCoordinator
+from .utils import parse_coordinates
+from .websocket_api import async_register_websocket_commands
 
 _LOGGER = logging.getLogger(__name__)
 
 
-async def getRegionCode() -> dict:
-    """Get the region options."""
+def resolve_custom_regions(coordinates: str) -> list[RegionLocation]:
+    """Resolve the user-defined coordinates to regions."""
 
-    directory = os.path.dirname(os.path.realpath(__file__))
-    region_path = os.path.join(directory, "asset/region.json")
-    with open(
-        region_path,
-        encoding="utf-8",
-    ) as f:
-        codes: dict = {}
-        data: dict = json.load(f)
-        for city, region in data.items():
-            for town in region:
-                area = region[town]["area"]
-                if area not in codes:
-                    codes[area] = f"===== {area} ====="
-                codes[region[town]["code"]] = f"{city}{town}"
-    return codes
+    return [
+        create_custom_region(lon, lat, -(i + 1), name)
+        for i, (name, lat, lon) in enumerate(parse_coordinates(coordinates))
+    ]
 
 
 async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
@@ -79,7 +78,11 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
     region: int = _get_config_value(config_entry, CONF_REGION, None)
     email: str | None = _get_config_value(config_entry, CONF_EMAIL, None)
     passwd: str | None = _get_config_value(config_entry, CONF_PASSWORD, None)
-    codes = await getRegionCode()
+    coordinates: str = _get_config_value(config_entry, CONF_COORDINATES, "")
+    assets = await async_get_assets(hass)
+    custom_regions = await hass.async_add_executor_job(
+        resolve_custom_regions, coordinates
+    )
 
     # migrate data (also after first setup) to options
     if config_entry.data:
@@ -105,12 +108,27 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
         hass,
         base_info,
         update_interval,
+        [REGIONS[region], *custom_regions],
     )
     domain_data = {
         TREM_COORDINATOR: tremCoordinator,
-        TREM_NAME: codes[region],
+        TREM_NAME: assets.region_name(region),
+        TREM_REGIONS: custom_regions,
     }
 
+    # The history store is shared by the config entries
+    history: HistoryStore | None = hass.data.get(TREM_HISTORY)
+    if history is None:
+        history = HistoryStore(hass.config.path(HISTORY_FILENAME), HISTORY_RETENTION)
+        await hass.async_add_executor_job(history.open)
+        hass.data[TREM_HISTORY] = history
+    tremCoordinator.history = history
+
+    # Resume the EEW in progress and the prepared caches after a restart
+    await async_restore_snapshot(
+        hass, get_snapshot_store(hass, config_entry.entry_id), tremCoordinator
+    )
+
     await tremCoordinator.async_config_entry_first_refresh()
     hass.data[DOMAIN][config_entry.entry_id] = domain_data
 
@@ -122,6 +140,7 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
     update_listener = config_entry.add_update_listener(async_update_options)
     hass.data[DOMAIN][config_entry.entry_id][UPDATE_LISTENER] = update_listener
     register_services(hass)
+    async_register_websocket_commands(hass)
 
     _LOGGER.info(STARTUP)
     return True
@@ -160,9 +179,19 @@ async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry):
         hass.data[DOMAIN].pop(config_entry.entry_id)
         if not hass.data[DOMAIN]:
             hass.data.pop(DOMAIN)
+
+            history: HistoryStore | None = hass.data.pop(TREM_HISTORY, None)
+            if history is not None:
+                await hass.async_add_executor_job(history.close)
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Remove the snapshot of a config entry."""
+
+    await get_snapshot_store(hass, config_entry.entry_id).async_remove()
+
+
 async def async_reload_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
     """Reload a config entry."""
 
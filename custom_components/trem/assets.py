@@ -0,0 +1,92 @@
+"""Asset catalog for the Taiwan Real-time Earthquake Monitoring."""
+
+from __future__ import annotations
+
+import os
+
+from PIL import Image
+
+from homeassistant.core import HomeAssistant
+
+from .const import TREM_ASSETS
+from .earthquake.location import REGION_COLUMNS, REGIONS, RegionColumns, RegionLocation
+from .earthquake.style import get_legend
+
+ASSET_DIRECTORY = os.path.join(os.path.dirname(os.path.realpath(__file__)), "asset")
+
+
+class AssetCatalog:
+    """Represents the region columns and the static images of the assets."""
+
+    def __init__(
+        self,
+        regions: list[RegionLocation],
+        columns: RegionColumns,
+        default_image: bytes,
+        legend: Image.Image,
+    ) -> None:
+        """Initialize the catalog."""
+
+        # Shared with the earthquake package, so the arrays are built once
+        self.columns = columns
+        self.codes = columns.codes
+        self.lon = columns.lon
+        self.lat = columns.lat
+        self.site = columns.site_effect
+        self.city = columns.city
+        self.area = columns.area
+        self.names: list[str] = [f"{region.city}{region.name}" for region in regions]
+        self.default_image = default_image
+        self.legend = legend
+
+        # Selector options of the config flows grouped by area headers, the values are strings
+        areas: dict[str, list[dict[str, str]]] = {}
+        for row, code in enumerate(self.codes.tolist()):
+            areas.setdefault(self.area[row], []).append(
+                {"value": str(code), "label": self.names[row]}
+            )
+        self.region_options: list[dict[str, str]] = [
+            option
+            for area, options in areas.items()
+            for option in (
+                {"value": f"area_{area}", "label": f"===== {area} ====="},
+                *options,
+            )
+        ]
+
+    def row(self, code: int) -> int | None:
+        """Return the row of a region code."""
+
+        return self.columns.row(code)
+
+    def region_code(self, value: str) -> int | None:
+        """Return the region code of a selector value, None for an area header."""
+
+        return int(value) if value.lstrip("-").isdigit() else None
+
+    def region_name(self, code: int | None) -> str | None:
+        """Return the city and town name of a region code."""
+
+        row = None if code is None else self.columns.row(code)
+        return None if row is None else self.names[row]
+
+
+def load_assets() -> AssetCatalog:
+    """Load the asset catalog, the regions are parsed once by the earthquake package."""
+
+    with open(os.path.join(ASSET_DIRECTORY, "default.png"), "rb") as f:
+        default_image = f.read()
+    # Shared with the map renderers, so the first draw does not read it on the loop
+    return AssetCatalog(
+        list(REGIONS.values()), REGION_COLUMNS, default_image, get_legend()
+    )
+
+
+async def async_get_assets(hass: HomeAssistant) -> AssetCatalog:
+    """Return the asset catalog, loaded once in the executor."""
+
+    assets: AssetCatalog | None = hass.data.get(TREM_ASSETS)
+    if assets is None:
+        assets = await hass.async_add_executor_job(load_assets)
+        hass.data[TREM_ASSETS] = assets
+    return assets
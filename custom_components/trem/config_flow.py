@@ -5,7 +5,6 @@ from __future__ import annotations
 from http import HTTPStatus
 import json
 import logging
-import os
 import re
 from typing import Any
 
@@ -34,23 +33,45 @@ from homeassistant.const import (
 )
 from homeassistant.core import callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.selector import (
+    SelectSelector,
+    SelectSelectorConfig,
+    SelectSelectorMode,
+)
 
+from .assets import async_get_assets
 from .const import (
     BASE_URLS,
     CLIENT_NAME,
+    CONF_COORDINATES,
     CONF_DRAW_MAP,
+    CONF_IMAGE_FORMAT,
+    CONF_IMAGE_QUALITY,
+    CONF_MAP_BACKEND,
     CONF_NODE,
     CONF_PASS,
     CONF_PRESERVE_DATA,
+    DEFAULT_IMAGE_FORMAT,
+    DEFAULT_IMAGE_QUALITY,
+    DEFAULT_MAP_BACKEND,
     DOMAIN,
     FREE_PLAN,
     HA_USER_AGENT,
+    IMAGE_FORMATS,
+    MAP_BACKENDS,
     LOGIN_URL,
     REQUEST_TIMEOUT,
     SUBSCRIBE_PLAN,
     __version__,
 )
-from .exceptions import AccountInvalid, CannotConnect, FCMTokenInvalid, RegionInvalid
+from .exceptions import (
+    AccountInvalid,
+    CannotConnect,
+    CoordinatesInvalid,
+    FCMTokenInvalid,
+    RegionInvalid,
+)
+from .utils import parse_coordinates
 
 ACTIONS = {
     "customizing": FREE_PLAN,
@@ -60,24 +81,21 @@ ACTIONS = {
 _LOGGER = logging.getLogger(__name__)
 
 
-async def getRegionCode() -> dict:
-    """Get the region options."""
+async def _region_field(
+    hass: core.HomeAssistant, region: int | None
+) -> dict[vol.Required, SelectSelector]:
+    """Return the schema field selecting the monitoring region."""
 
-    directory = os.path.dirname(os.path.realpath(__file__))
-    region_path = os.path.join(directory, "asset/region.json")
-    with open(
-        region_path,
-        encoding="utf-8",
-    ) as f:
-        codes: dict = {}
-        data: dict = json.load(f)
-        for city, region in data.items():
-            for town in region:
-                area = region[town]["area"]
-                if area not in codes:
-                    codes[area] = f"===== {area} ====="
-                codes[region[town]["code"]] = f"{city}{town}"
-    return codes
+    assets = await async_get_assets(hass)
+    return {
+        vol.Required(
+            CONF_REGION, default=vol.UNDEFINED if region is None else str(region)
+        ): SelectSelector(
+            SelectSelectorConfig(
+                options=assets.region_options, mode=SelectSelectorMode.DROPDOWN
+            )
+        )
+    }
 
 
 async def validate_input(
@@ -94,14 +112,18 @@ async def validate_input(
     region_name: str = ""
 
     if CONF_REGION in user_input:
-        codes = await getRegionCode()
-        if user_input[CONF_REGION] in codes:
-            region_name = codes[user_input[CONF_REGION]]
-        else:
+        assets = await async_get_assets(hass)
+        region_name = assets.region_name(user_input[CONF_REGION])
+        if region_name is None:
             raise RegionInvalid
     else:
         raise RegionInvalid
 
+    try:
+        parse_coordinates(user_input.get(CONF_COORDINATES, ""))
+    except ValueError as ex:
+        raise CoordinatesInvalid from ex
+
     if CONF_EMAIL in user_input:
         try:
             account: str = user_input[CONF_EMAIL]
@@ -183,8 +205,12 @@ class tremFlowHandler(ConfigFlow, domain=DOMAIN):
         self._node: str | None = None
         self._email: str | None = None
         self._password: str | None = None
+        self._coordinates: str | None = None
         self._preserve_data: bool | None = None
         self._draw_map: bool | None = None
+        self._map_backend: str | None = None
+        self._image_format: str | None = None
+        self._image_quality: int | None = None
 
     @staticmethod
     @callback
@@ -218,6 +244,9 @@ class tremFlowHandler(ConfigFlow, domain=DOMAIN):
         if user_input is None:
             user_input = {}
         else:
+            # The region selector values are strings, None for an area header
+            assets = await async_get_assets(self.hass)
+            user_input[CONF_REGION] = assets.region_code(user_input[CONF_REGION])
             try:
                 region_code = user_input.get(CONF_REGION, None)
                 await self.async_set_unique_id(f"{DOMAIN}_{region_code}_monitoring")
@@ -234,20 +263,36 @@ class tremFlowHandler(ConfigFlow, domain=DOMAIN):
                 errors["base"] = "token_invalid"
             except RegionInvalid:
                 errors["base"] = "region_invalid"
+            except CoordinatesInvalid:
+                errors["base"] = "coordinates_invalid"
             except Exception:
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = "unknown"
 
         self._region = user_input.get(CONF_REGION, None)
+        self._coordinates = user_input.get(CONF_COORDINATES, "")
         self._preserve_data = user_input.get(CONF_PRESERVE_DATA, False)
         self._draw_map = user_input.get(CONF_DRAW_MAP, False)
+        self._map_backend = user_input.get(CONF_MAP_BACKEND, DEFAULT_MAP_BACKEND)
+        self._image_format = user_input.get(CONF_IMAGE_FORMAT, DEFAULT_IMAGE_FORMAT)
+        self._image_quality = user_input.get(CONF_IMAGE_QUALITY, DEFAULT_IMAGE_QUALITY)
 
         data_schema = vol.Schema(
             {
-                vol.Required(CONF_REGION, default=self._region): int,
+                **await _region_field(self.hass, self._region),
                 vol.Required(CONF_NODE, default="random"): str,
+                vol.Optional(CONF_COORDINATES, default=self._coordinates): str,
                 vol.Optional(CONF_PRESERVE_DATA, default=self._preserve_data): bool,
                 vol.Optional(CONF_DRAW_MAP, default=self._draw_map): bool,
+                vol.Optional(CONF_MAP_BACKEND, default=self._map_backend): vol.In(
+                    MAP_BACKENDS
+                ),
+                vol.Optional(CONF_IMAGE_FORMAT, default=self._image_format): vol.In(
+                    IMAGE_FORMATS
+                ),
+                vol.Optional(
+                    CONF_IMAGE_QUALITY, default=self._image_quality
+                ): vol.All(int, vol.Range(min=1, max=100)),
             }
         )
 
@@ -266,6 +311,9 @@ class tremFlowHandler(ConfigFlow, domain=DOMAIN):
         if user_input is None:
             user_input = {}
         else:
+            # The region selector values are strings, None for an area header
+            assets = await async_get_assets(self.hass)
+            user_input[CONF_REGION] = assets.region_code(user_input[CONF_REGION])
             email = user_input.get(CONF_EMAIL, "")
             name = f"{DOMAIN} {email} Monitoring"
             unique_id = re.sub(r"\s+|@", "_", name.lower())
@@ -285,6 +333,8 @@ class tremFlowHandler(ConfigFlow, domain=DOMAIN):
                 errors["base"] = "token_invalid"
             except RegionInvalid:
                 errors["base"] = "region_invalid"
+            except CoordinatesInvalid:
+                errors["base"] = "coordinates_invalid"
             except Exception:
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = "unknown"
@@ -292,16 +342,30 @@ class tremFlowHandler(ConfigFlow, domain=DOMAIN):
         self._email = user_input.get(CONF_EMAIL, "")
         self._password = user_input.get(CONF_PASSWORD, "")
         self._region = user_input.get(CONF_REGION, None)
+        self._coordinates = user_input.get(CONF_COORDINATES, "")
         self._preserve_data = user_input.get(CONF_PRESERVE_DATA, False)
         self._draw_map = user_input.get(CONF_DRAW_MAP, False)
+        self._map_backend = user_input.get(CONF_MAP_BACKEND, DEFAULT_MAP_BACKEND)
+        self._image_format = user_input.get(CONF_IMAGE_FORMAT, DEFAULT_IMAGE_FORMAT)
+        self._image_quality = user_input.get(CONF_IMAGE_QUALITY, DEFAULT_IMAGE_QUALITY)
 
         data_schema = vol.Schema(
             {
                 vol.Required(CONF_EMAIL, default=self._email): str,
                 vol.Required(CONF_PASSWORD, default=self._password): str,
-                vol.Required(CONF_REGION, default=self._region): int,
+                **await _region_field(self.hass, self._region),
+                vol.Optional(CONF_COORDINATES, default=self._coordinates): str,
                 vol.Optional(CONF_PRESERVE_DATA, default=self._preserve_data): bool,
                 vol.Optional(CONF_DRAW_MAP, default=self._draw_map): bool,
+                vol.Optional(CONF_MAP_BACKEND, default=self._map_backend): vol.In(
+                    MAP_BACKENDS
+                ),
+                vol.Optional(CONF_IMAGE_FORMAT, default=self._image_format): vol.In(
+                    IMAGE_FORMATS
+                ),
+                vol.Optional(
+                    CONF_IMAGE_QUALITY, default=self._image_quality
+                ): vol.All(int, vol.Range(min=1, max=100)),
             }
         )
 
@@ -323,8 +387,12 @@ class OptionsFlowHandler(OptionsFlow):
         self._node: str | None = None
         self._email: str | None = None
         self._password: str | None = None
+        self._coordinates: str | None = None
         self._preserve_data: bool | None = None
         self._draw_map: bool | None = None
+        self._map_backend: str | None = None
+        self._image_format: str | None = None
+        self._image_quality: int | None = None
 
     async def async_step_init(self, user_input=None) -> FlowResult:
         """Handle a Options Flow initialized by the user."""
@@ -355,6 +423,8 @@ class OptionsFlowHandler(OptionsFlow):
                     return self.async_create_entry(title=None, data=None)
             except CannotConnect:
                 errors["base"] = "cannot_connect"
+            except CoordinatesInvalid:
+                errors["base"] = "coordinates_invalid"
             except Exception:
                 _LOGGER.exception(
                     "An unexpected exception occurred during the configuration flow"
@@ -363,14 +433,34 @@ class OptionsFlowHandler(OptionsFlow):
 
         self._region = self._config.options.get(CONF_REGION, None)
         self._node = self._config.options.get(CONF_NODE, "random")
+        self._coordinates = self._config.options.get(CONF_COORDINATES, "")
         self._preserve_data = self._config.options.get(CONF_PRESERVE_DATA, False)
         self._draw_map = self._config.options.get(CONF_DRAW_MAP, False)
+        self._map_backend = self._config.options.get(
+            CONF_MAP_BACKEND, DEFAULT_MAP_BACKEND
+        )
+        self._image_format = self._config.options.get(
+            CONF_IMAGE_FORMAT, DEFAULT_IMAGE_FORMAT
+        )
+        self._image_quality = self._config.options.get(
+            CONF_IMAGE_QUALITY, DEFAULT_IMAGE_QUALITY
+        )
 
         data_schema = vol.Schema(
             {
                 vol.Required(CONF_NODE, default=self._node): str,
+                vol.Optional(CONF_COORDINATES, default=self._coordinates): str,
                 vol.Optional(CONF_PRESERVE_DATA, default=self._preserve_data): bool,
                 vol.Optional(CONF_DRAW_MAP, default=self._draw_map): bool,
+                vol.Optional(CONF_MAP_BACKEND, default=self._map_backend): vol.In(
+                    MAP_BACKENDS
+                ),
+                vol.Optional(CONF_IMAGE_FORMAT, default=self._image_format): vol.In(
+                    IMAGE_FORMATS
+                ),
+                vol.Optional(
+                    CONF_IMAGE_QUALITY, default=self._image_quality
+                ): vol.All(int, vol.Range(min=1, max=100)),
             }
         )
 
@@ -407,6 +497,8 @@ class OptionsFlowHandler(OptionsFlow):
                 errors["base"] = "token_invalid"
             except RegionInvalid:
                 errors["base"] = "region_invalid"
+            except CoordinatesInvalid:
+                errors["base"] = "coordinates_invalid"
             except Exception:
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = "unknown"
@@ -414,15 +506,35 @@ class OptionsFlowHandler(OptionsFlow):
         self._region = self._config.options.get(CONF_REGION, None)
         self._email = self._config.options.get(CONF_EMAIL, "")
         self._password = self._config.options.get(CONF_PASSWORD, "")
+        self._coordinates = self._config.options.get(CONF_COORDINATES, "")
         self._preserve_data = self._config.options.get(CONF_PRESERVE_DATA, False)
         self._draw_map = self._config.options.get(CONF_DRAW_MAP, False)
+        self._map_backend = self._config.options.get(
+            CONF_MAP_BACKEND, DEFAULT_MAP_BACKEND
+        )
+        self._image_format = self._config.options.get(
+            CONF_IMAGE_FORMAT, DEFAULT_IMAGE_FORMAT
+        )
+        self._image_quality = self._config.options.get(
+            CONF_IMAGE_QUALITY, DEFAULT_IMAGE_QUALITY
+        )
 
         data_schema = vol.Schema(
             {
                 vol.Required(CONF_EMAIL, default=self._email): str,
                 vol.Optional(CONF_PASSWORD, default=self._password): str,
+                vol.Optional(CONF_COORDINATES, default=self._coordinates): str,
                 vol.Optional(CONF_PRESERVE_DATA, default=self._preserve_data): bool,
                 vol.Optional(CONF_DRAW_MAP, default=self._draw_map): bool,
+                vol.Optional(CONF_MAP_BACKEND, default=self._map_backend): vol.In(
+                    MAP_BACKENDS
+                ),
+                vol.Optional(CONF_IMAGE_FORMAT, default=self._image_format): vol.In(
+                    IMAGE_FORMATS
+                ),
+                vol.Optional(
+                    CONF_IMAGE_QUALITY, default=self._image_quality
+                ): vol.All(int, vol.Range(min=1, max=100)),
             }
         )
 
@@ -36,8 +36,17 @@ EARTHQUAKE_ICON = {
 
 # General sensor attributes
 ATTRIBUTION = "Powered by ExpTech Studio"
+ATTR_CATALOG = "catalog"
+ATTR_COUNT = "count"
+ATTR_DURATION = "duration"
+ATTR_END = "end"
+ATTR_EVENT_ID = "event_id"
+ATTR_EVENT_TYPE = "event_type"
+ATTR_FAST = "fast"
 ATTR_FILENAME = "filename"
 ATTR_ID = "serial"
+ATTR_LIMIT = "limit"
+ATTR_MEMORY = "memory"
 ATTR_AUTHOR = "provider"
 ATTR_LNG = "longitude"
 ATTR_LAT = "latitude"
@@ -47,11 +56,15 @@ ATTR_LOC = "location"
 ATTR_TIME = "time_of_occurrence"
 ATTR_INT = "intensity"
 ATTR_EST = "estimate"
+ATTR_WAVE = "arrived_wave"
 ATTR_CODE = "region"
 ATTR_NODE = "API_Node"
 ATTR_PROTOCOL = "protocol"
 ATTR_OFFSET = "offset"
 ATTR_EQDATA = "earthquake_data"
+ATTR_SEED = "seed"
+ATTR_SERIALS = "serials"
+ATTR_START = "start"
 EARTHQUAKE_ATTR = [
     ATTR_ID,
     ATTR_AUTHOR,
@@ -63,6 +76,7 @@ EARTHQUAKE_ATTR = [
     ATTR_TIME,
     ATTR_INT,
     ATTR_EST,
+    ATTR_WAVE,
 ]
 TSUNAMI_ATTR = [
     ATTR_ID,
@@ -71,18 +85,56 @@ TSUNAMI_ATTR = [
 MANUFACTURER = "ExptechTW"
 
 # Configuration
+CONF_COORDINATES = "coordinates"
 CONF_DRAW_MAP = "draw_map"
+CONF_IMAGE_FORMAT = "image_format"
+CONF_IMAGE_QUALITY = "image_quality"
+CONF_MAP_BACKEND = "map_backend"
 CONF_NODE = "node"
 CONF_PASS = "pass"
 CONF_PRESERVE_DATA = "preserve_data"
 
 # Coordinator
+TREM_ASSETS = "trem_assets"
 TREM_COORDINATOR = "trem_coordinator"
+TREM_HISTORY = "trem_history"
+TREM_MAP_VIEW = "trem_map_view"
 TREM_NAME = "trem_name"
+TREM_REGIONS = "trem_regions"
 UPDATE_LISTENER = "update_listener"
 HTTPS_API_COORDINATOR_UPDATE_INTERVAL = timedelta(seconds=5)
 WEBSOCKET_COORDINATOR_UPDATE_INTERVAL = timedelta(seconds=1)
 
+# Isoseismal map image
+DEFAULT_IMAGE_FORMAT = "png"
+DEFAULT_IMAGE_QUALITY = 80
+IMAGE_FORMATS = ["png", "webp", "jpeg"]
+DEFAULT_MAP_BACKEND = "matplotlib"
+MAP_BACKENDS = ["matplotlib", "raster"]
+MAP_VIEW_URL = "/api/trem/map/{entity_id}"
+RENDER_TTL = timedelta(minutes=3)  # after the final report, then the figure is released
+
+# Event
+EVENT_EEW = "trem_eew"
+EVENT_RTS = "trem_rts"
+EVENT_TSUNAMI = "trem_tsunami"
+
+# Schedule
+COUNTDOWN_THRESHOLDS = [60, 30, 20, 10, 5, 3, 2, 1]  # seconds before S wave arrival
+
+# Event history
+HISTORY_FILENAME = "trem_history.db"
+HISTORY_RETENTION = timedelta(days=365)
+
+# Warm restart snapshot
+SNAPSHOT_DELAY = 10  # seconds
+SNAPSHOT_MAX_AGE = timedelta(minutes=10)  # EEW older than it are not resumed
+SNAPSHOT_VERSION = 1
+
+# Exposure statistics
+EXPOSURE_MAX_AGE = timedelta(days=30)
+EXPOSURE_MAX_EVENTS = 1000
+
 # REST
 HA_USER_AGENT = "TREM custom integration for Home Assistant (https://github.com/gaojiafamily/ha-trem)"
 BASE_URLS = {
@@ -0,0 +1,39 @@
+"""Diagnostics for the Taiwan Real-time Earthquake Monitoring."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_PASS, DOMAIN, TREM_COORDINATOR
+from .earthquake.clock import SERVER_CLOCK
+from .update_coordinator import tremUpdateCoordinator
+
+TO_REDACT = {CONF_EMAIL, CONF_PASSWORD, CONF_PASS}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, config_entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+
+    coordinator: tremUpdateCoordinator = hass.data[DOMAIN][config_entry.entry_id][
+        TREM_COORDINATOR
+    ]
+
+    return {
+        "options": async_redact_data(config_entry.options, TO_REDACT),
+        "plan": coordinator.plan,
+        "status": coordinator.status,
+        "station": coordinator.station,
+        "retry": coordinator.retry,
+        "clock": {
+            "synced": SERVER_CLOCK.synced,
+            "offset": round(SERVER_CLOCK.offset, 3),
+        },
+        "latency": coordinator.latency.summary(),
+    }
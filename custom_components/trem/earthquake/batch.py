@@ -0,0 +1,308 @@
+"""Batch evaluation of earthquake catalogs."""
+
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+import multiprocessing
+from multiprocessing.context import BaseContext
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Sequence
+
+import numpy as np
+
+from ..utils import MISSING
+from .location import REGION_COLUMNS, REGIONS, RegionLocation
+from .model import EARTH_RADIUS, _calculate_intensity_array, get_wave_model
+from .table import IntensityTable
+
+if TYPE_CHECKING:
+    from .eew import EarthquakeData
+
+# Read-only region arrays and lookup table of the worker process, set by the pool initializer
+_region_arrays: tuple[np.ndarray, np.ndarray, np.ndarray] = MISSING
+_intensity_table: IntensityTable = MISSING
+
+
+class CatalogResults:
+    """
+    Represents the expected intensity and travel time of a catalog, one row per earthquake
+    and one column per region.
+    """
+
+    __slots__ = ("_codes", "_distance", "_intensity", "_p_travel", "_s_travel")
+
+    def __init__(
+        self,
+        codes: np.ndarray,
+        distance: np.ndarray,
+        intensity: np.ndarray,
+        p_travel: np.ndarray,
+        s_travel: np.ndarray,
+    ) -> None:
+        """
+        Initialize the catalog results.
+
+        :param codes: The region codes array.
+        :type codes: np.ndarray
+        :param distance: The hypocentral distance matrix in kilometers.
+        :type distance: np.ndarray
+        :param intensity: The expected intensity matrix.
+        :type intensity: np.ndarray
+        :param p_travel: The P wave travel time matrix in seconds.
+        :type p_travel: np.ndarray
+        :param s_travel: The S wave travel time matrix in seconds.
+        :type s_travel: np.ndarray
+        """
+        self._codes = codes
+        self._distance = distance
+        self._intensity = intensity
+        self._p_travel = p_travel
+        self._s_travel = s_travel
+
+    @property
+    def codes(self) -> np.ndarray:
+        """
+        The region codes of the columns.
+        """
+        return self._codes
+
+    @property
+    def distance(self) -> np.ndarray:
+        """
+        The hypocentral distance matrix in kilometers.
+        """
+        return self._distance
+
+    @property
+    def intensity(self) -> np.ndarray:
+        """
+        The expected intensity matrix.
+        """
+        return self._intensity
+
+    @property
+    def p_travel(self) -> np.ndarray:
+        """
+        The P wave travel time matrix in seconds.
+        """
+        return self._p_travel
+
+    @property
+    def s_travel(self) -> np.ndarray:
+        """
+        The S wave travel time matrix in seconds.
+        """
+        return self._s_travel
+
+    def exposure(self, intensity: float) -> dict[int, int]:
+        """
+        Count the earthquakes of each region with expected intensity at least the given value.
+
+        :param intensity: The intensity threshold.
+        :type intensity: float
+        :return: The number of earthquakes of each region code.
+        :rtype: dict[int, int]
+        """
+        counts = np.count_nonzero(self._intensity >= intensity, axis=0)
+        return dict(zip(self._codes.tolist(), counts.tolist()))
+
+    def to_columns(self) -> dict[str, np.ndarray]:
+        """
+        Flatten the results to the columnar table, one row per earthquake and region.
+
+        :return: The columns `event` (catalog index), `code`, `distance`, `intensity`,
+            `p_travel` and `s_travel`.
+        :rtype: dict[str, np.ndarray]
+        """
+        events, regions = self._intensity.shape
+        return {
+            "event": np.repeat(np.arange(events), regions),
+            "code": np.tile(self._codes, events),
+            "distance": self._distance.ravel(),
+            "intensity": self._intensity.ravel(),
+            "p_travel": self._p_travel.ravel(),
+            "s_travel": self._s_travel.ravel(),
+        }
+
+
+def evaluate_catalog(
+    earthquakes: Sequence["EarthquakeData"],
+    regions: list[RegionLocation] = MISSING,
+    max_workers: int | None = None,
+    chunk_size: int = 1000,
+    table: IntensityTable = MISSING,
+    mp_context: BaseContext = MISSING,
+) -> CatalogResults:
+    """
+    Calculate the expected intensity and travel time of a catalog in every region.
+    The catalog is split into chunks and evaluated in a process pool, the region arrays
+    and the lookup table are sent once to each worker.
+
+    :param earthquakes: The earthquakes of the catalog.
+    :type earthquakes: Sequence[EarthquakeData]
+    :param regions: List of RegionLocation to calculate. If missing, it will calculate all existing regions.
+    :type regions: list[RegionLocation]
+    :param max_workers: The number of worker processes, evaluated in this process if 1.
+    :type max_workers: int | None
+    :param chunk_size: The number of earthquakes of each task.
+    :type chunk_size: int
+    :param table: The intensity lookup table, the exact formula is used if missing.
+    :type table: IntensityTable
+    :param mp_context: The multiprocessing context of the pool, defaults to spawn.
+    :type mp_context: BaseContext
+    :return: The catalog results.
+    :rtype: CatalogResults
+    """
+    # A single chunk is not worth starting the workers
+    if len(earthquakes) <= chunk_size:
+        max_workers = 1
+    with closing(
+        evaluate_catalogs(
+            [earthquakes], regions, max_workers, chunk_size, table, mp_context
+        )
+    ) as results:
+        return next(results)
+
+
+def evaluate_catalogs(
+    catalogs: Iterable[Sequence["EarthquakeData"] | np.ndarray],
+    regions: list[RegionLocation] = MISSING,
+    max_workers: int | None = None,
+    chunk_size: int = 1000,
+    table: IntensityTable = MISSING,
+    mp_context: BaseContext = MISSING,
+) -> Iterator[CatalogResults]:
+    """
+    Calculate the expected intensity and travel time of a sequence of catalogs in every region,
+    one result per catalog. The catalogs share the process pool, so a large catalog can be
+    streamed in parts without holding all the results.
+
+    Forking the multithreaded Home Assistant process copies the locks held by other threads,
+    so the pool spawns its workers unless another context is given.
+
+    :param catalogs: The catalogs, consumed lazily. A catalog can also be an (n, 4) array of
+        the longitude, latitude, depth and magnitude, without creating the earthquake objects.
+    :type catalogs: Iterable[Sequence[EarthquakeData] | np.ndarray]
+    :param regions: List of RegionLocation to calculate. If missing, it will calculate all existing regions.
+    :type regions: list[RegionLocation]
+    :param max_workers: The number of worker processes, evaluated in this process if 1.
+    :type max_workers: int | None
+    :param chunk_size: The number of earthquakes of each task.
+    :type chunk_size: int
+    :param table: The intensity lookup table, the exact formula is used if missing.
+    :type table: IntensityTable
+    :param mp_context: The multiprocessing context of the pool, defaults to spawn.
+    :type mp_context: BaseContext
+    :return: The results of each catalog.
+    :rtype: Iterator[CatalogResults]
+    """
+    regions = list(regions or REGIONS.values())
+    codes = np.array([region.code for region in regions], dtype=np.int32)
+    region_arrays = REGION_COLUMNS.select(regions)
+
+    if max_workers == 1:
+        _init_worker(*region_arrays, table)
+        for earthquakes in catalogs:
+            yield _evaluate(earthquakes, codes, chunk_size, map)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers,
+        mp_context=mp_context or multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(*region_arrays, table),
+    ) as executor:
+        for earthquakes in catalogs:
+            yield _evaluate(earthquakes, codes, chunk_size, executor.map)
+
+
+def _evaluate(
+    earthquakes: Sequence["EarthquakeData"] | np.ndarray,
+    codes: np.ndarray,
+    chunk_size: int,
+    map_chunks: Callable,
+) -> CatalogResults:
+    """
+    Evaluate the chunks of a catalog with the map function and gather the results.
+    """
+    if isinstance(earthquakes, np.ndarray):
+        events = earthquakes.reshape(-1, 4)
+    else:
+        events = np.array(
+            [(eq.lon, eq.lat, eq.depth, eq.mag) for eq in earthquakes], dtype=float
+        ).reshape(-1, 4)
+
+    # Sort by depth, so each chunk needs the wave models of few depths
+    order = np.argsort(events[:, 2], kind="stable")
+    chunks = [
+        events[order[i : i + chunk_size]] for i in range(0, len(order), chunk_size)
+    ]
+    outputs = list(map_chunks(_evaluate_chunk, chunks))
+
+    shape = (len(events), len(codes))
+    results = [np.empty(shape, dtype=float) for _ in range(4)]
+    if outputs:
+        for result, output in zip(results, zip(*outputs)):
+            result[order] = np.concatenate(output)
+
+    return CatalogResults(codes, *results)
+
+
+def _init_worker(
+    lon: np.ndarray,
+    lat: np.ndarray,
+    site_effect: np.ndarray,
+    table: IntensityTable = MISSING,
+) -> None:
+    """
+    Set the read-only region arrays and the lookup table of the worker process.
+    """
+    global _region_arrays, _intensity_table
+    for array in (lon, lat, site_effect):
+        array.setflags(write=False)
+    _region_arrays = (lon, lat, site_effect)
+    _intensity_table = table
+
+
+def _evaluate_chunk(
+    events: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Evaluate a chunk of earthquakes (lon, lat, depth, mag) in all regions.
+
+    :return: The distance, intensity, P and S wave travel time matrices.
+    :rtype: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+    """
+    lon, lat, site_effect = _region_arrays
+    eq_lon, eq_lat, depth, magnitude = (events[:, i, np.newaxis] for i in range(4))
+
+    # haversine formula
+    dlon = np.radians(lon) - np.radians(eq_lon)
+    dlat = np.radians(lat) - np.radians(eq_lat)
+    a = (
+        np.sin(dlat / 2) ** 2
+        + np.cos(np.radians(eq_lat)) * np.cos(np.radians(lat)) * np.sin(dlon / 2) ** 2
+    )
+    distance_in_radians = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    distance = np.sqrt((distance_in_radians * EARTH_RADIUS) ** 2 + depth**2)
+
+    if _intensity_table:
+        intensity = _intensity_table.lookup(distance, magnitude, depth, site_effect)
+    else:
+        intensity = np.stack(
+            [
+                _calculate_intensity_array(
+                    distance[i], float(magnitude[i, 0]), int(depth[i, 0]), site_effect
+                )
+                for i in range(len(events))
+            ]
+        ).reshape(distance.shape)
+
+    p_travel = np.empty_like(distance)
+    s_travel = np.empty_like(distance)
+    depths = depth[:, 0].astype(int)
+    for value in np.unique(depths):
+        rows = depths == value
+        p_travel[rows], s_travel[rows] = get_wave_model(int(value)).get_travel_times(
+            distance_in_radians[rows]
+        )
+
+    return distance, intensity, p_travel, s_travel
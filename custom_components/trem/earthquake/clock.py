@@ -0,0 +1,110 @@
+"""Server clock synchronization."""
+
+from collections import deque
+from datetime import datetime, timezone
+import time
+
+from ..utils import MISSING
+
+
+class ServerClock:
+    """
+    Represents the clock of the server, estimated from the local monotonic clock.
+    """
+
+    __slots__ = ("_wall_base", "_monotonic_base", "_offset", "_samples")
+
+    def __init__(self, max_samples: int = 16) -> None:
+        """
+        Initialize the server clock.
+
+        :param max_samples: The number of recent samples used to estimate the offset.
+        :type max_samples: int
+        """
+        self._wall_base = time.time()
+        self._monotonic_base = time.monotonic()
+        self._offset: float = 0.0
+        self._samples: deque[float] = deque(maxlen=max_samples)
+
+    @property
+    def offset(self) -> float:
+        """
+        The estimated offset in seconds between the server clock and the local clock.
+        """
+        return self._offset
+
+    @property
+    def synced(self) -> bool:
+        """
+        Whether the clock has been synchronized with the server.
+        """
+        return len(self._samples) > 0
+
+    def local_timestamp(self) -> float:
+        """
+        Get the local timestamp.
+
+        Before the first sample it is the wall clock, so a step of the host clock (e.g. NTP
+        after boot) is followed. Once synchronized it is anchored at the first sample and
+        advanced by the monotonic clock, so the offset stays valid across the steps.
+
+        :return: The local timestamp in seconds.
+        :rtype: float
+        """
+        if not self._samples:
+            return time.time()
+        return self._wall_base + (time.monotonic() - self._monotonic_base)
+
+    def timestamp(self) -> float:
+        """
+        Get the estimated server timestamp.
+
+        :return: The server timestamp in seconds.
+        :rtype: float
+        """
+        return self.local_timestamp() + self._offset
+
+    def now(self) -> datetime:
+        """
+        Get the estimated server time.
+
+        :return: The server time.
+        :rtype: datetime
+        """
+        return datetime.fromtimestamp(self.timestamp(), tz=timezone.utc)
+
+    def sync(self, server_time: float, received: float = MISSING) -> None:
+        """
+        Add a sample of the server time.
+
+        The server time is stamped before the message is sent, so the sample with the
+        smallest network delay (the largest offset) of the recent samples is used.
+
+        :param server_time: The server timestamp in milliseconds.
+        :type server_time: float
+        :param received: The local timestamp when the message was received, defaults to now.
+        :type received: float
+        """
+        if not server_time:
+            return
+        if not self._samples:
+            # Anchor the monotonic clock at the current wall clock
+            self._wall_base = time.time()
+            self._monotonic_base = time.monotonic()
+        self._samples.append(server_time / 1000 - (received or self.local_timestamp()))
+        self._offset = max(self._samples)
+
+    def to_local(self, server_time: datetime) -> datetime:
+        """
+        Convert the server time to the local wall clock time, e.g. for scheduling.
+
+        :param server_time: The server time.
+        :type server_time: datetime
+        :return: The local time.
+        :rtype: datetime
+        """
+        return datetime.now(tz=timezone.utc) + (server_time - self.now())
+
+
+SERVER_CLOCK = ServerClock()
+"The shared clock of the server"
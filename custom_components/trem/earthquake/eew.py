@@ -1,18 +1,26 @@
 """Earthquake expected data."""
 
 import asyncio
-from datetime import datetime
+from datetime import datetime, timezone
+import math
+from typing import TYPE_CHECKING
 
 from ..utils import MISSING
+from .clock import SERVER_CLOCK
 from .location import REGIONS_GROUP_BY_CITY, EarthquakeLocation, RegionLocation
-from .map import Map
 from .model import (
+    EARTH_RADIUS,
     Intensity,
     RegionExpectedIntensity,
     WaveModel,
     calculate_expected_intensity_and_travel_time,
     get_wave_model,
 )
+from .spatial import REGION_INDEX
+
+if TYPE_CHECKING:
+    from .map import Map
+    from .raster import RasterMap
 
 PROVIDER_DISPLAY = {
     "cwa": "中央氣象署",
@@ -42,6 +50,7 @@ class EarthquakeData:
         "_p_arrival_distance_interp_func",
         "_s_arrival_distance_interp_func",
         "_map",
+        "_raster",
     )
 
     def __init__(
@@ -75,7 +84,8 @@ class EarthquakeData:
         self._calc_task: asyncio.Future = None
         self._city_max_intensity: dict[str, RegionExpectedIntensity] = None
         self._expected_intensity: dict[int, RegionExpectedIntensity] = None
-        self._map: Map = Map(self)
+        self._map: "Map" = None
+        self._raster: "RasterMap" = None
 
     @property
     def location(self) -> EarthquakeLocation:
@@ -134,12 +144,37 @@ class EarthquakeData:
         return self._model
 
     @property
-    def map(self) -> Map:
+    def map(self) -> "Map":
         """
-        The intensity map object of the earthquake (if have been calculated).
+        The intensity map object of the earthquake (if have been calculated), drawn by matplotlib.
         """
+        if self._map is None:
+            # matplotlib is only imported if the map is used
+            from .map import Map
+
+            self._map = Map(self)
         return self._map
 
+    @property
+    def raster(self) -> "RasterMap":
+        """
+        The intensity map object of the earthquake (if have been calculated), rasterized by Pillow.
+        """
+        if self._raster is None:
+            from .raster import RasterMap
+
+            self._raster = RasterMap(self)
+        return self._raster
+
+    def release_maps(self):
+        """
+        Release the buffers of the maps which have been created.
+        """
+        if self._map is not None:
+            self._map.release()
+        if self._raster is not None:
+            self._raster.release()
+
     @classmethod
     def from_dict(cls, data: dict) -> "EarthquakeData":
         """
@@ -156,7 +191,7 @@ class EarthquakeData:
             ),
             magnitude=data["mag"],
             depth=data["depth"],
-            time=datetime.fromtimestamp(data["time"] / 1000),
+            time=datetime.fromtimestamp(data["time"] / 1000, tz=timezone.utc),
             max_intensity=Intensity(i) if (i := data.get("max")) else MISSING,
         )
 
@@ -169,7 +204,7 @@ class EarthquakeData:
         intensities = calculate_expected_intensity_and_travel_time(self, regions)
         self._expected_intensity = dict(intensities)
         self._city_max_intensity = {
-            city: max(city_intensities, key=lambda x: x.intensity._float_value)
+            city: max(city_intensities, key=lambda x: x.intensity_value)
             for city, regions in REGIONS_GROUP_BY_CITY.items()
             if (
                 city_intensities := [
@@ -181,6 +216,23 @@ class EarthquakeData:
         }
         return self._expected_intensity
 
+    def get_affected_regions(self, now: datetime = MISSING) -> list[RegionLocation]:
+        """
+        Get the regions that the P wave of the earthquake has reached.
+
+        :param now: The current time, defaults to now.
+        :type now: datetime
+        :return: The affected regions.
+        :rtype: list[RegionLocation]
+        """
+        travel_time = ((now or SERVER_CLOCK.now()) - self._time).total_seconds()
+        if travel_time <= 0:
+            return []
+        p_dis, _ = self._model.get_arrival_distance(travel_time)
+        return REGION_INDEX.query_radius(
+            self._location, math.radians(p_dis) * EARTH_RADIUS
+        )
+
 
 class Provider:
     """
@@ -310,5 +362,5 @@ class EEW:
             final=bool(data["final"]),
             earthquake=EarthquakeData.from_dict(data=data["eq"]),
             provider=Provider(data["author"]),
-            time=datetime.fromtimestamp(data["time"] / 1000),
+            time=datetime.fromtimestamp(data["time"] / 1000, tz=timezone.utc),
         )
@@ -0,0 +1,47 @@
+"""Earthquake map image encoding."""
+
+import io
+
+from PIL import Image
+
+from ..utils import MISSING
+
+IMAGE_CONTENT_TYPES: dict[str, str] = {
+    "png": "image/png",
+    "webp": "image/webp",
+    "jpeg": "image/jpeg",
+}
+IMAGE_QUALITY = 80
+PALETTE_COLORS = 64
+
+
+def encode_image(image: Image.Image, format: str = "png", quality: int = MISSING) -> bytes:
+    """
+    Encode a RGBA map image.
+
+    :param image: the image to encode
+    :type image: Image.Image
+    :param format: the image format, can be `png` (palette-indexed), `webp` or `jpeg`, defaults to `png`
+    :type format: str
+    :param quality: the quality of the lossy formats, defaults to `IMAGE_QUALITY`
+    :type quality: int
+    :return: the encoded image
+    :rtype: bytes
+    """
+    if format not in IMAGE_CONTENT_TYPES:
+        raise ValueError(f"Unsupported image format: {format}")
+    if quality is MISSING:
+        quality = IMAGE_QUALITY
+
+    _map = io.BytesIO()
+    if format == "png":
+        image.quantize(PALETTE_COLORS, Image.Quantize.FASTOCTREE).save(_map, "PNG")
+    elif format == "webp":
+        image.save(_map, "WEBP", quality=quality, method=0)
+    else:
+        # JPEG has no alpha, flatten the transparent background to white
+        background = Image.new("RGBA", image.size, "white")
+        Image.alpha_composite(background, image).convert("RGB").save(
+            _map, "JPEG", quality=quality
+        )
+    return _map.getvalue()
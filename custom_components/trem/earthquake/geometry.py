@@ -0,0 +1,103 @@
+"""Map layer geometries at several levels of detail."""
+
+import geopandas as gpd
+import numpy as np
+import shapely
+
+from .location import COUNTRY_DATA, TOWN_DATA
+
+LOD_TOLERANCES: tuple[float, ...] = (0.001, 0.002, 0.004, 0.008)
+"The simplification tolerances in degrees of the detail levels, finest first"
+
+
+def simplify_polygons(geometry: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Simplify polygons and keep the shared borders aligned.
+
+    The coverage simplification of GEOS 3.12 is used if the polygons form a valid coverage,
+    otherwise each polygon is simplified with the topology preserved, the borders may then
+    differ by up to the tolerance.
+
+    :param geometry: the polygons to simplify
+    :type geometry: np.ndarray
+    :param tolerance: the simplification tolerance in degrees
+    :type tolerance: float
+    :return: the simplified polygons
+    :rtype: np.ndarray
+    """
+    if hasattr(shapely, "coverage_simplify"):
+        try:
+            return shapely.coverage_simplify(geometry, tolerance)
+        except shapely.errors.GEOSException:
+            pass
+    return shapely.simplify(geometry, tolerance, preserve_topology=True)
+
+
+class MapLayer:
+    """
+    Represents the geometries of a map layer, the detail levels are simplified on first use.
+    """
+
+    __slots__ = ("_data", "_geometry", "_bounds", "_levels")
+
+    def __init__(self, data: gpd.GeoDataFrame):
+        """
+        Initialize the layer.
+
+        :param data: the features of the layer
+        :type data: gpd.GeoDataFrame
+        """
+        self._data = data
+        self._geometry = np.asarray(data.geometry.values)
+        # (min_lon, min_lat, max_lon, max_lat) of each feature, for the viewport culling
+        self._bounds = shapely.bounds(self._geometry).T
+        self._levels: dict[float, gpd.GeoSeries] = {}
+
+    def get_geometry(self, tolerance: float = 0) -> gpd.GeoSeries:
+        """
+        Get the geometries of the coarsest detail level within the tolerance.
+
+        :param tolerance: the largest acceptable error in degrees, usually half a pixel
+        :type tolerance: float
+        :return: the geometries, in the row order of the layer
+        :rtype: gpd.GeoSeries
+        """
+        level = max((t for t in LOD_TOLERANCES if t <= tolerance), default=0)
+        if level == 0:
+            return self._data.geometry
+
+        geometry = self._levels.get(level)
+        if geometry is None:
+            geometry = gpd.GeoSeries(
+                simplify_polygons(self._geometry, level),
+                index=self._data.index,
+                crs=self._data.crs,
+            )
+            self._levels[level] = geometry
+        return geometry
+
+    def visible(
+        self, min_lon: float, min_lat: float, max_lon: float, max_lat: float
+    ) -> np.ndarray:
+        """
+        Get the rows of the features whose bounding box intersects the viewport.
+
+        :param min_lon: the west boundary of the viewport
+        :type min_lon: float
+        :param min_lat: the south boundary of the viewport
+        :type min_lat: float
+        :param max_lon: the east boundary of the viewport
+        :type max_lon: float
+        :param max_lat: the north boundary of the viewport
+        :type max_lat: float
+        :return: the visible rows
+        :rtype: np.ndarray
+        """
+        west, south, east, north = self._bounds
+        return np.flatnonzero(
+            (west <= max_lon) & (east >= min_lon) & (south <= max_lat) & (north >= min_lat)
+        )
+
+
+TOWN_LAYER = MapLayer(TOWN_DATA)
+COUNTRY_LAYER = MapLayer(COUNTRY_DATA)
@@ -0,0 +1,113 @@
+"""Vector intensity layer of the earthquake for the map cards."""
+
+import math
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from ..utils import MISSING
+from .location import TOWN_CODES, TOWN_DATA
+from .model import EARTH_RADIUS
+
+if TYPE_CHECKING:
+    from .eew import EEW, EarthquakeData
+
+WAVE_MAX_DISTANCE = 1000
+"The distance in kilometers of the S wave after which the waves are omitted"
+TOWN_KEYS: list[str] = TOWN_DATA["TOWNCODE"].tolist()
+"The TOWNCODE of each row in `TOWN_DATA`"
+
+
+def town_levels(earthquake: "EarthquakeData") -> np.ndarray:
+    """
+    Get the expected intensity level of each town.
+
+    :param earthquake: the earthquake which intensity have been calculated
+    :type earthquake: EarthquakeData
+    :return: the intensity level of each row in `TOWN_DATA`, 0 if the town has no region
+    :rtype: np.ndarray
+    """
+    expected_intensity = earthquake._expected_intensity
+    if expected_intensity is None:
+        raise RuntimeError("Intensity have not been calculated yet.")
+
+    levels = np.zeros(len(TOWN_CODES), dtype=np.int8)
+    for row, code in enumerate(TOWN_CODES):
+        region = expected_intensity.get(code)
+        if region is not None:
+            levels[row] = region.level
+    return levels
+
+
+class IntensityLayer:
+    """
+    Represents the vector intensity layer sent to a subscriber.
+
+    The first message of an EEW is a full frame, the later serials only carry the
+    towns whose level changed, and the messages between serials only the wave radii.
+    """
+
+    __slots__ = ("_id", "_serial", "_levels")
+
+    def __init__(self) -> None:
+        """
+        Initialize the layer.
+        """
+        self._id: str = None
+        self._serial: int = None
+        self._levels = np.zeros(len(TOWN_CODES), dtype=np.int8)
+
+    def update(self, eew: "EEW", time: float = MISSING) -> dict:
+        """
+        Get the message of the EEW, relative to the last message.
+
+        :param eew: the EEW which intensity have been calculated
+        :type eew: EEW
+        :param time: the travel time in seconds of the waves, the waves are omitted if missing
+        :type time: float
+        :return: the message, `type` is `full`, `delta` or `waves`, the `waves` message
+            has no radii once the S wave passed `WAVE_MAX_DISTANCE`
+        :rtype: dict
+        """
+        earthquake = eew.earthquake
+        message: dict = {"id": eew.id, "serial": eew.serial}
+
+        if eew.id != self._id or eew.serial != self._serial:
+            levels = town_levels(earthquake)
+            if eew.id != self._id:
+                message["type"] = "full"
+                rows = np.flatnonzero(levels)
+            else:
+                message["type"] = "delta"
+                rows = np.flatnonzero(levels != self._levels)
+
+            message.update(
+                {
+                    "epicenter": [earthquake.lon, earthquake.lat],
+                    "magnitude": earthquake.mag,
+                    "depth": earthquake.depth,
+                    "time": int(earthquake.time.timestamp() * 1000),
+                    "towns": {
+                        "code": [TOWN_KEYS[row] for row in rows.tolist()],
+                        "level": levels[rows].tolist(),
+                    },
+                }
+            )
+            self._id = eew.id
+            self._serial = eew.serial
+            self._levels = levels
+        else:
+            message["type"] = "waves"
+
+        if time is not MISSING and time > 0:
+            p_dis, s_dis = (
+                math.radians(dis) * EARTH_RADIUS
+                for dis in earthquake.wave_model.get_arrival_distance(time)
+            )
+            if s_dis <= WAVE_MAX_DISTANCE:
+                message["waves"] = {
+                    "time": round(time, 1),
+                    "p": round(p_dis, 1),
+                    "s": round(s_dis, 1),
+                }
+        return message
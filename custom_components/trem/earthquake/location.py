@@ -2,9 +2,10 @@
 
 import json
 import os
-from typing import Union
+from typing import Iterable, Union
 
 import geopandas as gpd
+import numpy as np
 
 from ..utils import MISSING
 
@@ -186,6 +187,110 @@ class RegionLocation(Location):
         return f"RegionLocation({self._name} at ({self._longitude}, {self._latitude})"
 
 
+class RegionColumns:
+    """
+    Represents the array-backed columns of the regions, one row per region.
+    """
+
+    __slots__ = ("_codes", "_lon", "_lat", "_site_effect", "_city", "_area", "_rows")
+
+    def __init__(self, regions: Iterable[RegionLocation]):
+        """
+        Initialize the region columns.
+        Note: You should not create this class for the built-in regions, instead, use :data:`REGION_COLUMNS`.
+
+        :param regions: The regions of the rows.
+        :type regions: Iterable[RegionLocation]
+        """
+        regions = list(regions)
+        self._codes = np.array([region.code for region in regions], dtype=np.int32)
+        self._lon = np.array([region.lon for region in regions], dtype=float)
+        self._lat = np.array([region.lat for region in regions], dtype=float)
+        self._site_effect = np.array(
+            [region.side_effect or 1.751 for region in regions], dtype=float
+        )
+        self._city: list[str] = [region.city for region in regions]
+        self._area: list[str] = [region.area for region in regions]
+        self._rows: dict[int, int] = {
+            code: row for row, code in enumerate(self._codes.tolist())
+        }
+        for array in (self._codes, self._lon, self._lat, self._site_effect):
+            array.setflags(write=False)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def codes(self) -> np.ndarray:
+        """The region code column."""
+        return self._codes
+
+    @property
+    def lon(self) -> np.ndarray:
+        """The longitude column."""
+        return self._lon
+
+    @property
+    def lat(self) -> np.ndarray:
+        """The latitude column."""
+        return self._lat
+
+    @property
+    def site_effect(self) -> np.ndarray:
+        """The site effect column, 1.751 if the region has none."""
+        return self._site_effect
+
+    @property
+    def city(self) -> list[str]:
+        """The city column."""
+        return self._city
+
+    @property
+    def area(self) -> list[str]:
+        """The area column."""
+        return self._area
+
+    def row(self, code: int) -> int | None:
+        """
+        Get the row of a region code.
+
+        :param code: The region code.
+        :type code: int
+        :return: The row, None if the code is not in the columns.
+        :rtype: int | None
+        """
+        return self._rows.get(code)
+
+    def select(
+        self, regions: list[RegionLocation] = MISSING
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the longitude, latitude and site effect arrays of the regions.
+        The rows of the known codes are taken from the columns, the others (user-defined regions)
+        are read from the region objects.
+
+        :param regions: The regions, all rows if missing.
+        :type regions: list[RegionLocation]
+        :return: The longitude, latitude and site effect arrays.
+        :rtype: tuple[np.ndarray, np.ndarray, np.ndarray]
+        """
+        if regions is MISSING:
+            return self._lon, self._lat, self._site_effect
+
+        rows = np.array(
+            [self._rows.get(region.code, -1) for region in regions], dtype=np.intp
+        )
+        lon, lat, site_effect = (
+            array.take(rows) for array in (self._lon, self._lat, self._site_effect)
+        )
+        for i in np.flatnonzero(rows < 0).tolist():
+            region = regions[i]
+            lon[i] = region.lon
+            lat[i] = region.lat
+            site_effect[i] = region.side_effect or 1.751
+        return lon, lat, site_effect
+
+
 def _parse_region_dict(
     data: dict[str, dict[str, dict[str, Union[int, float, str]]]],
 ) -> dict[int, RegionLocation]:
@@ -219,6 +324,8 @@ with open(
 ) as f:
     REGIONS: dict[int, RegionLocation] = _parse_region_dict(json.load(f))
 REGIONS_GROUP_BY_CITY: dict[str, list[RegionLocation]] = _group_region_by_city(REGIONS)
+REGION_COLUMNS = RegionColumns(REGIONS.values())
+"The array-backed columns of all existing regions, in the order of `REGIONS`"
 
 town_map_path = os.path.join(directory, "../asset/town_map.json")
 with open(
@@ -233,6 +340,10 @@ with open(
         for d in _raw_geo_data
         if d["id"].isdigit()
     }
+    TOWN_CODES: list[int] = [
+        int(d["id"]) if d["id"].isdigit() else 0 for d in _raw_geo_data
+    ]
+    "The region code of each row in `TOWN_DATA`, 0 if the town has no region"
 
 country_map_path = os.path.join(directory, "../asset/country_map.json")
 with open(
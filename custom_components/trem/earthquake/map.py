@@ -1,42 +1,122 @@
 """Earthquake isoseismal map draw."""
 
-import io
-import os
+from collections import OrderedDict
+import math
 from typing import TYPE_CHECKING
 
+from matplotlib.axes import Axes
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.patches import Ellipse
 import matplotlib.pyplot as plt
+import numpy as np
+from PIL import Image
 
 if TYPE_CHECKING:
     from .eew import EarthquakeData
 
 import warnings
 
-import matplotlib.image as mpimg
 from matplotlib.offsetbox import AnnotationBbox, OffsetImage
 
-from .location import COUNTRY_DATA, TAIWAN_CENTER, TOWN_DATA, TOWN_RANGE
+from ..utils import MISSING
+from .encoding import encode_image
+from .geometry import COUNTRY_LAYER, TOWN_LAYER
+from .layer import town_levels
+from .location import TAIWAN_CENTER
+from .style import (
+    INTENSITY_COLOR,
+    P_WAVE_COLOR,
+    S_WAVE_COLOR,
+    TOWN_COLOR,
+    get_legend,
+)
+from .viewport import MAP_SIZE, get_bounds, get_viewport
 
+# The maps render on their own canvases, geopandas still imports pyplot
 plt.ioff()
 plt.switch_backend("AGG")
 
-P_WAVE_COLOR = "orange"
-S_WAVE_COLOR = "red"
-INTENSITY_COLOR: dict[int, str] = {
-    0: None,
-    1: "#387FFF",
-    2: "#244FD0",
-    3: "#35BF56",
-    4: "#F8F755",
-    5: "#FFC759",
-    6: "#FF9935",
-    7: "#DF443B",
-    8: "#7B170F",
-    9: "#7237C1",
-}
-directory = os.path.dirname(os.path.realpath(__file__))
-legend_path = os.path.join(directory, "../asset/legend.png")
-legend_img = mpimg.imread(legend_path)
-legend_offset = OffsetImage(legend_img, zoom=0.5)
+FIGURE_POOL_SIZE = 2
+
+
+class FigurePool:
+    """
+    Represents a small pool of reusable figures, created outside pyplot so they are never
+    registered in its global figure manager.
+    """
+
+    __slots__ = ("_size", "_free", "_bound")
+
+    def __init__(self, size: int = FIGURE_POOL_SIZE):
+        """
+        Initialize the pool.
+
+        :param size: the maximum number of figures
+        :type size: int
+        """
+        self._size = size
+        self._free: list[tuple[Figure, Axes]] = []
+        self._bound: OrderedDict["Map", tuple[Figure, Axes]] = OrderedDict()
+        "The figures bound to the maps, least recently acquired first"
+
+    def __len__(self) -> int:
+        """The number of figures, bound or free."""
+        return len(self._free) + len(self._bound)
+
+    def acquire(self, owner: "Map") -> tuple[Figure, Axes]:
+        """
+        Bind a figure to the map, the least recently bound map is released if the pool is full.
+
+        :param owner: the map to bind
+        :type owner: Map
+        :return: the figure and its axes
+        :rtype: tuple[Figure, Axes]
+        """
+        figure = self._bound.get(owner)
+        if figure is not None:
+            self._bound.move_to_end(owner)
+            return figure
+
+        if self._free:
+            figure = self._free.pop()
+        elif len(self._bound) < self._size:
+            figure = self._create_figure()
+        else:
+            oldest = next(iter(self._bound))
+            oldest.release()
+            figure = self._free.pop()
+
+        self._bound[owner] = figure
+        return figure
+
+    def release(self, owner: "Map") -> None:
+        """
+        Return the figure of the map to the pool.
+
+        :param owner: the map to release
+        :type owner: Map
+        """
+        figure = self._bound.pop(owner, None)
+        if figure is None:
+            return
+        figure[1].clear()
+        figure[1].set_axis_off()
+        self._free.append(figure)
+
+    @staticmethod
+    def _create_figure() -> tuple[Figure, Axes]:
+        fig = Figure(figsize=(MAP_SIZE[0] / 100, MAP_SIZE[1] / 100), dpi=100)
+        FigureCanvasAgg(fig)
+        fig.patch.set_alpha(0)
+        ax = fig.add_subplot()
+        # fixed bounds, the axes fill the figure so no tight bbox pass is needed
+        ax.set_position([0, 0, 1, 1])
+        ax.set_axis_off()
+        return fig, ax
+
+
+FIGURE_POOL = FigurePool()
 
 
 class Map:
@@ -58,60 +138,104 @@ class Map:
         self._drawn: bool = False
         "Whether the map has been drawn"
 
-        self.fig: plt.Figure = None
+        self.fig: Figure = None
         "The figure object of the map"
-        self.ax: plt.Axes = None
+        self.ax: Axes = None
         "The axes of the figure"
-        self.p_wave: plt.Circle = None
+        self.p_wave: Ellipse = None
         "The p-wave of the earthquake"
-        self.s_wave: plt.Circle = None
+        self.s_wave: Ellipse = None
         "The s-wave of the earthquake"
 
     def init_figure(self):
         """
-        Initialize the figure of the map.
+        Initialize the figure of the map, a figure of :data:`FIGURE_POOL` is bound to it.
         """
-        self.fig, self.ax = plt.subplots(figsize=(4, 6))
-        self.fig.patch.set_alpha(0)
-        self.ax.set_axis_off()
+        self.fig, self.ax = FIGURE_POOL.acquire(self)
+
+    def release(self):
+        """
+        Return the figure to :data:`FIGURE_POOL`, the map have to be drawn again to be used.
+        The last saved image is kept.
+        """
+        if self.fig is None:
+            return
+        FIGURE_POOL.release(self)
+        self.fig = None
+        self.ax = None
+        self.p_wave = None
+        self.s_wave = None
+        self._drawn = False
 
     @property
-    def image(self) -> io.BytesIO:
+    def drawn(self) -> bool:
+        """
+        Whether the map has been drawn and still holds its figure.
+        """
+        return self._drawn
+
+    @property
+    def image(self) -> bytes:
         """
         The map image of the earthquake.
         """
         return self._image
 
-    def draw(self):
+    def viewport(self, time: float = MISSING) -> tuple[float, float, float]:
+        """
+        Get the viewport of the map, see :func:`get_viewport`.
+
+        :param time: the travel time in seconds of the P wave to frame, defaults to the felt area only
+        :type time: float
+        :return: the zoom (1 is the whole Taiwan), the longitude and latitude of the center
+        :rtype: tuple[float, float, float]
+        """
+        return get_viewport(self._eq, time)
+
+    def draw(self, time: float = MISSING):
         """
         Draw the map of the earthquake if intensity have been calculated.
+
+        :param time: the travel time in seconds of the P wave to frame, see :meth:`viewport`
+        :type time: float
         """
         if self._eq._expected_intensity is None:
             raise RuntimeError("Intensity have not been calculated yet.")
         if self.fig is None:
             self.init_figure()
+        else:
+            self.ax.clear()
+            self.ax.set_axis_off()
+            self.p_wave = None
+            self.s_wave = None
         # map boundary
-        zoom = 1  # TODO: change zoom according to magnitude
-        mid_lon, mid_lat = (
-            (TAIWAN_CENTER.lon + self._eq.lon) / 2,
-            (TAIWAN_CENTER.lat + self._eq.lat) / 2,
-        )
-        lon_boundary, lat_boundary = 1.6 * zoom, 2.4 * zoom
-        min_lon, max_lon = mid_lon - lon_boundary, mid_lon + lon_boundary
-        min_lat, max_lat = mid_lat - lat_boundary, mid_lat + lat_boundary
+        zoom, mid_lon, mid_lat = self.viewport(time)
+        min_lon, min_lat, max_lon, max_lat = get_bounds(zoom, mid_lon, mid_lat)
         self.ax.set_xlim(min_lon, max_lon)
         self.ax.set_ylim(min_lat, max_lat)
-        TOWN_DATA.plot(
-            ax=self.ax, facecolor="lightgrey", edgecolor="black", linewidth=0.22 / zoom
-        )
-        for code, region in self._eq._expected_intensity.items():
-            if region.intensity.value > 0:
-                TOWN_RANGE[code].plot(
-                    ax=self.ax, color=INTENSITY_COLOR[region.intensity.value]
-                )
-        COUNTRY_DATA.plot(
-            ax=self.ax, edgecolor="black", facecolor="none", linewidth=0.64 / zoom
-        )
+        # the coarsest detail level within half a pixel
+        tolerance = (max_lon - min_lon) / 2 / MAP_SIZE[0]
+        # plot the visible towns in one call, colored by intensity
+        levels = town_levels(self._eq)
+        rows = TOWN_LAYER.visible(min_lon, min_lat, max_lon, max_lat)
+        facecolor = [
+            INTENSITY_COLOR[level] if level > 0 else TOWN_COLOR
+            for level in levels[rows].tolist()
+        ]
+        if rows.size:
+            TOWN_LAYER.get_geometry(tolerance).take(rows).plot(
+                ax=self.ax,
+                facecolor=facecolor,
+                edgecolor="black",
+                linewidth=0.22 / zoom,
+            )
+        rows = COUNTRY_LAYER.visible(min_lon, min_lat, max_lon, max_lat)
+        if rows.size:
+            COUNTRY_LAYER.get_geometry(tolerance).take(rows).plot(
+                ax=self.ax, edgecolor="black", facecolor="none", linewidth=0.64 / zoom
+            )
+        # the plots set it too, but the viewport may have no feature
+        self.ax.set_aspect("equal")
         # draw epicenter
         self.ax.scatter(
             self._eq.lon,
@@ -122,19 +246,15 @@ class Map:
             linewidths=2.5 / zoom,
         )
         # add legend
-        if self._eq.lon > TAIWAN_CENTER.lon:
-            x = 1
-            align = 0.8
-        else:
-            x = 0
-            align = 0.2
+        # anchored inside the axes, the image is cropped to the fixed bounds
+        x = 1 if self._eq.lon > TAIWAN_CENTER.lon else 0
         self.ax.add_artist(
             AnnotationBbox(
-                OffsetImage(legend_img, zoom=0.5),
+                OffsetImage(np.asarray(get_legend()), zoom=0.5),
                 (x, 0),
                 xycoords="axes fraction",
                 boxcoords="axes fraction",
-                box_alignment=(align, 0.2),
+                box_alignment=(x, 0),
                 frameon=False,
             )
         )
@@ -149,6 +269,8 @@ class Map:
         :param waves: type of the wave to draw, can be `P`, `S` or `all` (case-insensitive), defaults to `all`
         :type waves: str
         """
+        if self.fig is None:
+            raise RuntimeError("Map have not been initialized yet.")
         if not self._drawn:
             warnings.warn("Map have not been drawn yet, background will be empty.")
 
@@ -157,39 +279,52 @@ class Map:
             waves = "ps"
 
         p_dis, s_dis = self._eq._model.get_arrival_distance(time)
+        # the wave fronts are circles on the sphere, wider in longitude than in latitude
+        aspect = 1 / math.cos(math.radians(self._eq.lat))
 
         if "p" in waves:
-            if self.p_wave is not None:
-                self.p_wave.remove()
-            self.p_wave = plt.Circle(
-                (self._eq.lon, self._eq.lat),
-                p_dis,
-                color=P_WAVE_COLOR,
-                fill=False,
-                linewidth=1.5,
-            )
-            self.ax.add_patch(self.p_wave)
-
+            self.p_wave = self._update_wave(self.p_wave, p_dis, aspect, P_WAVE_COLOR)
         if "s" in waves:
-            if self.s_wave is not None:
-                self.s_wave.remove()
-            self.s_wave = plt.Circle(
+            self.s_wave = self._update_wave(self.s_wave, s_dis, aspect, S_WAVE_COLOR)
+
+    def _update_wave(
+        self, wave: Ellipse, distance: float, aspect: float, color: str
+    ) -> Ellipse:
+        """
+        Resize the wave front, it is added to the axes on first use.
+        """
+        if wave is None:
+            wave = Ellipse(
                 (self._eq.lon, self._eq.lat),
-                s_dis,
-                color=S_WAVE_COLOR,
+                0,
+                0,
+                color=color,
                 fill=False,
                 linewidth=1.5,
             )
-            self.ax.add_patch(self.s_wave)
+            self.ax.add_patch(wave)
+        wave.set_width(2 * distance * aspect)
+        wave.set_height(2 * distance)
+        return wave
 
-    def save(self):
+    def save(self, format: str = "png", quality: int = MISSING) -> bytes:
+        """
+        Render and encode the map.
+
+        :param format: the image format, can be `png` (palette-indexed), `webp` or `jpeg`, defaults to `png`
+        :type format: str
+        :param quality: the quality of the lossy formats, defaults to :data:`IMAGE_QUALITY`
+        :type quality: int
+        :return: the encoded image, a new bytes object for each frame
+        :rtype: bytes
+        """
         if self.fig is None:
             raise RuntimeError("Map have not been initialized yet.")
         if not self._drawn:
             warnings.warn("Map have not been drawn yet, it will be empty.")
 
-        _map = io.BytesIO()
-        self.fig.savefig(_map, format="png", bbox_inches="tight")
-        _map.seek(0)
-        self._image = _map
+        canvas = self.fig.canvas
+        canvas.draw()
+        image = Image.fromarray(np.asarray(canvas.buffer_rgba()), "RGBA")
+        self._image = encode_image(image, format, quality)
         return self._image
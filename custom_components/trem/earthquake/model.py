@@ -3,6 +3,7 @@
 Reference: https://github.com/ExpTechTW/TREM-tauri/blob/main/src/scripts/helper/utils.ts
 """
 
+from bisect import bisect_right
 from collections import OrderedDict
 from datetime import datetime, timedelta
 import math
@@ -13,7 +14,8 @@ from obspy.taup import tau
 from scipy.interpolate import interp1d
 
 from ..utils import MISSING
-from .location import REGIONS, Location, RegionLocation
+from .clock import SERVER_CLOCK
+from .location import REGION_COLUMNS, REGIONS, Location, RegionLocation
 
 if TYPE_CHECKING:
     from .eew import EarthquakeData
@@ -31,8 +33,13 @@ INTENSITY_DISPLAY: dict[int, str] = {
     8: "6強",
     9: "7級",
 }
+# Lower bounds of the intensity levels 1 to 9
+INTENSITY_THRESHOLDS: list[float] = [0.5, 1.5, 2.5, 3.5, 4.5, 5.0, 5.5, 6.0, 6.5]
+_INTENSITY_THRESHOLDS_ARRAY = np.array(INTENSITY_THRESHOLDS)
 
-SEISMIC_MODEL = tau.TauPyModel(cache=OrderedDict())
+# The TauP models split at the source depths, an LRU cache owned by SEISMIC_MODEL
+_split_model_cache: OrderedDict = OrderedDict()
+SEISMIC_MODEL = tau.TauPyModel(cache=_split_model_cache)
 wave_model_cache: dict[int, "WaveModel"] = {}
 
 
@@ -55,6 +62,7 @@ class WaveModel:
         :param s_time: The S wave travel time array in seconds.
         :type s_time: np.ndarray
         """
+        self._arrays = (distance, p_time, s_time)
         distance_in_radians = np.radians(distance)
         self._p_arrival_distance_interp_func = interp1d(
             p_time, distance, bounds_error=False, fill_value="extrapolate"
@@ -69,6 +77,13 @@ class WaveModel:
             distance_in_radians, s_time, bounds_error=False, fill_value="extrapolate"
         )
 
+    @property
+    def arrays(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        The distance in degrees, P and S waves travel time arrays of the model.
+        """
+        return self._arrays
+
     def get_travel_time(self, distance: float) -> tuple[float, float]:
         """
         Get the P and S waves travel time of the earthquake in seconds.
@@ -83,6 +98,20 @@ class WaveModel:
             float(self._s_travel_time_interp_func(distance)),
         )
 
+    def get_travel_times(self, distance: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Get the P and S waves travel time of the earthquake in seconds for multiple distances.
+
+        :param distance: The distance array in radians.
+        :type distance: np.ndarray
+        :return: P and S waves travel time arrays in seconds.
+        :rtype: tuple[np.ndarray, np.ndarray]
+        """
+        return (
+            self._p_travel_time_interp_func(distance),
+            self._s_travel_time_interp_func(distance),
+        )
+
     def get_arrival_distance(self, time: float) -> tuple[float, float]:
         """
         Get the P and S waves arrival distances of the earthquake in degrees.
@@ -127,6 +156,53 @@ def get_wave_model(depth: float) -> WaveModel:
     return model
 
 
+def clear_wave_models(depth: float = MISSING) -> None:
+    """
+    Clear the cached wave models and the split TauP models,
+    so the next :func:`get_wave_model` of the depth is calculated from the start.
+
+    :param depth: The depth in kilometers, all depths if missing.
+    :type depth: float
+    """
+    if depth is MISSING:
+        wave_model_cache.clear()
+    else:
+        wave_model_cache.pop(depth, None)
+    _split_model_cache.clear()
+
+
+def export_wave_models() -> dict[str, list[list[float]]]:
+    """
+    Export the cached wave models.
+
+    :return: The distance, P and S waves travel time lists of each depth.
+    :rtype: dict[str, list[list[float]]]
+    """
+    return {
+        str(depth): [array.tolist() for array in model.arrays]
+        for depth, model in wave_model_cache.items()
+    }
+
+
+def restore_wave_models(data: dict[str, list[list[float]]]) -> int:
+    """
+    Restore the wave models exported by :func:`export_wave_models`, the cached depths are kept.
+
+    :param data: The distance, P and S waves travel time lists of each depth.
+    :type data: dict[str, list[list[float]]]
+    :return: The number of restored wave models.
+    :rtype: int
+    """
+    restored = 0
+    for key, arrays in data.items():
+        depth = int(key) if key.isdigit() else float(key)
+        if depth in wave_model_cache or len(arrays) != 3:
+            continue
+        wave_model_cache[depth] = WaveModel(*(np.array(array) for array in arrays))
+        restored += 1
+    return restored
+
+
 # pre fill wave model cache
 for _depth in range(10, 101, 10):
     get_wave_model(_depth)
@@ -137,18 +213,19 @@ class Intensity:
     Represents an intensity.
     """
 
-    __slots__ = ("_float_value", "_value", "_display")
+    __slots__ = ("_float_value", "_value")
 
-    def __init__(self, value: float) -> None:
+    def __init__(self, value: float, level: int = MISSING) -> None:
         """
         Initialize the intensity instance.
 
         :param value: The intensity.
         :type value: float
+        :param level: The intensity level, if already classified by :func:`classify_intensity`.
+        :type level: int
         """
         self._float_value = value
-        self._value = round_intensity(value)
-        self._display = INTENSITY_DISPLAY[self._value]
+        self._value = round_intensity(value) if level is MISSING else level
 
     @property
     def value(self) -> int:
@@ -162,10 +239,10 @@ class Intensity:
         """
         Get the intensity display string.
         """
-        return self._display
+        return INTENSITY_DISPLAY[self._value]
 
     def __str__(self) -> str:
-        return self._display
+        return INTENSITY_DISPLAY[self._value]
 
     def __repr__(self) -> str:
         return f"Intensity({self._float_value:.2f})"
@@ -263,13 +340,13 @@ class Distance:
         """
         P wave remaining time.
         """
-        return self._p_arrival_time - (now or datetime.now())
+        return self._p_arrival_time - (now or SERVER_CLOCK.now())
 
     def s_left_time(self, now: datetime = MISSING) -> timedelta:
         """
         S wave remaining time.
         """
-        return self._s_arrival_time - (now or datetime.now())
+        return self._s_arrival_time - (now or SERVER_CLOCK.now())
 
 
 class RegionExpectedIntensity:
@@ -277,22 +354,37 @@ class RegionExpectedIntensity:
     Represents a region expected intensity.
     """
 
+    __slots__ = ("_region", "_intensity", "_intensity_value", "_level", "_distance")
+
     def __init__(
-        self, region: RegionLocation, intensity: Intensity, distance: Distance
+        self,
+        region: RegionLocation,
+        intensity: Intensity | float,
+        distance: Distance,
+        level: int = MISSING,
     ) -> None:
         """
         Initialize the region expected intensity instance.
 
         :param region: The region.
         :type region: RegionLocation
-        :param intensity: The intensity.
-        :type intensity: Intensity
+        :param intensity: The intensity, or its value to create the Intensity on first access.
+        :type intensity: Intensity | float
         :param distance: The distance.
         :type distance: Distance
+        :param level: The intensity level of the value, if already classified.
+        :type level: int
         """
         self._region = region
-        self._intensity = intensity
         self._distance = distance
+        if isinstance(intensity, Intensity):
+            self._intensity = intensity
+            self._intensity_value = intensity._float_value
+            self._level = intensity.value
+        else:
+            self._intensity = None
+            self._intensity_value = intensity
+            self._level = round_intensity(intensity) if level is MISSING else level
 
     @property
     def region(self) -> RegionLocation:
@@ -306,8 +398,24 @@ class RegionExpectedIntensity:
         """
         The intensity.
         """
+        if self._intensity is None:
+            self._intensity = Intensity(self._intensity_value, self._level)
         return self._intensity
 
+    @property
+    def intensity_value(self) -> float:
+        """
+        The intensity value.
+        """
+        return self._intensity_value
+
+    @property
+    def level(self) -> int:
+        """
+        The intensity level.
+        """
+        return self._level
+
     @property
     def distance(self) -> Distance:
         """
@@ -316,7 +424,7 @@ class RegionExpectedIntensity:
         return self._distance
 
     def __repr__(self) -> str:
-        return f"RegionExpectedIntensity({self._region}, {self._intensity}, {self._distance.s_arrival_time})"
+        return f"RegionExpectedIntensity({self._region}, {self.intensity}, {self._distance.s_arrival_time})"
 
 
 class RegionExpectedIntensities(dict):
@@ -367,29 +475,62 @@ def _calculate_distance(p1: Location, p2: Location) -> float:
     return 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
 
 
+def _calculate_distance_array(
+    location: Location, lon: np.ndarray, lat: np.ndarray
+) -> np.ndarray:
+    """
+    Calculate the distance between a point and multiple points on the Earth's surface.
+
+    :param location: The location object.
+    :type location: Location
+    :param lon: The longitude array in degrees.
+    :type lon: np.ndarray
+    :param lat: The latitude array in degrees.
+    :type lat: np.ndarray
+    :return: The distance array in radians.
+    :rtype: np.ndarray
+    """
+    # haversine formula
+    lon1 = math.radians(location.lon)
+    lat1 = math.radians(location.lat)
+    lon2 = np.radians(lon)
+    lat2 = np.radians(lat)
+    dlon = lon2 - lon1
+    dlat = lat2 - lat1
+
+    a = np.sin(dlat / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
 def round_intensity(intensity: float) -> int:
     """
-    Round the floating-point intensity value to the nearest integer.
+    Round the floating-point intensity value to the intensity level.
+    A value on a threshold belongs to the upper level, NaN is level 0.
+    See :func:`classify_intensity` for the array version.
 
     :param intensity: Floating-point intensity value.
     :type intensity: float
     :return: Rounded intensity value.
     :rtype: int
     """
-    if intensity < 0:
+    if math.isnan(intensity):
         return 0
-    elif intensity < 4.5:
-        return round(intensity)
-    elif intensity < 5:
-        return 5
-    elif intensity < 5.5:
-        return 6
-    elif intensity < 6:
-        return 7
-    elif intensity < 6.5:
-        return 8
-    else:
-        return 9
+    return bisect_right(INTENSITY_THRESHOLDS, intensity)
+
+
+def classify_intensity(intensity: np.ndarray) -> np.ndarray:
+    """
+    Classify the floating-point intensity values to the intensity levels.
+    A value on a threshold belongs to the upper level, NaN is level 0.
+
+    :param intensity: Floating-point intensity array.
+    :type intensity: np.ndarray
+    :return: Intensity level array.
+    :rtype: np.ndarray
+    """
+    levels = np.digitize(intensity, _INTENSITY_THRESHOLDS_ARRAY)
+    # digitize sorts NaN after the last threshold
+    return np.where(np.isnan(intensity), 0, levels).astype(np.int8)
 
 
 def _calculate_intensity(
@@ -438,6 +579,48 @@ def _calculate_intensity(
     return i
 
 
+def _calculate_intensity_array(
+    hypocenter_distance: np.ndarray,
+    magnitude: float,
+    depth: int,
+    site_effect: np.ndarray,
+) -> np.ndarray:
+    """
+    Calculate the intensity of the earthquake of multiple distances.
+    See :func:`_calculate_intensity` for the scalar version.
+
+    :param hypocenter_distance: Actual distance array from the hypocenter in kilometers.
+    :type hypocenter_distance: np.ndarray
+    :param magnitude: Magnitude of the earthquake.
+    :type magnitude: float
+    :param depth: Depth of the earthquake in kilometers.
+    :type depth: int
+    :param site_effect: Site effect factor array.
+    :type site_effect: np.ndarray
+    :return: Estimated intensity array.
+    :rtype: np.ndarray
+    """
+    pga = (
+        1.657 * math.exp(1.533 * magnitude) * hypocenter_distance**-1.607 * site_effect
+    )
+    i = 2 * np.log10(pga) + 0.7
+
+    long = 10 ** (0.5 * magnitude - 1.85) / 2
+    x = np.maximum(hypocenter_distance - long, 3)
+    gpv600 = 10 ** (
+        0.58 * magnitude
+        + 0.0038 * depth
+        - 1.29
+        - np.log10(x + 0.0028 * 10 ** (0.5 * magnitude))
+        - 0.002 * x
+    )
+    arv = 1.0
+    pgv400 = gpv600 * 1.31
+    pgv = pgv400 * arv
+
+    return np.where(i > 3, 2.68 + 1.72 * np.log10(pgv), i)
+
+
 def calculate_expected_intensity_and_travel_time(
     earthquake: "EarthquakeData", regions: list[RegionLocation] = MISSING
 ) -> RegionExpectedIntensities:
@@ -452,31 +635,39 @@ def calculate_expected_intensity_and_travel_time(
     :rtype: RegionExpectedIntensities
     """
 
-    _expected_intensity = {}
-    squared_depth = earthquake.depth**2
+    regions = list(regions or REGIONS.values())
+    if not regions:
+        return RegionExpectedIntensities({})
 
-    for region in regions or REGIONS.values():
-        distance_in_radians = _calculate_distance(earthquake, region)
-        distance_in_degrees = math.degrees(distance_in_radians)
-        real_distance_in_km = math.sqrt(
-            (distance_in_radians * EARTH_RADIUS) ** 2 + squared_depth
-        )
-        intensity = _calculate_intensity(
-            real_distance_in_km, earthquake.mag, earthquake.depth, region.side_effect
-        )
-        p_travel, s_travel = earthquake.wave_model.get_travel_time(distance_in_radians)
+    lon, lat, site_effect = REGION_COLUMNS.select(regions)
+    distance_in_radians = _calculate_distance_array(earthquake, lon, lat)
+    distance_in_degrees = np.degrees(distance_in_radians)
+    real_distance_in_km = np.sqrt(
+        (distance_in_radians * EARTH_RADIUS) ** 2 + earthquake.depth**2
+    )
+    intensities = _calculate_intensity_array(
+        real_distance_in_km, earthquake.mag, earthquake.depth, site_effect
+    )
+    levels = classify_intensity(intensities).tolist()
+    intensities = intensities.tolist()
+    p_travels, s_travels = earthquake.wave_model.get_travel_times(distance_in_radians)
 
+    _expected_intensity = {}
+    for i, region in enumerate(regions):
+        p_travel = float(p_travels[i])
+        s_travel = float(s_travels[i])
         _expected_intensity[region.code] = RegionExpectedIntensity(
             region,
-            Intensity(intensity),
+            intensities[i],
             Distance(
-                real_distance_in_km,
-                distance_in_degrees,
+                float(real_distance_in_km[i]),
+                float(distance_in_degrees[i]),
                 earthquake.time + timedelta(seconds=p_travel),
                 earthquake.time + timedelta(seconds=s_travel),
                 p_travel,
                 s_travel,
             ),
+            levels[i],
         )
 
     return RegionExpectedIntensities(_expected_intensity)
@@ -0,0 +1,440 @@
+"""Earthquake isoseismal map raster renderer, without matplotlib."""
+
+from collections import OrderedDict
+import json
+import os
+from typing import TYPE_CHECKING
+import warnings
+
+import numpy as np
+from PIL import Image, ImageColor, ImageDraw
+
+from ..utils import MISSING
+from .encoding import encode_image
+from .layer import town_levels
+from .location import TAIWAN_CENTER
+from .model import _calculate_distance_array
+from .style import (
+    INTENSITY_COLOR,
+    P_WAVE_COLOR,
+    S_WAVE_COLOR,
+    TOWN_COLOR,
+    get_legend,
+)
+from .viewport import MAP_SIZE, get_bounds, get_viewport
+
+if TYPE_CHECKING:
+    from .eew import EarthquakeData
+    from .location import EarthquakeLocation
+
+POINTS_TO_PIXELS = 100 / 72
+"The line widths and marker sizes are in points, as the 100 dpi matplotlib map"
+TOWN_EDGE_RGBA = ImageColor.getrgb("dimgrey") + (255,)
+"The town borders are thinner than a pixel on the matplotlib map, grey looks alike"
+LEVEL_RGBA = np.array(
+    [
+        ImageColor.getrgb(INTENSITY_COLOR[level] or TOWN_COLOR) + (255,)
+        for level in range(len(INTENSITY_COLOR))
+    ],
+    dtype=np.uint8,
+)
+"The RGBA color of each intensity level, the towns without intensity for 0"
+ISOCHRONES: tuple[int, ...] = (5, 10, 20)
+"The S wave lead times in seconds of the arrival isochrones"
+ISOCHRONE_ALPHA = 160
+"The opacity of the isochrone lines"
+SHAKEN_ALPHA = 48
+"The opacity of the shading over the area the S wave passed"
+LABEL_CACHE_SIZE = 2
+"The number of viewports whose label rasters are kept"
+directory = os.path.dirname(os.path.realpath(__file__))
+
+
+class RasterLayer:
+    """
+    Represents the polygon rings of a GeoJSON map as numpy arrays, largest feature first
+    so the enclaves are filled over the towns around them.
+    """
+
+    __slots__ = ("rings", "features", "bounds")
+
+    def __init__(self, path: str):
+        """
+        Load the layer.
+
+        :param path: the path of the GeoJSON file
+        :type path: str
+        """
+        with open(path, encoding="utf-8") as f:
+            features = json.load(f)["features"]
+
+        rings: list[list[np.ndarray]] = []
+        for feature in features:
+            geometry = feature["geometry"]
+            polygons = (
+                [geometry["coordinates"]]
+                if geometry["type"] == "Polygon"
+                else geometry["coordinates"]
+            )
+            rings.append(
+                [
+                    np.asarray(ring, dtype=float)
+                    for polygon in polygons
+                    for ring in polygon
+                ]
+            )
+
+        self.rings = rings
+        "The rings of each feature, the holes are only outlined"
+        self.bounds = np.array(
+            [
+                np.concatenate(
+                    [np.vstack(feature).min(axis=0), np.vstack(feature).max(axis=0)]
+                )
+                for feature in rings
+            ]
+        ).T
+        "The (west, south, east, north) boundaries of each feature"
+        # largest bounding box first
+        area = (self.bounds[2] - self.bounds[0]) * (self.bounds[3] - self.bounds[1])
+        self.features = np.argsort(-area, kind="stable")
+        "The feature indices in the drawing order"
+
+    def visible(
+        self, min_lon: float, min_lat: float, max_lon: float, max_lat: float
+    ) -> np.ndarray:
+        """
+        Get the features whose bounding box intersects the viewport, in the drawing order.
+
+        :param min_lon: the west boundary of the viewport
+        :type min_lon: float
+        :param min_lat: the south boundary of the viewport
+        :type min_lat: float
+        :param max_lon: the east boundary of the viewport
+        :type max_lon: float
+        :param max_lat: the north boundary of the viewport
+        :type max_lat: float
+        :return: the visible feature indices
+        :rtype: np.ndarray
+        """
+        west, south, east, north = self.bounds[:, self.features]
+        return self.features[
+            (west <= max_lon) & (east >= min_lon) & (south <= max_lat) & (north >= min_lat)
+        ]
+
+
+_raster_layers: tuple[RasterLayer, RasterLayer, Image.Image] = MISSING
+
+
+def get_raster_layers() -> tuple[RasterLayer, RasterLayer, Image.Image]:
+    """
+    Get the town and country layers and the legend image, they are loaded on the first call.
+
+    :return: the town layer, the country layer and the legend image
+    :rtype: tuple[RasterLayer, RasterLayer, Image.Image]
+    """
+    global _raster_layers
+    if not _raster_layers:
+        legend = get_legend()
+        legend = legend.resize(
+            (
+                round(legend.width * 0.5 * POINTS_TO_PIXELS),
+                round(legend.height * 0.5 * POINTS_TO_PIXELS),
+            ),
+            Image.Resampling.LANCZOS,
+        )
+        _raster_layers = (
+            RasterLayer(os.path.join(directory, "../asset/town_map.json")),
+            RasterLayer(os.path.join(directory, "../asset/country_map.json")),
+            legend,
+        )
+    return _raster_layers
+
+
+def _width(points: float) -> int:
+    return max(round(points * POINTS_TO_PIXELS), 1)
+
+
+def _word(color: str, alpha: int = 255) -> np.uint32:
+    return np.array(ImageColor.getrgb(color)[:3] + (alpha,), dtype=np.uint8).view(
+        np.uint32
+    )[0]
+
+
+class LabelRaster:
+    """
+    Represents the towns of a viewport rasterized once as labels, 0 outside the towns,
+    ``row + 1`` inside the town of the row in `TOWN_DATA` and ``len(TOWN_DATA) + 1`` on
+    the town borders, with the country borders as an overlay.
+
+    A frame is then colored by indexing a color table of the towns with the labels.
+    """
+
+    __slots__ = ("bounds", "zoom", "scale", "labels", "borders")
+
+    def __init__(self, zoom: float, lon: float, lat: float):
+        """
+        Rasterize the viewport.
+
+        :param zoom: the zoom of the viewport
+        :type zoom: float
+        :param lon: the longitude of the center
+        :type lon: float
+        :param lat: the latitude of the center
+        :type lat: float
+        """
+        towns, country, _ = get_raster_layers()
+        self.bounds = get_bounds(zoom, lon, lat)
+        "The west, south, east and north boundaries in degrees"
+        self.zoom = zoom
+        self.scale = MAP_SIZE[0] / (self.bounds[2] - self.bounds[0])
+        "The pixels per degree"
+
+        # the larger towns first, the enclaves are filled over them
+        labels = Image.new("I", MAP_SIZE, 0)
+        draw = ImageDraw.Draw(labels)
+        edge = len(towns.rings) + 1
+        width = _width(0.22 / zoom)
+        for feature in towns.visible(*self.bounds).tolist():
+            for ring in towns.rings[feature]:
+                draw.polygon(
+                    self.to_pixels(ring), fill=feature + 1, outline=edge, width=width
+                )
+        self.labels = np.asarray(labels).astype(np.uint16)
+
+        self.borders = Image.new("RGBA", MAP_SIZE, (0, 0, 0, 0))
+        draw = ImageDraw.Draw(self.borders)
+        width = _width(0.64 / zoom)
+        for feature in country.visible(*self.bounds).tolist():
+            for ring in country.rings[feature]:
+                xy = self.to_pixels(ring)
+                draw.line(xy + xy[:2], fill="black", width=width)
+
+    def to_pixels(self, coordinates: np.ndarray) -> list[float]:
+        """
+        Project the longitude and latitude to the flat pixel coordinates.
+
+        :param coordinates: the longitude and latitude of the points
+        :type coordinates: np.ndarray
+        :return: the flattened x and y of the points
+        :rtype: list[float]
+        """
+        west, north = self.bounds[0], self.bounds[3]
+        return (
+            ((coordinates - (west, north)) * (self.scale, -self.scale)).ravel().tolist()
+        )
+
+    def distance_field(self, location: "EarthquakeLocation") -> np.ndarray:
+        """
+        Get the great-circle distance of each pixel center from a location.
+
+        :param location: the location to measure from, usually the epicenter
+        :type location: EarthquakeLocation
+        :return: the distance in pixels (degrees multiplied by :attr:`scale`), rounded
+        :rtype: np.ndarray
+        """
+        width, height = MAP_SIZE
+        lon = self.bounds[0] + (np.arange(width) + 0.5) / self.scale
+        lat = self.bounds[3] - (np.arange(height) + 0.5) / self.scale
+        distance = _calculate_distance_array(location, lon[np.newaxis], lat[:, np.newaxis])
+        return np.rint(np.degrees(distance) * self.scale).astype(np.uint16)
+
+    def colorize(self, colors: np.ndarray) -> Image.Image:
+        """
+        Color the towns.
+
+        :param colors: the RGBA color of each row in `TOWN_DATA`
+        :type colors: np.ndarray
+        :return: the towns with the town and country borders
+        :rtype: Image.Image
+        """
+        table = np.zeros((len(colors) + 2, 4), dtype=np.uint8)
+        table[1:-1] = colors
+        table[-1] = TOWN_EDGE_RGBA
+        # index the colors as 32 bit words, much faster than 4 channels
+        pixels = np.take(table.view(np.uint32).ravel(), self.labels)
+        image = Image.fromarray(pixels.view(np.uint8).reshape(*self.labels.shape, 4))
+        image.alpha_composite(self.borders)
+        return image
+
+
+_label_rasters: OrderedDict[tuple[float, float, float], LabelRaster] = OrderedDict()
+
+
+def get_label_raster(zoom: float, lon: float, lat: float) -> LabelRaster:
+    """
+    Get the label raster of a viewport, the least recently used one is dropped if more
+    than :data:`LABEL_CACHE_SIZE` viewports are kept.
+
+    :param zoom: the zoom of the viewport
+    :type zoom: float
+    :param lon: the longitude of the center
+    :type lon: float
+    :param lat: the latitude of the center
+    :type lat: float
+    :return: the label raster
+    :rtype: LabelRaster
+    """
+    key = (zoom, lon, lat)
+    raster = _label_rasters.get(key)
+    if raster is None:
+        raster = LabelRaster(zoom, lon, lat)
+        _label_rasters[key] = raster
+        while len(_label_rasters) > LABEL_CACHE_SIZE:
+            _label_rasters.popitem(last=False)
+    else:
+        _label_rasters.move_to_end(key)
+    return raster
+
+
+class RasterMap:
+    """
+    Represents the map for earthquake, rasterized by Pillow with the same layout as
+    :class:`~.map.Map`.
+    """
+
+    __slots__ = ("_eq", "_image", "_base", "_frame", "_raster", "_distance")
+
+    def __init__(self, earthquake: "EarthquakeData"):
+        """
+        Initialize the map.
+
+        :param earthquake: the earthquake to draw
+        :type earthquake: EarthquakeData
+        """
+        self._eq = earthquake
+        self._image: bytes = None
+        self._base: Image.Image = None
+        "The towns, borders, epicenter and legend of the map"
+        self._frame: Image.Image = None
+        "The base with the waves"
+        self._raster: LabelRaster = None
+        "The label raster of the viewport"
+        self._distance: np.ndarray = None
+        "The epicentral distance in pixels of each pixel"
+
+    @property
+    def drawn(self) -> bool:
+        """
+        Whether the map has been drawn and still holds its buffers.
+        """
+        return self._base is not None
+
+    @property
+    def image(self) -> bytes:
+        """
+        The map image of the earthquake.
+        """
+        return self._image
+
+    def viewport(self, time: float = MISSING) -> tuple[float, float, float]:
+        """
+        Get the viewport of the map, see :func:`get_viewport`.
+
+        :param time: the travel time in seconds of the P wave to frame, defaults to the felt area only
+        :type time: float
+        :return: the zoom (1 is the whole Taiwan), the longitude and latitude of the center
+        :rtype: tuple[float, float, float]
+        """
+        return get_viewport(self._eq, time)
+
+    def release(self):
+        """
+        Drop the buffers, the map have to be drawn again to be used. The last saved image is kept.
+        """
+        self._base = None
+        self._frame = None
+        self._raster = None
+        self._distance = None
+
+    def draw(self, time: float = MISSING):
+        """
+        Draw the map of the earthquake if intensity have been calculated.
+
+        :param time: the travel time in seconds of the P wave to frame, see :meth:`viewport`
+        :type time: float
+        """
+        if self._eq._expected_intensity is None:
+            raise RuntimeError("Intensity have not been calculated yet.")
+
+        legend = get_raster_layers()[2]
+        zoom, mid_lon, mid_lat = self.viewport(time)
+        raster = get_label_raster(zoom, mid_lon, mid_lat)
+        if raster is not self._raster or self._distance is None:
+            self._raster = raster
+            self._distance = raster.distance_field(self._eq.location)
+        image = self._raster.colorize(LEVEL_RGBA[town_levels(self._eq)])
+        draw = ImageDraw.Draw(image)
+        # draw epicenter
+        x, y = self._raster.to_pixels(np.array([[self._eq.lon, self._eq.lat]]))
+        size = (160 / zoom) ** 0.5 * POINTS_TO_PIXELS / 2
+        width = _width(2.5 / zoom)
+        draw.line((x - size, y - size, x + size, y + size), fill="red", width=width)
+        draw.line((x - size, y + size, x + size, y - size), fill="red", width=width)
+        # add legend, anchored inside the image
+        x = MAP_SIZE[0] - legend.width if self._eq.lon > TAIWAN_CENTER.lon else 0
+        image.alpha_composite(legend, (x, MAP_SIZE[1] - legend.height))
+
+        self._base = image
+        self._frame = image
+
+    def draw_wave(self, time: float, waves: str = "all"):
+        """
+        Draw the P and S wave if possible.
+
+        :param time: the travel time in seconds of the wave to draw
+        :type time: float
+        :param waves: type of the wave to draw, can be `P`, `S` or `all` (case-insensitive), defaults to `all`
+        :type waves: str
+        """
+        if self._base is None:
+            raise RuntimeError("Map have not been drawn yet.")
+
+        waves = waves.lower()
+        if waves == "all":
+            waves = "ps"
+
+        # color the distance field by a table of the distances in pixels
+        model = self._eq.wave_model
+        scale = self._raster.scale
+        table = np.zeros(int(self._distance.max()) + 1, dtype=np.uint32)
+        p_dis, s_dis = (round(dis * scale) for dis in model.get_arrival_distance(time))
+        if "s" in waves:
+            table[:s_dis] = _word(S_WAVE_COLOR, SHAKEN_ALPHA)
+            for lead in ISOCHRONES:
+                dis = round(model.get_arrival_distance(time + lead)[1] * scale)
+                table[dis : dis + 1] = _word(S_WAVE_COLOR, ISOCHRONE_ALPHA)
+        width = _width(1.5)
+        for wave, dis, color in (
+            ("s", s_dis, S_WAVE_COLOR),
+            ("p", p_dis, P_WAVE_COLOR),
+        ):
+            if wave in waves and dis > 0:
+                start = max(dis - width // 2, 0)
+                table[start : start + width] = _word(color)
+
+        overlay = np.take(table, self._distance)
+        self._frame = self._base.copy()
+        self._frame.alpha_composite(
+            Image.fromarray(overlay.view(np.uint8).reshape(*overlay.shape, 4))
+        )
+
+    def save(self, format: str = "png", quality: int = MISSING) -> bytes:
+        """
+        Encode the map.
+
+        :param format: the image format, can be `png` (palette-indexed), `webp` or `jpeg`, defaults to `png`
+        :type format: str
+        :param quality: the quality of the lossy formats, defaults to :data:`IMAGE_QUALITY`
+        :type quality: int
+        :return: the encoded image, a new bytes object for each frame
+        :rtype: bytes
+        """
+        if self._frame is None:
+            warnings.warn("Map have not been drawn yet, it will be empty.")
+            frame = Image.new("RGBA", MAP_SIZE, (0, 0, 0, 0))
+        else:
+            frame = self._frame
+
+        self._image = encode_image(frame, format, quality)
+        return self._image
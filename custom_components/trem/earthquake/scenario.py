@@ -0,0 +1,361 @@
+"""Synthetic earthquake scenario generator and batch simulator."""
+
+import csv
+from datetime import datetime, timezone
+import math
+import os
+from typing import Iterable
+
+import numpy as np
+
+from ..utils import MISSING
+from .batch import evaluate_catalogs
+from .location import REGION_COLUMNS, REGIONS, Location, RegionLocation
+from .model import (
+    EARTH_RADIUS,
+    _calculate_distance_array,
+    _calculate_intensity_array,
+    classify_intensity,
+    get_wave_model,
+)
+from .table import IntensityTable
+
+# Bounds of the synthetic epicenters (lon_min, lat_min, lon_max, lat_max)
+TAIWAN_BOUNDS = (119.5, 21.5, 122.5, 25.5)
+
+# The maximum number of EEW of a scenario run, the rows are this times the regions
+MAX_SCENARIO_EEWS = 100000
+
+# The number of EEW evaluated and written at a time, bounds the memory of a run
+PART_EEWS = 500
+
+SCENARIO_COLUMNS = [
+    "id",
+    "serial",
+    "final",
+    "mag",
+    "depth",
+    "code",
+    "distance",
+    "intensity",
+    "level",
+    "p_travel",
+    "s_travel",
+]
+
+
+def generate_serials(
+    event: dict,
+    serials: int = 5,
+    interval: float = 3,
+    drift: float = 0.1,
+    mag_error: float = 0.5,
+    rng: np.random.Generator = MISSING,
+) -> list[dict]:
+    """
+    Generate a sequence of EEW serials of an event, the location and the magnitude converge to the event.
+
+    :param event: The earthquake of the api format (time, lon, lat, depth, mag, loc).
+    :type event: dict
+    :param serials: The number of serials, the last one is final.
+    :type serials: int
+    :param interval: The interval in seconds between the serials.
+    :type interval: float
+    :param drift: The location drift in degrees of the first serial.
+    :type drift: float
+    :param mag_error: The magnitude underestimate of the first serial.
+    :type mag_error: float
+    :param rng: The random generator.
+    :type rng: np.random.Generator
+    :return: The EEW of the api format.
+    :rtype: list[dict]
+    """
+    rng = rng or np.random.default_rng()
+    eew_id = str(event.get("id", event["time"]))
+    published = event["time"] + 10000
+
+    eews = []
+    for serial in range(1, serials + 1):
+        # The error decays linearly to zero at the final serial
+        error = (serials - serial) / max(serials - 1, 1)
+        eews.append(
+            {
+                "author": "trem",
+                "id": eew_id,
+                "serial": serial,
+                "status": 0,
+                "final": int(serial == serials),
+                "eq": {
+                    "time": event["time"],
+                    "lon": round(event["lon"] + rng.normal(0, drift) * error, 4),
+                    "lat": round(event["lat"] + rng.normal(0, drift) * error, 4),
+                    "depth": max(int(event["depth"]), 1),
+                    "mag": round(event["mag"] - mag_error * error, 1),
+                    "loc": event.get("loc", ""),
+                },
+                "time": int(published + (serial - 1) * interval * 1000),
+            }
+        )
+    return eews
+
+
+def generate_catalog(
+    count: int,
+    min_mag: float = 4.0,
+    max_mag: float = 7.5,
+    b_value: float = 1.0,
+    bounds: tuple[float, float, float, float] = TAIWAN_BOUNDS,
+    rng: np.random.Generator = MISSING,
+) -> list[dict]:
+    """
+    Generate a catalog of synthetic earthquakes.
+    The magnitudes follow the truncated Gutenberg-Richter distribution.
+
+    :param count: The number of earthquakes.
+    :type count: int
+    :param min_mag: The minimum magnitude.
+    :type min_mag: float
+    :param max_mag: The maximum magnitude.
+    :type max_mag: float
+    :param b_value: The Gutenberg-Richter b-value.
+    :type b_value: float
+    :param bounds: The bounds of the epicenters (lon_min, lat_min, lon_max, lat_max).
+    :type bounds: tuple[float, float, float, float]
+    :param rng: The random generator.
+    :type rng: np.random.Generator
+    :return: The earthquakes of the api format.
+    :rtype: list[dict]
+    """
+    rng = rng or np.random.default_rng()
+    beta = b_value * math.log(10)
+    truncation = 1 - math.exp(-beta * (max_mag - min_mag))
+    mag = min_mag - np.log(1 - rng.random(count) * truncation) / beta
+    lon = rng.uniform(bounds[0], bounds[2], count)
+    lat = rng.uniform(bounds[1], bounds[3], count)
+    depth = np.clip(rng.exponential(20, count), 1, 300)
+    now = int(datetime.now(timezone.utc).timestamp() * 1000)
+
+    return [
+        {
+            "id": f"synthetic-{i + 1}",
+            "time": now,
+            "lon": round(float(lon[i]), 4),
+            "lat": round(float(lat[i]), 4),
+            "depth": int(depth[i]),
+            "mag": round(float(mag[i]), 1),
+            "loc": "",
+        }
+        for i in range(count)
+    ]
+
+
+def load_catalog(filepath: str) -> list[dict]:
+    """
+    Load a catalog of earthquakes from a CSV file.
+    The columns are `time` (ISO 8601 or milliseconds), `lon`, `lat`, `depth`, `mag`,
+    and the optional `id` and `loc`.
+
+    :param filepath: The CSV file path.
+    :type filepath: str
+    :return: The earthquakes of the api format.
+    :rtype: list[dict]
+    """
+    catalog = []
+    with open(filepath, encoding="utf-8", newline="") as f:
+        for i, row in enumerate(csv.DictReader(f)):
+            time = row["time"]
+            if time.isdigit():
+                time = int(time)
+            else:
+                dt = datetime.fromisoformat(time)
+                if dt.tzinfo is None:
+                    dt = dt.replace(tzinfo=timezone.utc)
+                time = int(dt.timestamp() * 1000)
+
+            catalog.append(
+                {
+                    "id": row.get("id") or str(i + 1),
+                    "time": time,
+                    "lon": float(row["lon"]),
+                    "lat": float(row["lat"]),
+                    "depth": max(int(float(row["depth"])), 1),
+                    "mag": float(row["mag"]),
+                    "loc": row.get("loc") or "",
+                }
+            )
+    return catalog
+
+
+def simulate(
+    eews: Iterable[dict],
+    regions: list[RegionLocation] = MISSING,
+    table: IntensityTable = MISSING,
+) -> dict[str, list]:
+    """
+    Run the EEW through the intensity engine without real-time waits.
+
+    :param eews: The EEW of the api format.
+    :type eews: Iterable[dict]
+    :param regions: List of RegionLocation to calculate. If missing, it will calculate all existing regions.
+    :type regions: list[RegionLocation]
+    :param table: The intensity lookup table, the exact formula is used if missing.
+    :type table: IntensityTable
+    :return: The table of the expected intensity and travel time, one row per EEW and region.
+    :rtype: dict[str, list]
+    """
+    regions = list(regions or REGIONS.values())
+    codes = [region.code for region in regions]
+    lon, lat, site_effect = REGION_COLUMNS.select(regions)
+
+    rows: dict[str, list] = {column: [] for column in SCENARIO_COLUMNS}
+    for eew in eews:
+        eq = eew["eq"]
+        depth = eq["depth"]
+        distance_in_radians = _calculate_distance_array(
+            Location(eq["lon"], eq["lat"]), lon, lat
+        )
+        real_distance_in_km = np.sqrt(
+            (distance_in_radians * EARTH_RADIUS) ** 2 + depth**2
+        )
+        if table is not MISSING:
+            intensities = table.lookup(
+                real_distance_in_km, eq["mag"], depth, site_effect
+            )
+        else:
+            intensities = _calculate_intensity_array(
+                real_distance_in_km, eq["mag"], depth, site_effect
+            )
+        p_travels, s_travels = get_wave_model(depth).get_travel_times(
+            distance_in_radians
+        )
+
+        size = len(regions)
+        rows["id"] += [eew["id"]] * size
+        rows["serial"] += [eew["serial"]] * size
+        rows["final"] += [bool(eew["final"])] * size
+        rows["mag"] += [eq["mag"]] * size
+        rows["depth"] += [depth] * size
+        rows["code"] += codes
+        rows["distance"] += np.round(real_distance_in_km, 2).tolist()
+        rows["intensity"] += np.round(intensities, 3).tolist()
+        rows["level"] += classify_intensity(intensities).tolist()
+        rows["p_travel"] += np.round(p_travels, 2).tolist()
+        rows["s_travel"] += np.round(s_travels, 2).tolist()
+
+    return rows
+
+
+def write_table(table: dict[str, list], filepath: str) -> int:
+    """
+    Write the table as CSV, return the number of rows.
+
+    :param table: The table of :func:`simulate`.
+    :type table: dict[str, list]
+    :param filepath: The CSV file path.
+    :type filepath: str
+    :return: The number of rows.
+    :rtype: int
+    """
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    with open(filepath, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(table.keys())
+        writer.writerows(zip(*table.values()))
+    return len(next(iter(table.values()), []))
+
+
+
+def simulate_catalog(
+    catalog: list[dict],
+    filepath: str,
+    serials: int = 5,
+    regions: list[RegionLocation] = MISSING,
+    table: IntensityTable = MISSING,
+    rng: np.random.Generator = MISSING,
+    max_workers: int | None = None,
+) -> int:
+    """
+    Simulate the serials of a catalog with the columnar batch evaluation and write the table as CSV.
+    The EEW are generated, evaluated and written in parts of :data:`PART_EEWS`,
+    the columns are the same as :func:`simulate`.
+
+    :param catalog: The earthquakes of the api format.
+    :type catalog: list[dict]
+    :param filepath: The CSV file path.
+    :type filepath: str
+    :param serials: The number of serials of each earthquake.
+    :type serials: int
+    :param regions: List of RegionLocation to calculate. If missing, it will calculate all existing regions.
+    :type regions: list[RegionLocation]
+    :param table: The intensity lookup table, the exact formula is used if missing.
+    :type table: IntensityTable
+    :param rng: The random generator.
+    :type rng: np.random.Generator
+    :param max_workers: The number of worker processes, evaluated in this process if 1.
+    :type max_workers: int | None
+    :return: The number of rows.
+    :rtype: int
+    :raises ValueError: If the run has more than :data:`MAX_SCENARIO_EEWS` EEW.
+    """
+    total = len(catalog) * serials
+    if total > MAX_SCENARIO_EEWS:
+        raise ValueError(
+            f"{total} EEW exceed the maximum of {MAX_SCENARIO_EEWS} of a scenario"
+        )
+
+    rng = rng or np.random.default_rng()
+    regions = list(regions or REGIONS.values())
+    codes = np.array([region.code for region in regions])
+    events_per_part = max(PART_EEWS // serials, 1)
+    if total <= PART_EEWS:
+        max_workers = 1
+
+    parts: list[list[dict]] = []
+
+    def _events():
+        """Generate the serials of each part, the array is evaluated by the pool."""
+        for i in range(0, len(catalog), events_per_part):
+            eews = [
+                eew
+                for event in catalog[i : i + events_per_part]
+                for eew in generate_serials(event, serials, rng=rng)
+            ]
+            parts.append(eews)
+            yield np.array(
+                [
+                    (eq["lon"], eq["lat"], eq["depth"], eq["mag"])
+                    for eq in (eew["eq"] for eew in eews)
+                ],
+                dtype=float,
+            )
+
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    rows = 0
+    with open(filepath, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(SCENARIO_COLUMNS)
+        for results in evaluate_catalogs(
+            _events(),
+            regions,
+            max_workers,
+            chunk_size=max(PART_EEWS // 4, 1),
+            table=table,
+        ):
+            eews = parts.pop(0)
+            size = len(regions)
+            columns = [
+                np.repeat([eew["id"] for eew in eews], size),
+                np.repeat([eew["serial"] for eew in eews], size),
+                np.repeat([bool(eew["final"]) for eew in eews], size),
+                np.repeat([eew["eq"]["mag"] for eew in eews], size),
+                np.repeat([eew["eq"]["depth"] for eew in eews], size),
+                np.tile(codes, len(eews)),
+                np.round(results.distance, 2).ravel(),
+                np.round(results.intensity, 3).ravel(),
+                classify_intensity(results.intensity).ravel(),
+                np.round(results.p_travel, 2).ravel(),
+                np.round(results.s_travel, 2).ravel(),
+            ]
+            writer.writerows(zip(*(column.tolist() for column in columns)))
+            rows += len(eews) * size
+    return rows
@@ -0,0 +1,186 @@
+"""Earthquake spatial index for region lookup."""
+
+import numpy as np
+from scipy.spatial import cKDTree
+import shapely
+
+from ..utils import MISSING
+from .location import (
+    REGION_COLUMNS,
+    REGIONS,
+    TOWN_CODES,
+    TOWN_DATA,
+    Location,
+    RegionLocation,
+)
+from .model import EARTH_RADIUS
+
+
+def _to_unit_vector(lon: np.ndarray, lat: np.ndarray) -> np.ndarray:
+    """
+    Convert longitude and latitude to cartesian coordinates on the unit sphere.
+
+    :param lon: The longitude array in degrees.
+    :type lon: np.ndarray
+    :param lat: The latitude array in degrees.
+    :type lat: np.ndarray
+    :return: The (n, 3) array of unit vectors.
+    :rtype: np.ndarray
+    """
+    lon = np.radians(lon)
+    lat = np.radians(lat)
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)))
+
+
+def _km_to_chord(distance: float) -> float:
+    """
+    Convert a great-circle distance on the Earth's surface to the unit sphere chord length.
+
+    :param distance: The great-circle distance in kilometers.
+    :type distance: float
+    :return: The chord length on the unit sphere.
+    :rtype: float
+    """
+    angle = min(max(distance, 0) / EARTH_RADIUS, np.pi)
+    return 2 * np.sin(angle / 2)
+
+
+class RegionIndex:
+    """
+    Represents a spatial index of the regions.
+    """
+
+    __slots__ = ("_regions", "_tree", "_towns", "_town_codes")
+
+    def __init__(
+        self,
+        regions: list[RegionLocation],
+        towns=MISSING,
+        town_codes: list[int] = MISSING,
+    ) -> None:
+        """
+        Initialize the region index.
+        Note: You should not create this class for the built-in regions, instead, use :data:`REGION_INDEX`.
+
+        :param regions: The regions to index.
+        :type regions: list[RegionLocation]
+        :param towns: The town polygons for point-in-polygon lookup.
+        :type towns: gpd.GeoDataFrame
+        :param town_codes: The region code of each row in `towns`.
+        :type town_codes: list[int]
+        """
+        self._regions = list(regions)
+        lon, lat, _ = REGION_COLUMNS.select(self._regions)
+        self._tree = cKDTree(_to_unit_vector(lon, lat))
+        self._towns = towns
+        self._town_codes = town_codes
+
+    @property
+    def regions(self) -> list[RegionLocation]:
+        """
+        The indexed regions.
+        """
+        return self._regions
+
+    def query_radius(self, location: Location, radius: float) -> list[RegionLocation]:
+        """
+        Get the regions within the radius of the location.
+
+        :param location: The center location.
+        :type location: Location
+        :param radius: The great-circle radius in kilometers.
+        :type radius: float
+        :return: The regions within the radius.
+        :rtype: list[RegionLocation]
+        """
+        if radius <= 0:
+            return []
+        point = _to_unit_vector(np.array([location.lon]), np.array([location.lat]))[0]
+        indices = self._tree.query_ball_point(point, _km_to_chord(radius))
+        return [self._regions[i] for i in sorted(indices)]
+
+    def query_nearest(self, location: Location, k: int = 1) -> list[RegionLocation]:
+        """
+        Get the k nearest regions of the location, ordered by distance.
+
+        :param location: The location.
+        :type location: Location
+        :param k: The number of regions to return.
+        :type k: int
+        :return: The nearest regions.
+        :rtype: list[RegionLocation]
+        """
+        k = min(k, len(self._regions))
+        if k < 1:
+            return []
+        point = _to_unit_vector(np.array([location.lon]), np.array([location.lat]))[0]
+        _, indices = self._tree.query(point, k=k)
+        return [self._regions[i] for i in np.atleast_1d(indices)]
+
+    def query_point(self, location: Location) -> RegionLocation | None:
+        """
+        Get the region whose town polygon contains the location.
+
+        :param location: The location.
+        :type location: Location
+        :return: The region, or None if the location is not inside any town.
+        :rtype: RegionLocation | None
+        """
+        if self._towns is MISSING:
+            return None
+        rows = self._towns.sindex.query(
+            shapely.Point(location.lon, location.lat), predicate="intersects"
+        )
+        for row in sorted(rows):
+            if (code := self._town_codes[row]) in REGIONS:
+                return REGIONS[code]
+        return None
+
+    def locate(self, location: Location) -> RegionLocation | None:
+        """
+        Get the region containing the location, fallback to the nearest region (e.g. offshore).
+
+        :param location: The location.
+        :type location: Location
+        :return: The region.
+        :rtype: RegionLocation | None
+        """
+        region = self.query_point(location)
+        if region is not None:
+            return region
+        nearest = self.query_nearest(location)
+        return nearest[0] if nearest else None
+
+
+REGION_INDEX = RegionIndex(REGIONS.values(), TOWN_DATA, TOWN_CODES)
+"The spatial index of all existing regions"
+
+
+def create_custom_region(
+    longitude: float, latitude: float, code: int, name: str = MISSING
+) -> RegionLocation:
+    """
+    Create a region of the user-defined coordinate, the site effect is resolved from the town it located.
+
+    :param longitude: The longitude of the coordinate.
+    :type longitude: float
+    :param latitude: The latitude of the coordinate.
+    :type latitude: float
+    :param code: The identifier of the region, should not conflict with existing regions.
+    :type code: int
+    :param name: The name of the region.
+    :type name: str
+    :return: The region object.
+    :rtype: RegionLocation
+    """
+    town = REGION_INDEX.locate(Location(longitude, latitude))
+    return RegionLocation(
+        longitude,
+        latitude,
+        code,
+        name,
+        town.city,
+        town.area,
+        town.side_effect,
+    )
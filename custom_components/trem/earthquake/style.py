@@ -0,0 +1,43 @@
+"""Earthquake map style shared by the renderers."""
+
+import os
+
+from PIL import Image
+
+from ..utils import MISSING
+
+P_WAVE_COLOR = "orange"
+S_WAVE_COLOR = "red"
+INTENSITY_COLOR: dict[int, str] = {
+    0: None,
+    1: "#387FFF",
+    2: "#244FD0",
+    3: "#35BF56",
+    4: "#F8F755",
+    5: "#FFC759",
+    6: "#FF9935",
+    7: "#DF443B",
+    8: "#7B170F",
+    9: "#7237C1",
+}
+TOWN_COLOR = "lightgrey"
+"The color of the towns without intensity"
+LEGEND_PATH = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)), "../asset/legend.png"
+)
+
+_legend: Image.Image = MISSING
+
+
+def get_legend() -> Image.Image:
+    """
+    Get the legend image, it is loaded on the first call.
+
+    :return: the RGBA legend image
+    :rtype: Image.Image
+    """
+    global _legend
+    if not _legend:
+        with Image.open(LEGEND_PATH) as image:
+            _legend = image.convert("RGBA")
+    return _legend
@@ -0,0 +1,224 @@
+"""Precomputed intensity lookup table.
+
+The intensity of :func:`model._calculate_intensity` is split into two terms:
+
+- The PGA term is linear in the magnitude, log10(distance) and log10(site effect),
+  it is evaluated exactly.
+- The PGV term is the sum of a nonlinear function of the magnitude and the
+  hypocentral distance, and a linear function of the depth. The nonlinear part
+  is precomputed on a magnitude (0.1 steps) x log10(distance) grid and bilinearly
+  interpolated, the depth part is evaluated exactly.
+"""
+
+import math
+
+import numpy as np
+
+from ..utils import MISSING
+
+# log10 of the PGA term constants: 2 * log10(1.657 * exp(1.533 * mag) * distance**-1.607) + 0.7
+_PGA_CONST = 2 * math.log10(1.657) + 0.7
+_PGA_MAG = 2 * 1.533 * math.log10(math.e)
+_PGA_DISTANCE = -2 * 1.607
+
+# The PGV term depth slope: 1.72 * 0.0038 * depth
+_PGV_DEPTH = 1.72 * 0.0038
+
+VALIDATION_SUBDIVISIONS = 4
+"The samples per cell side of the error scan, the cell edges, quarters and centers"
+ERROR_MARGIN = 0.05
+"The relative margin added to the largest sampled error"
+
+
+class IntensityTable:
+    """
+    Represents a precomputed intensity table over magnitude and hypocentral distance.
+    Note: You should not create this class directly, instead, use the :method:`get_intensity_table` method.
+    """
+
+    __slots__ = (
+        "_mag_min",
+        "_mag_step",
+        "_log_min",
+        "_log_step",
+        "_pgv",
+        "_max_error",
+    )
+
+    def __init__(
+        self,
+        mag_range: tuple[float, float] = (0.0, 9.5),
+        mag_step: float = 0.1,
+        distance_range: tuple[float, float] = (1.0, 2000.0),
+        distance_samples: int = 1024,
+    ) -> None:
+        """
+        Initialize the intensity table.
+
+        :param mag_range: The magnitude range of the table.
+        :type mag_range: tuple[float, float]
+        :param mag_step: The magnitude step of the table.
+        :type mag_step: float
+        :param distance_range: The hypocentral distance range in kilometers of the table.
+        :type distance_range: tuple[float, float]
+        :param distance_samples: The number of log-spaced distance samples.
+        :type distance_samples: int
+        """
+        mags = np.arange(
+            mag_range[0], mag_range[1] + mag_step / 2, mag_step, dtype=float
+        )
+        log_distance = np.linspace(
+            math.log10(distance_range[0]),
+            math.log10(distance_range[1]),
+            distance_samples,
+        )
+        self._mag_min = float(mags[0])
+        self._mag_step = mag_step
+        self._log_min = float(log_distance[0])
+        self._log_step = float(log_distance[1] - log_distance[0])
+        self._pgv = _pgv_term(mags[:, np.newaxis], 10 ** log_distance[np.newaxis, :])
+        self._max_error = self._validate(mags, log_distance)
+
+    @property
+    def max_error(self) -> float:
+        """
+        The bound of the intensity error of :meth:`lookup` against the exact formula,
+        within the magnitude and distance ranges of the table.
+        """
+        return self._max_error
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """
+        The shape of the table (magnitudes, distances).
+        """
+        return self._pgv.shape
+
+    def lookup(
+        self,
+        hypocenter_distance: np.ndarray,
+        magnitude: float | np.ndarray,
+        depth: float | np.ndarray,
+        site_effect: float | np.ndarray = 1.751,
+    ) -> np.ndarray:
+        """
+        Look up the intensity of the earthquake of multiple distances.
+        See :func:`model._calculate_intensity_array` for the exact version.
+
+        The PGV term is clamped to the table, the distances outside the distance range
+        (1 to 2000 km by default) and the magnitudes outside the magnitude range use the
+        nearest edge, so :attr:`max_error` does not hold there.
+
+        :param hypocenter_distance: Actual distance array from the hypocenter in kilometers.
+        :type hypocenter_distance: np.ndarray
+        :param magnitude: Magnitude of the earthquake, scalar or broadcastable array.
+        :type magnitude: float | np.ndarray
+        :param depth: Depth of the earthquake in kilometers, scalar or broadcastable array.
+        :type depth: float | np.ndarray
+        :param site_effect: Site effect factor, scalar or broadcastable array.
+        :type site_effect: float | np.ndarray
+        :return: Estimated intensity array.
+        :rtype: np.ndarray
+        """
+        log_distance = np.log10(hypocenter_distance)
+        magnitude = np.asarray(magnitude, dtype=float)
+
+        i = (
+            _PGA_CONST
+            + _PGA_MAG * magnitude
+            + _PGA_DISTANCE * log_distance
+            + 2 * np.log10(site_effect)
+        )
+
+        pgv = self._interpolate(magnitude, log_distance) + _PGV_DEPTH * np.asarray(depth)
+
+        return np.where(i > 3, pgv, i)
+
+    def _interpolate(
+        self, magnitude: np.ndarray, log_distance: np.ndarray
+    ) -> np.ndarray:
+        """
+        Bilinearly interpolate the PGV term of the table.
+        """
+        rows, cols = self._pgv.shape
+        u = np.clip((magnitude - self._mag_min) / self._mag_step, 0, rows - 1)
+        v = np.clip((log_distance - self._log_min) / self._log_step, 0, cols - 1)
+        v0 = np.minimum(v.astype(np.intp), cols - 2)
+        dv = v - v0
+
+        if u.ndim == 0:
+            # Single magnitude, blend the two rows once and interpolate the distances
+            u0 = min(int(u), rows - 2)
+            du = float(u) - u0
+            row = self._pgv[u0] * (1 - du) + self._pgv[u0 + 1] * du
+            return row[v0] + (row[v0 + 1] - row[v0]) * dv
+
+        u0 = np.minimum(u.astype(np.intp), rows - 2)
+        du = u - u0
+        top = self._pgv[u0, v0] * (1 - dv) + self._pgv[u0, v0 + 1] * dv
+        bottom = self._pgv[u0 + 1, v0] * (1 - dv) + self._pgv[u0 + 1, v0 + 1] * dv
+        return top * (1 - du) + bottom * du
+
+    def _validate(self, mags: np.ndarray, log_distance: np.ndarray) -> float:
+        """
+        Return the error bound of the PGV term against the exact formula.
+        The PGA term and the depth are exact, so it is the error bound of :meth:`lookup`.
+
+        The error is scanned at :data:`VALIDATION_SUBDIVISIONS` samples per cell side,
+        the largest error is not always at the cell centers as the term has a kink
+        where the distance reaches the rupture length, then :data:`ERROR_MARGIN` is added.
+        """
+        fractions = np.arange(VALIDATION_SUBDIVISIONS + 1) / VALIDATION_SUBDIVISIONS
+        scan_log_distance = (
+            log_distance[:-1, np.newaxis] + self._log_step * fractions[np.newaxis, :-1]
+        ).ravel()
+        scan_log_distance = np.append(scan_log_distance, log_distance[-1])
+        scan_mags = (
+            mags[:-1, np.newaxis] + self._mag_step * fractions[np.newaxis, :-1]
+        ).ravel()
+        scan_mags = np.append(scan_mags, mags[-1])
+
+        error = 0.0
+        for mag in scan_mags.tolist():
+            exact = _pgv_term(mag, 10**scan_log_distance)
+            approximate = self._interpolate(np.asarray(mag), scan_log_distance)
+            error = max(error, float(np.max(np.abs(exact - approximate))))
+        return error * (1 + ERROR_MARGIN)
+
+
+def _pgv_term(magnitude: np.ndarray, hypocenter_distance: np.ndarray) -> np.ndarray:
+    """
+    Calculate the PGV intensity term without the depth.
+
+    :param magnitude: Magnitude array.
+    :type magnitude: np.ndarray
+    :param hypocenter_distance: Actual distance array from the hypocenter in kilometers.
+    :type hypocenter_distance: np.ndarray
+    :return: The PGV intensity at depth 0.
+    :rtype: np.ndarray
+    """
+    long = 10 ** (0.5 * magnitude - 1.85) / 2
+    x = np.maximum(hypocenter_distance - long, 3)
+    gpv600 = 10 ** (
+        0.58 * magnitude
+        - 1.29
+        - np.log10(x + 0.0028 * 10 ** (0.5 * magnitude))
+        - 0.002 * x
+    )
+    return 2.68 + 1.72 * np.log10(gpv600 * 1.31)
+
+
+_intensity_table: IntensityTable = MISSING
+
+
+def get_intensity_table() -> IntensityTable:
+    """
+    Get the intensity table, it is built on the first call.
+
+    :return: The intensity table.
+    :rtype: IntensityTable
+    """
+    global _intensity_table
+    if not _intensity_table:
+        _intensity_table = IntensityTable()
+    return _intensity_table
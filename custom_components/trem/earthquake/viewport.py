@@ -0,0 +1,81 @@
+"""Earthquake map viewport."""
+
+import math
+from typing import TYPE_CHECKING
+
+from ..utils import MISSING
+from .location import TAIWAN_CENTER
+
+if TYPE_CHECKING:
+    from .eew import EarthquakeData
+
+MAP_SIZE: tuple[int, int] = (400, 600)
+"The width and height in pixels of the map images"
+HALF_WIDTH = 1.6
+"The half width in degrees of the viewport at zoom 1"
+HALF_HEIGHT = 2.4
+"The half height in degrees of the viewport at zoom 1"
+MIN_ZOOM = 0.35
+VIEW_MARGIN = 1.2
+FRAME_LEVEL = 2
+"The lowest intensity level of the regions framed by the viewport"
+
+
+def get_viewport(
+    earthquake: "EarthquakeData", time: float = MISSING
+) -> tuple[float, float, float]:
+    """
+    Get the viewport framing the felt area and the P wave of the earthquake.
+
+    :param earthquake: the earthquake which intensity have been calculated
+    :type earthquake: EarthquakeData
+    :param time: the travel time in seconds of the P wave to frame, defaults to the felt area only
+    :type time: float
+    :return: the zoom (1 is the whole Taiwan), the longitude and latitude of the center
+    :rtype: tuple[float, float, float]
+    """
+    # the epicentral distance in degrees of the farthest framed region
+    extent = max(
+        (
+            region.distance.degrees
+            for region in earthquake._expected_intensity.values()
+            if region.level >= FRAME_LEVEL
+        ),
+        default=0,
+    )
+    if time is not MISSING and time > 0:
+        extent = max(extent, earthquake.wave_model.get_arrival_distance(time)[0])
+
+    lon_extent = extent / math.cos(math.radians(earthquake.lat))
+    zoom = min(
+        max(
+            VIEW_MARGIN * max(lon_extent / HALF_WIDTH, extent / HALF_HEIGHT), MIN_ZOOM
+        ),
+        1,
+    )
+    # centered on the epicenter when zoomed in, between Taiwan and it at zoom 1
+    weight = (zoom - MIN_ZOOM) / (1 - MIN_ZOOM) / 2
+    return (
+        zoom,
+        earthquake.lon + (TAIWAN_CENTER.lon - earthquake.lon) * weight,
+        earthquake.lat + (TAIWAN_CENTER.lat - earthquake.lat) * weight,
+    )
+
+
+def get_bounds(
+    zoom: float, lon: float, lat: float
+) -> tuple[float, float, float, float]:
+    """
+    Get the boundary of a viewport.
+
+    :param zoom: the zoom of the viewport
+    :type zoom: float
+    :param lon: the longitude of the center
+    :type lon: float
+    :param lat: the latitude of the center
+    :type lat: float
+    :return: the west, south, east and north boundaries in degrees
+    :rtype: tuple[float, float, float, float]
+    """
+    lon_boundary, lat_boundary = HALF_WIDTH * zoom, HALF_HEIGHT * zoom
+    return lon - lon_boundary, lat - lat_boundary, lon + lon_boundary, lat + lat_boundary
@@ -29,3 +29,7 @@ class WebSocketClosure(exceptions.HomeAssistantError):
 
 class WebSocketException(exceptions.HomeAssistantError):
     """Represents a websocket closed signal."""
+
+
+class CoordinatesInvalid(exceptions.HomeAssistantError):
+    """Represents a user-defined coordinates is invalid."""
@@ -0,0 +1,136 @@
+"""Exposure statistics for the Taiwan Real-time Earthquake Monitoring."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from .earthquake.eew import EEW
+from .earthquake.location import RegionLocation
+from .earthquake.model import INTENSITY_DISPLAY
+
+
+class RegionExposure:
+    """Represents a bounded rolling store of the expected intensity and ETA of a region."""
+
+    __slots__ = ("_entries", "_max_events", "_max_age", "_counts", "_eta_sum")
+
+    def __init__(self, max_events: int, max_age: timedelta) -> None:
+        """Initialize the store."""
+
+        # Event id to (timestamp, intensity level, warning ETA in seconds), oldest first,
+        # keyed by the event so interleaved serials of concurrent events are not counted twice
+        self._entries: dict[str, tuple[float, int, float]] = {}
+        self._max_events = max_events
+        self._max_age = max_age.total_seconds()
+        self._counts: list[int] = [0] * len(INTENSITY_DISPLAY)
+        self._eta_sum: float = 0.0
+
+    @property
+    def count(self) -> int:
+        """The number of events in the store."""
+
+        return len(self._entries)
+
+    def record(self, timestamp: float, event_id: str, level: int, eta: float) -> None:
+        """Record an event, a new serial of a stored event replaces its intensity."""
+
+        entry = self._entries.get(event_id)
+        if entry is not None:
+            # The warning time left is the one of the first serial, the order is kept
+            eta = entry[2]
+            self._remove(entry)
+        elif len(self._entries) >= self._max_events:
+            self._remove(self._entries.pop(next(iter(self._entries))))
+
+        self._entries[event_id] = (timestamp, level, eta)
+        self._counts[level] += 1
+        self._eta_sum += eta
+        self.expire(timestamp)
+
+    def export(self) -> list[tuple[float, str, int, float]]:
+        """Return the entries (timestamp, event id, level, ETA), oldest first."""
+
+        return [
+            (timestamp, event_id, level, eta)
+            for event_id, (timestamp, level, eta) in self._entries.items()
+        ]
+
+    def expire(self, now: float) -> None:
+        """Remove the events older than the max age."""
+
+        while self._entries:
+            event_id = next(iter(self._entries))
+            if now - self._entries[event_id][0] <= self._max_age:
+                break
+            self._remove(self._entries.pop(event_id))
+
+    def summary(self) -> dict[str, int | float | str | dict[str, int] | None]:
+        """Return the aggregated statistics."""
+
+        count = len(self._entries)
+        max_level = next(
+            (level for level in reversed(range(len(self._counts))) if self._counts[level]),
+            None,
+        )
+        return {
+            "count": count,
+            "counts": {
+                INTENSITY_DISPLAY[level]: n for level, n in enumerate(self._counts)
+            },
+            "max_intensity": None if max_level is None else INTENSITY_DISPLAY[max_level],
+            "mean_eta": round(self._eta_sum / count, 1) if count else None,
+        }
+
+    def _remove(self, entry: tuple[float, int, float]) -> None:
+        """Subtract an entry from the aggregates."""
+
+        self._counts[entry[1]] -= 1
+        self._eta_sum -= entry[2]
+
+
+class ExposureTracker:
+    """Track the exposure statistics of the monitored regions."""
+
+    def __init__(
+        self, regions: list[RegionLocation], max_events: int, max_age: timedelta
+    ) -> None:
+        """Initialize the tracker."""
+
+        self.regions: dict[int, RegionExposure] = {
+            region.code: RegionExposure(max_events, max_age) for region in regions
+        }
+        self.version: int = 0
+
+    def record(self, eew: EEW) -> None:
+        """Record the expected intensity and ETA of an EEW in each monitored region."""
+
+        earthquake = eew.earthquake
+        expected_intensity = earthquake._expected_intensity  # noqa: SLF001
+        timestamp = earthquake.time.timestamp()
+        for code, exposure in self.regions.items():
+            expected = expected_intensity.get(code)
+            if expected is None:
+                continue
+
+            # The warning time left when the EEW is published, 0 in the blind zone
+            eta = (expected.distance.s_arrival_time - eew.time).total_seconds()
+            exposure.record(timestamp, eew.id, expected.level, max(eta, 0))
+        self.version += 1
+
+    def export(self) -> dict[str, list[tuple[float, str, int, float]]]:
+        """Return the entries of each region."""
+
+        return {
+            str(code): exposure.export() for code, exposure in self.regions.items()
+        }
+
+    def restore(self, data: dict[str, list[list]]) -> None:
+        """Restore the entries exported by :meth:`export`."""
+
+        for code, entries in data.items():
+            exposure = self.regions.get(int(code))
+            if exposure is None:
+                continue
+            for timestamp, event_id, level, eta in entries:
+                exposure.record(timestamp, event_id, level, eta)
+        self.version += 1
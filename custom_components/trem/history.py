@@ -0,0 +1,143 @@
+"""Persistent event history for the Taiwan Real-time Earthquake Monitoring."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import json
+import os
+import sqlite3
+import threading
+import time
+
+HISTORY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    received INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    id TEXT NOT NULL,
+    serial INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    UNIQUE (type, id, serial)
+);
+CREATE INDEX IF NOT EXISTS events_received ON events (received);
+CREATE INDEX IF NOT EXISTS events_id ON events (id);
+"""
+
+# Seconds between the retention prunes
+PRUNE_INTERVAL = 3600
+
+
+class HistoryStore:
+    """Append-only SQLite log of the received EEW, intensity reports and tsunami messages."""
+
+    def __init__(self, filepath: str, retention: timedelta) -> None:
+        """Initialize the store."""
+
+        self._filepath = filepath
+        self._retention = retention
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._pruned: float = 0.0
+
+    def open(self) -> None:
+        """Open the database and prune the expired events."""
+
+        os.makedirs(os.path.dirname(self._filepath), exist_ok=True)
+        with self._lock:
+            self._connection = sqlite3.connect(
+                self._filepath, check_same_thread=False
+            )
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript(HISTORY_SCHEMA)
+        self.prune()
+
+    def close(self) -> None:
+        """Close the database."""
+
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def append(
+        self, event_type: str, event_id: str, serial: int, data: dict, received: int
+    ) -> bool:
+        """Append an event, return False if the serial of the event is already recorded."""
+
+        with self._lock:
+            if self._connection is None:
+                return False
+            with self._connection:
+                cursor = self._connection.execute(
+                    "INSERT OR IGNORE INTO events VALUES (?, ?, ?, ?, ?)",
+                    (
+                        received,
+                        event_type,
+                        event_id,
+                        serial,
+                        json.dumps(data, ensure_ascii=False, separators=(",", ":")),
+                    ),
+                )
+
+        if time.monotonic() - self._pruned > PRUNE_INTERVAL:
+            self.prune()
+        return cursor.rowcount > 0
+
+    def prune(self) -> int:
+        """Delete the events older than the retention, return the number of deleted events."""
+
+        cutoff = int((datetime.now() - self._retention).timestamp() * 1000)
+        with self._lock:
+            if self._connection is None:
+                return 0
+            with self._connection:
+                cursor = self._connection.execute(
+                    "DELETE FROM events WHERE received < ?", (cutoff,)
+                )
+        self._pruned = time.monotonic()
+        return cursor.rowcount
+
+    def query(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        event_type: str | None = None,
+        event_id: str | None = None,
+        limit: int = 100,
+    ) -> list[dict]:
+        """Return the events received in the time range, newest first."""
+
+        clauses: list[str] = []
+        params: list = []
+        if start is not None:
+            clauses.append("received >= ?")
+            params.append(int(start.timestamp() * 1000))
+        if end is not None:
+            clauses.append("received <= ?")
+            params.append(int(end.timestamp() * 1000))
+        if event_type is not None:
+            clauses.append("type = ?")
+            params.append(event_type)
+        if event_id is not None:
+            clauses.append("id = ?")
+            params.append(event_id)
+
+        where = f"WHERE {" AND ".join(clauses)}" if clauses else ""
+        with self._lock:
+            if self._connection is None:
+                return []
+            rows = self._connection.execute(
+                f"SELECT received, type, id, serial, data FROM events {where} "  # noqa: S608
+                "ORDER BY received DESC LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+
+        return [
+            {
+                "received": received,
+                "type": event_type,
+                "id": event_id,
+                "serial": serial,
+                "data": json.loads(data),
+            }
+            for received, event_type, event_id, serial, data in rows
+        ]
@@ -4,34 +4,51 @@ from __future__ import annotations
 
 from collections.abc import Callable
 from datetime import datetime
-from io import BytesIO
+import hashlib
+from importlib import import_module
 import json
 import logging
-import os
 import re
 from typing import Any
 
-from PIL import Image
+from aiohttp import hdrs, web
 
-from homeassistant.components.image import ImageEntity
+from homeassistant.components.image import (
+    DOMAIN as IMAGE_DOMAIN,
+    ImageEntity,
+    ImageView,
+)
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import ATTR_ATTRIBUTION, CONF_REGION
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.util import dt as dt_util
 
+from .assets import AssetCatalog, async_get_assets
 from .const import (
     ATTR_ID,
     ATTRIBUTION,
     CONF_DRAW_MAP,
+    CONF_IMAGE_FORMAT,
+    CONF_IMAGE_QUALITY,
+    CONF_MAP_BACKEND,
+    DEFAULT_IMAGE_FORMAT,
+    DEFAULT_IMAGE_QUALITY,
+    DEFAULT_MAP_BACKEND,
     DEFAULT_NAME,
     DOMAIN,
     MANUFACTURER,
+    MAP_VIEW_URL,
     PLAN_NAME,
+    RENDER_TTL,
     TREM_COORDINATOR,
+    TREM_MAP_VIEW,
     TREM_NAME,
 )
+from .earthquake.clock import SERVER_CLOCK
 from .earthquake.eew import EEW
+from .earthquake.encoding import IMAGE_CONTENT_TYPES
+from .earthquake.raster import get_raster_layers
 from .update_coordinator import tremUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
@@ -48,11 +65,29 @@ async def async_setup_entry(
         domain_data: dict = hass.data[DOMAIN][config.entry_id]
         name: str = domain_data[TREM_NAME]
         coordinator: tremUpdateCoordinator = domain_data[TREM_COORDINATOR]
+        assets = await async_get_assets(hass)
+        await hass.async_add_executor_job(
+            _load_map_backend,
+            _get_config_value(config, CONF_MAP_BACKEND, DEFAULT_MAP_BACKEND),
+        )
+
+        if not hass.data.get(TREM_MAP_VIEW):
+            hass.http.register_view(earthquakeImageView(hass.data[IMAGE_DOMAIN]))
+            hass.data[TREM_MAP_VIEW] = True
 
-        device = earthquakeImage(hass, name, config, coordinator)
+        device = earthquakeImage(hass, name, config, coordinator, assets)
         async_add_devices([device], update_before_add=True)
 
 
+def _load_map_backend(backend: str) -> None:
+    """Load the map geometries of the renderer, so the first draw reads no files."""
+
+    if backend == "raster":
+        get_raster_layers()
+    else:
+        import_module(".earthquake.map", __package__)
+
+
 class earthquakeImage(ImageEntity):
     """Defines a TREM image entity."""
 
@@ -62,6 +97,7 @@ class earthquakeImage(ImageEntity):
         name: str,
         config_entry: ConfigEntry,
         coordinator: tremUpdateCoordinator,
+        assets: AssetCatalog,
     ) -> None:
         """Initialize the image."""
 
@@ -69,9 +105,20 @@ class earthquakeImage(ImageEntity):
 
         self._coordinator = coordinator
         self._hass = hass
+        self._assets = assets
 
         self._first_draw: bool = False
+        self._finalTime: tuple[str, datetime] | None = None
         self._region: int = _get_config_value(config_entry, CONF_REGION)
+        self._map_backend: str = _get_config_value(
+            config_entry, CONF_MAP_BACKEND, DEFAULT_MAP_BACKEND
+        )
+        self._image_format: str = _get_config_value(
+            config_entry, CONF_IMAGE_FORMAT, DEFAULT_IMAGE_FORMAT
+        )
+        self._image_quality: int = _get_config_value(
+            config_entry, CONF_IMAGE_QUALITY, DEFAULT_IMAGE_QUALITY
+        )
 
         attr_name = f"{DEFAULT_NAME} {self._region} Isoseismal Map"
         self._attr_name = attr_name
@@ -84,7 +131,8 @@ class earthquakeImage(ImageEntity):
             model=PLAN_NAME[self._coordinator.plan],
         )
 
-        self._image: BytesIO = BytesIO()
+        self._image: bytes = b""
+        self.etag: str | None = None
         self._mapSerial: dict = {
             "earthquake": "",
             "intensity": "",
@@ -102,7 +150,7 @@ class earthquakeImage(ImageEntity):
     async def async_image(self) -> bytes | None:
         """Return bytes of image."""
 
-        return self._image.getvalue()
+        return self._image
 
     @callback
     def _update_callback(self):
@@ -110,12 +158,14 @@ class earthquakeImage(ImageEntity):
 
         eew = self._coordinator.eew
         intensity = self._coordinator.intensity
-        image: BytesIO | None = self._draw(eew, intensity)
+        image: bytes | None = self._draw(eew, intensity)
 
         if image is None:
             return
 
+        # One immutable frame, shared by every fetch until the next frame
         self._image = image
+        self.etag = hashlib.blake2b(image, digest_size=16).hexdigest()
         self._attr_value[ATTR_ID] = json.dumps(self._mapSerial)
         self._attr_image_last_updated = dt_util.utcnow()
 
@@ -123,22 +173,17 @@ class earthquakeImage(ImageEntity):
 
     def _draw(
         self, eew: EEW | None = None, intensity: dict | None = None
-    ) -> BytesIO | None:
+    ) -> bytes | None:
         """Draw the earthquake map."""
 
-        image: BytesIO | None = None
+        image: bytes | None = None
 
         currentSerial = self._attr_value.get(ATTR_ID, "")
         if currentSerial == "":
             if not self._first_draw:
-                image = BytesIO()
+                image = self._assets.default_image
+                self._attr_content_type = "image/png"
                 self._first_draw = True
-
-                directory = os.path.dirname(os.path.realpath(__file__))
-                image_path = os.path.join(directory, "asset/default.png")
-
-                default_img = Image.open(image_path, mode="r")
-                default_img.save(image, format="PNG")
         elif isinstance(eew, EEW):
             tmp_intensity: dict = {}
 
@@ -158,22 +203,45 @@ class earthquakeImage(ImageEntity):
                         tmp_intensity[v] = k  # noqa: SLF001
 
             earthquake = eew.earthquake
+            earthquakeMap = (
+                earthquake.raster if self._map_backend == "raster" else earthquake.map
+            )
             tmp_intensity[self._region] = earthquake._expected_intensity.get(  # noqa: SLF001
                 self._region
             )
 
-            if currentSerial != json.dumps(tmpSerial):
-                earthquake.map.draw()
+            # Stop rendering and return the figure to the pool after the final report
+            now = SERVER_CLOCK.now()
+            if eew.final:
+                if self._finalTime is None or self._finalTime[0] != eew.id:
+                    self._finalTime = (eew.id, now)
+                elif now - self._finalTime[1] > RENDER_TTL:
+                    earthquake.release_maps()
+                    return None
 
-            waveSec = (datetime.now() - earthquake.time).total_seconds()
-            if waveSec > 0:
-                earthquake.map.draw_wave(time=waveSec)
+            with self._coordinator.latency.measure("render"):
+                waveSec = (now - earthquake.time).total_seconds()
+                if currentSerial != json.dumps(tmpSerial) or not earthquakeMap.drawn:
+                    earthquakeMap.draw(waveSec)
 
-            self._mapSerial = tmpSerial
-            image = earthquake.map.save()
+                if waveSec > 0:
+                    earthquakeMap.draw_wave(time=waveSec)
+
+                self._mapSerial = tmpSerial
+                image = earthquakeMap.save(self._image_format, self._image_quality)
+                self._attr_content_type = IMAGE_CONTENT_TYPES[self._image_format]
 
         return image
 
+    @property
+    def entity_picture(self) -> str | None:
+        """Return the map view with the ETag revalidation as entity picture."""
+
+        return (
+            f"{MAP_VIEW_URL.format(entity_id=self.entity_id)}"
+            f"?token={self.access_tokens[-1]}"
+        )
+
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return extra attributes."""
@@ -184,6 +252,36 @@ class earthquakeImage(ImageEntity):
         return self._attributes
 
 
+class earthquakeImageView(ImageView):
+    """Serve the isoseismal map with the ETag revalidation."""
+
+    name = "api:trem:map"
+    url = MAP_VIEW_URL
+
+    async def handle(
+        self, request: web.Request, image_entity: ImageEntity
+    ) -> web.StreamResponse:
+        """Serve the map, or not modified if the client has the current frame."""
+
+        if not isinstance(image_entity, earthquakeImage):
+            raise web.HTTPNotFound
+        if image_entity.etag is None:
+            # Nothing drawn yet
+            return await super().handle(request, image_entity)
+
+        etag = image_entity.etag
+        if any(tag.value in (etag, "*") for tag in request.if_none_match or ()):
+            response = web.Response(status=304)
+        else:
+            response = web.Response(
+                body=await image_entity.async_image(),
+                content_type=image_entity.content_type,
+            )
+        response.etag = etag
+        response.headers[hdrs.CACHE_CONTROL] = "no-cache"
+        return response
+
+
 def _get_config_value(config_entry: ConfigEntry, key: str, default: Any | None = None):
     if config_entry.options:
         return config_entry.options.get(key, default)
@@ -0,0 +1,112 @@
+"""Latency instrumentation for the Taiwan Real-time Earthquake Monitoring."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from contextlib import contextmanager
+import time
+
+LATENCY_STAGES = [
+    "jitter",  # network delay above the smallest delay of the recent frames
+    "decode",  # json decode of the frame
+    "parse",  # EEW parse
+    "intensity",  # expected intensity calculation
+    "render",  # map draw and encode
+    "state",  # EEW server time to the entity state written
+]
+
+# Log-spaced bucket upper bounds from 0.1 ms to about 15 minutes (12.5% steps)
+_BUCKET_BOUNDS: list[float] = [0.0001 * 1.125**i for i in range(137)]
+
+
+class LatencyHistogram:
+    """Represents a fixed-size histogram of latencies."""
+
+    __slots__ = ("_counts", "_count", "_sum", "_max")
+
+    def __init__(self) -> None:
+        """Initialize the histogram."""
+
+        self._counts: list[int] = [0] * (len(_BUCKET_BOUNDS) + 1)
+        self._count: int = 0
+        self._sum: float = 0.0
+        self._max: float = 0.0
+
+    @property
+    def count(self) -> int:
+        """The number of recorded latencies."""
+
+        return self._count
+
+    def record(self, seconds: float) -> None:
+        """Record a latency in seconds."""
+
+        self._counts[bisect_left(_BUCKET_BOUNDS, seconds)] += 1
+        self._count += 1
+        self._sum += seconds
+        if seconds > self._max:
+            self._max = seconds
+
+    def percentile(self, q: float) -> float | None:
+        """Return the upper bound in seconds of the bucket holding the q-th percentile."""
+
+        if self._count == 0:
+            return None
+
+        target = q / 100 * self._count
+        cumulative = 0
+        for i, count in enumerate(self._counts):
+            cumulative += count
+            if cumulative >= target and count > 0:
+                if i >= len(_BUCKET_BOUNDS):
+                    return self._max
+                return min(_BUCKET_BOUNDS[i], self._max)
+        return self._max
+
+    def summary(self) -> dict[str, float | int | None]:
+        """Return the summary in milliseconds."""
+
+        def _ms(value: float | None) -> float | None:
+            return None if value is None else round(value * 1000, 1)
+
+        return {
+            "count": self._count,
+            "mean": _ms(self._sum / self._count if self._count else None),
+            "p50": _ms(self.percentile(50)),
+            "p95": _ms(self.percentile(95)),
+            "p99": _ms(self.percentile(99)),
+            "max": _ms(self._max if self._count else None),
+        }
+
+
+class LatencyTracker:
+    """Track the latency of each stage from the server to the entity state."""
+
+    def __init__(self) -> None:
+        """Initialize the tracker."""
+
+        self.histograms: dict[str, LatencyHistogram] = {
+            stage: LatencyHistogram() for stage in LATENCY_STAGES
+        }
+
+    def record(self, stage: str, seconds: float) -> None:
+        """Record the latency of a stage."""
+
+        self.histograms[stage].record(seconds)
+
+    @contextmanager
+    def measure(self, stage: str):
+        """Measure the latency of the wrapped code as a stage."""
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.histograms[stage].record(time.perf_counter() - start)
+
+    def summary(self) -> dict[str, dict[str, float | int | None]]:
+        """Return the summary of all stages in milliseconds."""
+
+        return {
+            stage: histogram.summary() for stage, histogram in self.histograms.items()
+        }
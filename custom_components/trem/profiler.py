@@ -0,0 +1,140 @@
+"""On-demand profiling for the Taiwan Real-time Earthquake Monitoring."""
+
+from __future__ import annotations
+
+import cProfile
+import functools
+import os
+import pstats
+import threading
+import tracemalloc
+from typing import Any
+
+PACKAGE_DIRECTORY = os.path.dirname(os.path.realpath(__file__))
+
+
+class ProfileSession:
+    """Profile the calls of the patched methods with cProfile, and optionally tracemalloc."""
+
+    def __init__(self, memory: bool = False, frames: int = 10) -> None:
+        """Initialize the session."""
+
+        self._profile = cProfile.Profile()
+        # cProfile can not be enabled twice, the calls of other threads meanwhile are
+        # not profiled on their own (Python 3.12 still records them in the same profile)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._patched: list[tuple[Any, str]] = []
+        self._memory = memory
+        self._frames = frames
+        self._tracing = False
+        self._snapshot: tracemalloc.Snapshot | None = None
+        self.calls: dict[str, int] = {}
+        self.skipped: int = 0
+
+    def patch(self, obj: Any, name: str, label: str) -> None:
+        """Profile the calls of a method of an object until the session stops."""
+
+        method = getattr(obj, name)
+
+        @functools.wraps(method)
+        def _profiled(*args, **kwargs):
+            return self._call(label, method, *args, **kwargs)
+
+        setattr(obj, name, _profiled)
+        self._patched.append((obj, name))
+
+    def start(self) -> None:
+        """Start tracing the memory allocations if enabled."""
+
+        if not self._memory:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self._frames)
+            self._tracing = True
+        self._snapshot = tracemalloc.take_snapshot()
+
+    def stop(self) -> None:
+        """Restore the patched methods."""
+
+        for obj, name in self._patched:
+            # The instance attribute shadowed the method of the class
+            delattr(obj, name)
+        self._patched.clear()
+
+    def save(self, filepath: str, top: int = 20) -> dict[str, Any]:
+        """Write the pstats file and the allocation report, return the summary."""
+
+        snapshot: tracemalloc.Snapshot | None = None
+        if self._snapshot is not None:
+            # The allocations under the patched methods, without the profilers
+            snapshot = tracemalloc.take_snapshot().filter_traces(
+                [
+                    tracemalloc.Filter(
+                        True, f"{PACKAGE_DIRECTORY}{os.sep}*", all_frames=True
+                    ),
+                    tracemalloc.Filter(False, __file__),
+                    tracemalloc.Filter(False, cProfile.__file__),
+                    tracemalloc.Filter(False, tracemalloc.__file__),
+                ]
+            )
+            if self._tracing:
+                tracemalloc.stop()
+                self._tracing = False
+
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        with self._lock:
+            self._profile.dump_stats(filepath)
+            stats = pstats.Stats(self._profile)
+
+        # The wrappers of the patched methods are left out of the summary
+        functions = sorted(
+            (item for item in stats.stats.items() if item[0][0] != __file__),
+            key=lambda item: item[1][3],
+            reverse=True,
+        )
+        summary: dict[str, Any] = {
+            "calls": dict(self.calls),
+            "skipped": self.skipped,
+            "functions": [
+                (
+                    f"{os.path.basename(file)}:{line}({func})",
+                    round(cumulative * 1000, 1),
+                )
+                for (file, line, func), (_, _, _, cumulative, _) in functions[:top]
+            ],
+            "allocations": [],
+            "allocation_report": None,
+        }
+
+        if snapshot is not None:
+            differences = snapshot.compare_to(self._snapshot, "lineno")[:top]
+            report = f"{os.path.splitext(filepath)[0]}.tracemalloc.txt"
+            with open(report, "w", encoding="utf-8") as f:
+                for difference in differences:
+                    f.write(f"{difference}\n")
+            summary["allocations"] = [
+                (str(difference.traceback), difference.size_diff)
+                for difference in differences
+            ]
+            summary["allocation_report"] = report
+            self._snapshot = None
+        return summary
+
+    def _call(self, label: str, method, *args, **kwargs):
+        """Call the method, profiled unless another thread is being profiled."""
+
+        self.calls[label] = self.calls.get(label, 0) + 1
+        # Nested calls are already profiled by the outer call
+        if getattr(self._local, "active", False):
+            return method(*args, **kwargs)
+        if not self._lock.acquire(blocking=False):
+            self.skipped += 1
+            return method(*args, **kwargs)
+
+        self._local.active = True
+        try:
+            return self._profile.runcall(method, *args, **kwargs)
+        finally:
+            self._local.active = False
+            self._lock.release()
@@ -0,0 +1,53 @@
+"""Websocket frame recording for the Taiwan Real-time Earthquake Monitoring."""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+
+
+class FrameRecorder:
+    """Record the received websocket frames with their relative receive time."""
+
+    def __init__(self, max_frames: int = 100000) -> None:
+        """Initialize the recorder."""
+
+        self._start = time.monotonic()
+        self._max_frames = max_frames
+        self.frames: list[tuple[float, str]] = []
+
+    @property
+    def full(self) -> bool:
+        """Whether the recorder reached the max frames."""
+
+        return len(self.frames) >= self._max_frames
+
+    def add(self, frame: str) -> None:
+        """Record a raw frame."""
+
+        if not self.full:
+            self.frames.append((time.monotonic() - self._start, frame))
+
+    def save(self, filepath: str) -> int:
+        """Write the frames as JSON lines, return the number of frames."""
+
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        with open(filepath, "w", encoding="utf-8") as f:
+            for offset, frame in self.frames:
+                f.write(json.dumps({"offset": round(offset, 6), "frame": frame}))
+                f.write("\n")
+        return len(self.frames)
+
+
+def load_frames(filepath: str) -> list[tuple[float, dict]]:
+    """Load the recorded frames, return the relative receive time and the decoded frame."""
+
+    frames: list[tuple[float, dict]] = []
+    with open(filepath, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            frames.append((record["offset"], json.loads(record["frame"])))
+    return frames
@@ -0,0 +1,85 @@
+"""Wave arrival schedule for the Taiwan Real-time Earthquake Monitoring."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime, timedelta
+import math
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_time
+
+from .const import COUNTDOWN_THRESHOLDS
+from .earthquake.clock import SERVER_CLOCK
+from .earthquake.model import Distance
+
+
+class ArrivalSchedule:
+    """Schedule one-shot callbacks at the wave arrivals of a location."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        action: Callable[[str, int], None],
+        thresholds: list[int] = COUNTDOWN_THRESHOLDS,
+    ) -> None:
+        """Initialize the schedule.
+
+        The action is called with the arrived wave (`""`, `P` or `S`)
+        and the seconds left before the S wave arrival.
+        """
+
+        self._hass = hass
+        self._action = action
+        self._thresholds = thresholds
+        self._unsubs: list[CALLBACK_TYPE] = []
+
+    @callback
+    def async_schedule(self, distance: Distance) -> None:
+        """Schedule the callbacks of the wave arrivals, replace the previous ones."""
+
+        self.async_cancel()
+
+        now = SERVER_CLOCK.now()
+        p_arrival = distance.p_arrival_time
+        s_arrival = distance.s_arrival_time
+
+        points: list[tuple[datetime, str, int]] = [
+            (s_arrival - timedelta(seconds=left), "", left)
+            for left in self._thresholds
+        ]
+        points.append(
+            (
+                p_arrival,
+                "P",
+                max(math.ceil((s_arrival - p_arrival).total_seconds()), 0),
+            )
+        )
+        points.append((s_arrival, "S", 0))
+
+        for point, wave, left in points:
+            if point <= now:
+                continue
+            self._unsubs.append(
+                async_track_point_in_time(
+                    self._hass,
+                    self._make_action(wave, left),
+                    SERVER_CLOCK.to_local(point),
+                )
+            )
+
+    @callback
+    def async_cancel(self) -> None:
+        """Cancel the scheduled callbacks."""
+
+        while self._unsubs:
+            self._unsubs.pop()()
+
+    def _make_action(self, wave: str, left: int) -> Callable[[datetime], None]:
+        """Return the callback of a scheduled point."""
+
+        @callback
+        def _action(now: datetime) -> None:
+            self._action(wave, left)
+
+        return _action
@@ -6,11 +6,18 @@ from collections.abc import Callable
 from datetime import datetime, timedelta, timezone
 import logging
 import re
+import time
 from typing import Any
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import ATTR_ATTRIBUTION, CONF_EMAIL, CONF_REGION
+from homeassistant.const import (
+    ATTR_ATTRIBUTION,
+    CONF_EMAIL,
+    CONF_REGION,
+    EntityCategory,
+    UnitOfTime,
+)
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import DeviceInfo
 
@@ -29,6 +36,7 @@ from .const import (
     ATTR_OFFSET,
     ATTR_PROTOCOL,
     ATTR_TIME,
+    ATTR_WAVE,
     ATTRIBUTION,
     CONF_DRAW_MAP,
     CONF_PRESERVE_DATA,
@@ -42,11 +50,14 @@ from .const import (
     PLAN_NAME,
     TREM_COORDINATOR,
     TREM_NAME,
+    TREM_REGIONS,
     TSUNAMI_ATTR,
     TSUNAMI_ICON,
 )
-from .earthquake.eew import EEW, EarthquakeData
-from .earthquake.location import REGIONS
+from .earthquake.clock import SERVER_CLOCK
+from .earthquake.location import RegionLocation
+from .latency import LATENCY_STAGES
+from .schedule import ArrivalSchedule
 from .update_coordinator import tremUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
@@ -63,12 +74,26 @@ async def async_setup_entry(
     name: str = domain_data[TREM_NAME]
     coordinator: tremUpdateCoordinator = domain_data[TREM_COORDINATOR]
 
+    custom_regions: list[RegionLocation] = domain_data[TREM_REGIONS]
+
     earthquake_device = earthquakeSensor(hass, name, config_entry, coordinator)
+    extra_devices = [
+        earthquakeSensor(hass, name, config_entry, coordinator, region)
+        for region in custom_regions
+    ]
+    extra_devices.extend(
+        exposureSensor(name, config_entry, coordinator, region)
+        for region in coordinator.regions
+    )
+    extra_devices.extend(
+        latencySensor(name, config_entry, coordinator, stage)
+        for stage in LATENCY_STAGES
+    )
 
     not_membership = _get_config_value(config_entry, CONF_EMAIL, False) is False
     if not_membership:
         async_add_devices(
-            [earthquake_device],
+            [earthquake_device, *extra_devices],
             update_before_add=True,
         )
     else:
@@ -76,6 +101,7 @@ async def async_setup_entry(
         async_add_devices(
             [
                 earthquake_device,
+                *extra_devices,
                 tsunami_device,
             ],
             update_before_add=True,
@@ -91,6 +117,7 @@ class earthquakeSensor(SensorEntity):
         name: str,
         config_entry: ConfigEntry,
         coordinator: tremUpdateCoordinator,
+        region: RegionLocation | None = None,
     ) -> None:
         """Initialize the sensor."""
 
@@ -102,14 +129,27 @@ class earthquakeSensor(SensorEntity):
         self.simulatorTime: datetime | None = None
 
         self._region: int = _get_config_value(config_entry, CONF_REGION)
+        self._serial: str = ""
+        self._schedule = ArrivalSchedule(hass, self._async_countdown)
         self._preserve_data: bool = _get_config_value(
             config_entry, CONF_PRESERVE_DATA, False
         )
         self._draw_map: bool = _get_config_value(config_entry, CONF_DRAW_MAP, False)
 
-        attr_name = f"{DEFAULT_NAME} {self._region} Notification"
+        self._primary: bool = region is None
+        self._stateTime: datetime | None = None
+        if region is None:
+            attr_name = f"{DEFAULT_NAME} {self._region} Notification"
+            unique_id = attr_name
+        else:
+            # User-defined coordinate
+            self._region = region.code
+            self._name = region.name
+
+            attr_name = f"{DEFAULT_NAME} {region.name} Notification"
+            unique_id = f"{attr_name} {config_entry.entry_id}"
         self._attr_name = attr_name
-        self._attr_unique_id = re.sub(r"\s+|@", "_", attr_name.lower())
+        self._attr_unique_id = re.sub(r"\s+|@", "_", unique_id.lower())
         self._attr_device_info = DeviceInfo(
             identifiers={(DOMAIN, config_entry.entry_id)},
             name=self._name,
@@ -127,39 +167,49 @@ class earthquakeSensor(SensorEntity):
     def update(self):
         """Schedule a custom update via the common entity update service."""
 
-        eew: EEW | None = None
+        eewData: dict | None = None
         data = self._coordinator.earthquakeData
 
         if isinstance(data, list) and len(data) > 0:
             self.simulator = None
 
-            eew = EEW.from_dict(data[0])
+            eewData = data[0]
         elif isinstance(self.simulator, dict):
             if self.simulatorTime is None:
                 self.simulatorTime = datetime.now()
 
-            eew = EEW.from_dict(self.simulator)
+            eewData = self.simulator
 
             time = datetime.now() - self.simulatorTime
             if time.total_seconds() >= 240:
                 self.simulator = None
 
-        if isinstance(eew, EEW):
-            earthquakeSerial = f"{eew.id} (Serial {eew.serial})"
-            if self._coordinator.eew is None:
-                self._coordinator.eew = eew
-                old_earthquakeSerial = ""
-            else:
-                old_eew = self._coordinator.eew
-                old_earthquakeSerial = f"{old_eew.id} (Serial {old_eew.serial})"
+        if isinstance(eewData, dict):
+            earthquakeSerial = f"{eewData["id"]} (Serial {eewData["serial"]})"
+
+            # All monitored regions are calculated in one batch by the coordinator,
+            # shared by the entities, keep the state until it is parsed
+            eew = self._coordinator.get_eew(eewData)
+            if eew is None:
+                return self
 
             earthquake = eew.earthquake
-            earthquakeForecast = EarthquakeData.calc_expected_intensity(
-                earthquake, [REGIONS[self._region]]
-            ).get(self._region)
+            earthquakeForecast = earthquake._expected_intensity.get(self._region)  # noqa: SLF001
+
+            # The estimate is updated by the arrival schedule, not every update
+            if earthquakeSerial != self._serial:
+                self._serial = earthquakeSerial
+                if self._primary and self.simulator is None:
+                    self._stateTime = eew.time
+                self._hass.add_job(
+                    self._schedule.async_schedule, earthquakeForecast.distance
+                )
 
-            if earthquakeSerial != old_earthquakeSerial:
-                self._coordinator.eew = eew
+                earthquakeEst = int(
+                    earthquakeForecast.distance.s_left_time().total_seconds()
+                )
+                self._attr_value[ATTR_EST] = earthquakeEst if earthquakeEst > 0 else 0
+                self._attr_value[ATTR_WAVE] = ""
 
                 tz_TW = timezone(timedelta(hours=8))
                 earthquakeTime = earthquake.time.astimezone(tz_TW).strftime(
@@ -182,13 +232,11 @@ class earthquakeSensor(SensorEntity):
                 self._attr_value[ATTR_TIME] = earthquakeTime
                 self._state = intensity
                 self._icon = EARTHQUAKE_ICON[intensity.value]
-
-            earthquakeEst = int(
-                earthquakeForecast.distance.s_left_time().total_seconds()
-            )
-            self._attr_value[ATTR_EST] = earthquakeEst if earthquakeEst > 0 else 0
         else:
             self._attr_value[ATTR_EST] = 0
+            if self._serial:
+                self._serial = ""
+                self._hass.add_job(self._schedule.async_cancel)
 
         # Always display
         self._attr_value[ATTR_CODE] = self._name
@@ -219,6 +267,40 @@ class earthquakeSensor(SensorEntity):
         self.async_on_remove(
             self._coordinator.async_add_listener(self._update_callback)
         )
+        self.async_on_remove(self._schedule.async_cancel)
+
+    @callback
+    def _async_countdown(self, wave: str, left: int) -> None:
+        """Handle the scheduled wave arrival."""
+
+        self._attr_value[ATTR_EST] = left
+        if wave:
+            self._attr_value[ATTR_WAVE] = wave
+
+        self.async_write_ha_state()
+
+    async def async_update_ha_state(self, force_refresh: bool = False) -> None:
+        """Update and write the state, used by the polling."""
+
+        await super().async_update_ha_state(force_refresh)
+        self._async_record_state_latency()
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state."""
+
+        super().async_write_ha_state()
+        self._async_record_state_latency()
+
+    @callback
+    def _async_record_state_latency(self) -> None:
+        """Record the latency of a new EEW serial once its state is written."""
+
+        if self._stateTime is not None:
+            self._coordinator.latency.record(
+                "state", (SERVER_CLOCK.now() - self._stateTime).total_seconds()
+            )
+            self._stateTime = None
 
     @property
     def available(self):
@@ -379,6 +461,139 @@ class tsunamiSensor(SensorEntity):
         self.async_write_ha_state()
 
 
+class exposureSensor(SensorEntity):
+    """Defines a exposure statistics sensor entity."""
+
+    _attr_icon = "mdi:chart-histogram"
+    _attr_native_unit_of_measurement = "events"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        name: str,
+        config_entry: ConfigEntry,
+        coordinator: tremUpdateCoordinator,
+        region: RegionLocation,
+    ) -> None:
+        """Initialize the sensor."""
+
+        self._coordinator = coordinator
+        self._exposure = coordinator.exposure.regions[region.code]
+
+        # User-defined coordinates have negative codes
+        label = region.code if region.code > 0 else region.name
+        attr_name = f"{DEFAULT_NAME} {label} Exposure"
+        self._attr_name = attr_name
+        self._attr_unique_id = re.sub(
+            r"\s+|@", "_", f"{attr_name} {config_entry.entry_id}".lower()
+        )
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, config_entry.entry_id)},
+            name=name,
+            manufacturer=MANUFACTURER,
+            model=PLAN_NAME[self._coordinator.plan],
+        )
+        self._version: int = -1
+        self._count: int = -1
+
+    async def async_added_to_hass(self) -> None:
+        """Run when this Entity has been added to HA."""
+
+        self.async_on_remove(
+            self._coordinator.async_add_listener(self._update_callback)
+        )
+
+    @property
+    def native_value(self) -> int:
+        """Return the number of events in the window."""
+
+        return self._exposure.count
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return extra attributes."""
+
+        return self._exposure.summary()
+
+    @callback
+    def _update_callback(self) -> None:
+        """Handle updated data from the coordinator."""
+
+        # Only write the state when an event is recorded or expired
+        self._exposure.expire(time.time())
+        if (self._coordinator.exposure.version, self._exposure.count) != (
+            self._version,
+            self._count,
+        ):
+            self._version = self._coordinator.exposure.version
+            self._count = self._exposure.count
+            self.async_write_ha_state()
+
+
+class latencySensor(SensorEntity):
+    """Defines a latency diagnostic sensor entity."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        name: str,
+        config_entry: ConfigEntry,
+        coordinator: tremUpdateCoordinator,
+        stage: str,
+    ) -> None:
+        """Initialize the sensor."""
+
+        self._coordinator = coordinator
+        self._histogram = coordinator.latency.histograms[stage]
+
+        attr_name = f"{DEFAULT_NAME} {stage} Latency"
+        self._attr_name = attr_name
+        self._attr_unique_id = re.sub(
+            r"\s+|@", "_", f"{attr_name} {config_entry.entry_id}".lower()
+        )
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, config_entry.entry_id)},
+            name=name,
+            manufacturer=MANUFACTURER,
+            model=PLAN_NAME[self._coordinator.plan],
+        )
+        self._count: int = -1
+
+    async def async_added_to_hass(self) -> None:
+        """Run when this Entity has been added to HA."""
+
+        self.async_on_remove(
+            self._coordinator.async_add_listener(self._update_callback)
+        )
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the median latency."""
+
+        p50 = self._histogram.percentile(50)
+        return None if p50 is None else round(p50 * 1000, 1)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return extra attributes."""
+
+        return self._histogram.summary()
+
+    @callback
+    def _update_callback(self) -> None:
+        """Handle updated data from the coordinator."""
+
+        # Only write the state when there are new samples
+        if self._histogram.count != self._count:
+            self._count = self._histogram.count
+            self.async_write_ha_state()
+
+
 def _get_config_value(config_entry: ConfigEntry, key: str, default: Any | None = None):
     if config_entry.options:
         return config_entry.options.get(key, default)
@@ -5,22 +5,85 @@ from __future__ import annotations
 import json
 import logging
 import os
+import time
 
+import numpy as np
 import voluptuous as vol
 
+from homeassistant.components import persistent_notification
 from homeassistant.components.image import ImageEntity
 from homeassistant.const import ATTR_ENTITY_ID
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entity_platform import async_get_platforms
-
-from .const import ATTR_EQDATA, ATTR_FILENAME, DOMAIN, TREM_COORDINATOR
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+    ATTR_CATALOG,
+    ATTR_COUNT,
+    ATTR_DURATION,
+    ATTR_END,
+    ATTR_EQDATA,
+    ATTR_EVENT_ID,
+    ATTR_EVENT_TYPE,
+    ATTR_FAST,
+    ATTR_FILENAME,
+    ATTR_LIMIT,
+    ATTR_MEMORY,
+    ATTR_SEED,
+    ATTR_SERIALS,
+    ATTR_START,
+    CLIENT_NAME,
+    DOMAIN,
+    TREM_COORDINATOR,
+    TREM_HISTORY,
+)
+from .earthquake.scenario import (
+    MAX_SCENARIO_EEWS,
+    generate_catalog,
+    load_catalog,
+    simulate_catalog,
+)
+from .earthquake.table import IntensityTable, get_intensity_table
+from .history import HistoryStore
+from .image import earthquakeImage
+from .profiler import ProfileSession
+from .replay import FrameRecorder
 from .sensor import earthquakeSensor
 from .update_coordinator import tremUpdateCoordinator
+from .utils import MISSING
 
 _LOGGER = logging.getLogger(__name__)
 
+# Each spawned worker imports the integration, so the scenario pool is kept small
+SCENARIO_WORKERS = 2
+
+
+@callback
+def _async_get_entry(hass: HomeAssistant, entity_id: str) -> tuple[str, Entity]:
+    """Return the config entry id and the entity of an integration entity."""
+
+    platforms = async_get_platforms(hass, DOMAIN)
+    if len(platforms) < 1:
+        raise HomeAssistantError(f"Integration not found: {DOMAIN}")
+
+    for platform in platforms:
+        entity = platform.entities.get(entity_id, None)
+        if entity is not None:
+            return platform.config_entry.entry_id, entity
+
+    raise HomeAssistantError(
+        f"Could not find entity {entity_id} from integration {DOMAIN}"
+    )
+
 
 def register_services(hass: HomeAssistant) -> None:
     """Set up the TREM integration service."""
@@ -36,24 +99,8 @@ def register_services(hass: HomeAssistant) -> None:
                 f"Cannot write `{filepath}`, no access to path; `allowlist_external_dirs` may need to be adjusted in `configuration.yaml`"
             )
 
-        platforms = async_get_platforms(hass, DOMAIN)
-
-        if len(platforms) < 1:
-            raise HomeAssistantError(f"Integration not found: {DOMAIN}")
-
-        entity: ImageEntity | None = None
-
-        for platform in platforms:
-            entity_tmp: ImageEntity | None = platform.entities.get(entity_id, None)
-            if entity_tmp is not None:
-                entity = entity_tmp
-                break
-
-        if not entity:
-            raise HomeAssistantError(
-                f"Could not find entity {entity_id} from integration {DOMAIN}"
-            )
-
+        entity: ImageEntity
+        _, entity = _async_get_entry(hass, entity_id)
         image = await entity.async_image()
 
         def _write_image(to_file: str, image_data: bytes) -> None:
@@ -73,43 +120,24 @@ def register_services(hass: HomeAssistant) -> None:
         entity_id: str | None = service_call.data[ATTR_ENTITY_ID]
         eartkquakeData: dict = service_call.data[ATTR_EQDATA]
 
-        platforms = async_get_platforms(hass, DOMAIN)
-        if len(platforms) < 1:
-            raise HomeAssistantError(f"Integration not found: {DOMAIN}")
-
-        entity: earthquakeSensor | None = None
-        for platform in platforms:
-            entity_tmp = platform.entities.get(entity_id, None)
-            if entity_tmp is not None:
-                entity = entity_tmp
-                break
-        if entity is None:
-            raise HomeAssistantError(
-                f"Could not find entity {entity_id} from integration {DOMAIN}"
-            )
+        entity: earthquakeSensor
+        entry_id, entity = _async_get_entry(hass, entity_id)
 
         _LOGGER.debug("Starting simulator earthquake")
-        entity.simulator = json.loads(eartkquakeData)
+        simulator: dict = json.loads(eartkquakeData)
+        coordinator: tremUpdateCoordinator = hass.data[DOMAIN][entry_id][
+            TREM_COORDINATOR
+        ]
+        # A simulation must not trigger the automations of the real events
+        await coordinator.async_update_eew(simulator, record=False, fire=False)
+        entity.simulator = simulator
 
     async def reconnect(service_call: ServiceCall) -> None:
         """Reconnect the service."""
 
         entity_id: str | None = service_call.data[ATTR_ENTITY_ID]
 
-        platforms = async_get_platforms(hass, DOMAIN)
-        if len(platforms) < 1:
-            raise HomeAssistantError(f"Integration not found: {DOMAIN}")
-
-        entry_id: str | None = None
-        for platform in platforms:
-            entity_tmp = platform.entities.get(entity_id, None)
-            if entity_tmp is not None:
-                entry_id = platform.config_entry.entry_id
-                break
-        if entry_id is None:
-            raise HomeAssistantError(
-                f"Could not find entity {entity_id} from integration {DOMAIN}"
-            )
+        entry_id, _ = _async_get_entry(hass, entity_id)
 
         domain_data: dict = hass.data[DOMAIN][entry_id]
         coordinator: tremUpdateCoordinator = domain_data[TREM_COORDINATOR]
@@ -118,6 +146,208 @@ def register_services(hass: HomeAssistant) -> None:
         coordinator.connection = None
         coordinator.update_interval = coordinator.timer
 
+    async def record_frames(service_call: ServiceCall) -> None:
+        """Record the websocket frames to a file for replay."""
+
+        entity_id: str | None = service_call.data[ATTR_ENTITY_ID]
+        filepath: str = service_call.data[ATTR_FILENAME]
+        duration: int = service_call.data[ATTR_DURATION]
+
+        if not hass.config.is_allowed_path(filepath):
+            raise HomeAssistantError(
+                f"Cannot write `{filepath}`, no access to path; `allowlist_external_dirs` may need to be adjusted in `configuration.yaml`"
+            )
+
+        entry_id, _ = _async_get_entry(hass, entity_id)
+
+        domain_data: dict = hass.data[DOMAIN][entry_id]
+        coordinator: tremUpdateCoordinator = domain_data[TREM_COORDINATOR]
+        if coordinator.recorder is not None:
+            raise HomeAssistantError("The websocket frames are already recording")
+
+        recorder = FrameRecorder()
+        coordinator.recorder = recorder
+        if coordinator.connection is not None:
+            coordinator.connection.recorder = recorder
+
+        async def _stop_recording(_now) -> None:
+            coordinator.recorder = None
+            if coordinator.connection is not None:
+                coordinator.connection.recorder = None
+
+            try:
+                count = await hass.async_add_executor_job(recorder.save, filepath)
+            except OSError as err:
+                _LOGGER.error("Can't write frames to file: %s", err)
+                return
+
+            persistent_notification.async_create(
+                hass,
+                f"Recorded {count} websocket frames to `{filepath}`.",
+                CLIENT_NAME,
+                f"{DOMAIN}.record",
+            )
+
+        _LOGGER.debug("Recording websocket frames for %s seconds", duration)
+        async_call_later(hass, duration, _stop_recording)
+
+    async def profile(service_call: ServiceCall) -> None:
+        """Profile the coordinator, the entity updates and the map rendering."""
+
+        entity_id: str | None = service_call.data[ATTR_ENTITY_ID]
+        filepath: str = service_call.data[ATTR_FILENAME]
+        duration: int = service_call.data[ATTR_DURATION]
+        memory: bool = service_call.data[ATTR_MEMORY]
+
+        if not hass.config.is_allowed_path(filepath):
+            raise HomeAssistantError(
+                f"Cannot write `{filepath}`, no access to path; `allowlist_external_dirs` may need to be adjusted in `configuration.yaml`"
+            )
+
+        entry_id, _ = _async_get_entry(hass, entity_id)
+
+        domain_data: dict = hass.data[DOMAIN][entry_id]
+        coordinator: tremUpdateCoordinator = domain_data[TREM_COORDINATOR]
+        if coordinator.profiler is not None:
+            raise HomeAssistantError("The integration is already profiling")
+
+        session = ProfileSession(memory)
+        for name in ("parse_eew", "async_fire_eew"):
+            session.patch(coordinator, name, f"coordinator.{name}")
+        for platform in async_get_platforms(hass, DOMAIN):
+            if platform.config_entry.entry_id != entry_id:
+                continue
+            for entity in platform.entities.values():
+                if isinstance(entity, earthquakeImage):
+                    session.patch(entity, "_draw", f"{entity.entity_id}.draw")
+                elif hasattr(entity, "update"):
+                    session.patch(entity, "update", f"{entity.entity_id}.update")
+
+        coordinator.profiler = session
+        await hass.async_add_executor_job(session.start)
+
+        async def _stop_profiling(_now) -> None:
+            session.stop()
+            coordinator.profiler = None
+
+            try:
+                summary = await hass.async_add_executor_job(session.save, filepath)
+            except OSError as err:
+                _LOGGER.error("Can't write profile to file: %s", err)
+                return
+
+            message = [
+                f"Profiled {sum(summary['calls'].values())} calls in {duration} seconds "
+                f"({summary['skipped']} concurrent calls skipped), saved to `{filepath}`.",
+                "",
+                "Top functions by cumulative time:",
+                *(f"- `{name}` {ms} ms" for name, ms in summary["functions"][:5]),
+            ]
+            if summary["allocation_report"] is not None:
+                message += [
+                    "",
+                    f"Top allocations, saved to `{summary['allocation_report']}`:",
+                    *(
+                        f"- `{line}` {size / 1024:+.1f} KiB"
+                        for line, size in summary["allocations"][:5]
+                    ),
+                ]
+
+            persistent_notification.async_create(
+                hass,
+                "\n".join(message),
+                CLIENT_NAME,
+                f"{DOMAIN}.profile",
+            )
+
+        _LOGGER.debug("Profiling for %s seconds", duration)
+        async_call_later(hass, duration, _stop_profiling)
+
+    async def simulate_scenario(service_call: ServiceCall) -> None:
+        """Run a catalog of earthquake scenarios in batch and save the table."""
+
+        entity_id: str | None = service_call.data[ATTR_ENTITY_ID]
+        filepath: str = service_call.data[ATTR_FILENAME]
+        catalog_path: str | None = service_call.data.get(ATTR_CATALOG)
+        count: int = service_call.data[ATTR_COUNT]
+        serials: int = service_call.data[ATTR_SERIALS]
+        seed: int | None = service_call.data.get(ATTR_SEED)
+        fast: bool = service_call.data[ATTR_FAST]
+
+        if catalog_path is None and count * serials > MAX_SCENARIO_EEWS:
+            raise HomeAssistantError(
+                f"The scenario has {count * serials} EEW, the maximum is {MAX_SCENARIO_EEWS}"
+            )
+
+        for path in (filepath, catalog_path):
+            if path is not None and not hass.config.is_allowed_path(path):
+                raise HomeAssistantError(
+                    f"Cannot access `{path}`, no access to path; `allowlist_external_dirs` may need to be adjusted in `configuration.yaml`"
+                )
+
+        entry_id, _ = _async_get_entry(hass, entity_id)
+
+        domain_data: dict = hass.data[DOMAIN][entry_id]
+        coordinator: tremUpdateCoordinator = domain_data[TREM_COORDINATOR]
+
+        def _run_scenario() -> tuple[int, int, float, IntensityTable]:
+            """Executor helper to run the scenario."""
+            start = time.perf_counter()
+            # The table validates its error bound against the exact formula when built
+            table = get_intensity_table() if fast else MISSING
+            rng = np.random.default_rng(seed)
+            catalog = (
+                load_catalog(catalog_path)
+                if catalog_path is not None
+                else generate_catalog(count, rng=rng)
+            )
+            rows = simulate_catalog(
+                catalog,
+                filepath,
+                serials,
+                coordinator.calc_regions,
+                table,
+                rng,
+                SCENARIO_WORKERS,
+            )
+            return len(catalog), rows, time.perf_counter() - start, table
+
+        try:
+            events, rows, elapsed, table = await hass.async_add_executor_job(
+                _run_scenario
+            )
+        except (OSError, KeyError, ValueError) as err:
+            raise HomeAssistantError(f"Can't run the scenario: {err}") from err
+
+        method = (
+            f"lookup table, intensity error within {table.max_error:.3f}"
+            if table
+            else "exact formula"
+        )
+        persistent_notification.async_create(
+            hass,
+            f"Simulated {events} earthquakes ({rows} rows, {method}) in {elapsed:.1f} seconds, saved to `{filepath}`.",
+            CLIENT_NAME,
+            f"{DOMAIN}.scenario",
+        )
+
+    async def query_history(service_call: ServiceCall) -> ServiceResponse:
+        """Query the recorded events of the history store."""
+
+        history: HistoryStore | None = hass.data.get(TREM_HISTORY)
+        if history is None:
+            raise HomeAssistantError(f"Integration not found: {DOMAIN}")
+
+        events = await hass.async_add_executor_job(
+            history.query,
+            service_call.data.get(ATTR_START),
+            service_call.data.get(ATTR_END),
+            service_call.data.get(ATTR_EVENT_TYPE),
+            service_call.data.get(ATTR_EVENT_ID),
+            service_call.data[ATTR_LIMIT],
+        )
+        return {"events": events}
+
     hass.services.async_register(
         DOMAIN,
         "simulator",
@@ -152,3 +382,73 @@ def register_services(hass: HomeAssistant) -> None:
             }
         ),
     )
+
+    hass.services.async_register(
+        DOMAIN,
+        "record",
+        record_frames,
+        vol.Schema(
+            {
+                vol.Required(ATTR_ENTITY_ID): cv.entity_id,
+                vol.Required(ATTR_FILENAME): cv.string,
+                vol.Optional(ATTR_DURATION, default=60): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=3600)
+                ),
+            }
+        ),
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "profile",
+        profile,
+        vol.Schema(
+            {
+                vol.Required(ATTR_ENTITY_ID): cv.entity_id,
+                vol.Required(ATTR_FILENAME): cv.string,
+                vol.Optional(ATTR_DURATION, default=60): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=3600)
+                ),
+                vol.Optional(ATTR_MEMORY, default=False): cv.boolean,
+            }
+        ),
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "scenario",
+        simulate_scenario,
+        vol.Schema(
+            {
+                vol.Required(ATTR_ENTITY_ID): cv.entity_id,
+                vol.Required(ATTR_FILENAME): cv.string,
+                vol.Optional(ATTR_CATALOG): cv.string,
+                vol.Optional(ATTR_COUNT, default=100): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=100000)
+                ),
+                vol.Optional(ATTR_SERIALS, default=5): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=50)
+                ),
+                vol.Optional(ATTR_SEED): vol.Coerce(int),
+                vol.Optional(ATTR_FAST, default=False): cv.boolean,
+            }
+        ),
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        "history",
+        query_history,
+        vol.Schema(
+            {
+                vol.Optional(ATTR_START): cv.datetime,
+                vol.Optional(ATTR_END): cv.datetime,
+                vol.Optional(ATTR_EVENT_TYPE): vol.In(["eew", "intensity", "tsunami"]),
+                vol.Optional(ATTR_EVENT_ID): cv.string,
+                vol.Optional(ATTR_LIMIT, default=100): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=10000)
+                ),
+            }
+        ),
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -35,12 +35,15 @@ from .const import (
     REQUEST_TIMEOUT,
     __version__,
 )
+from .earthquake.clock import SERVER_CLOCK
 from .exceptions import (
     CannotConnect,
     UnknownError,
     WebSocketClosure,
     WebSocketException,
 )
+from .latency import LatencyTracker
+from .replay import FrameRecorder
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -77,10 +80,18 @@ class WebSocketService(Enum):
 class WebSocketConnection:
     """A Websocket connection to a TREM service."""
 
-    def __init__(self, hass: HomeAssistant, url: str, credentials: list) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        url: str,
+        credentials: list,
+        latency: LatencyTracker | None = None,
+    ) -> None:
         """Initialize the websocket."""
 
         self._hass = hass
+        self._latency = latency or LatencyTracker()
+        self.recorder: FrameRecorder | None = None
 
         self._connection: ClientWebSocketResponse | None = None
         self._session = async_get_clientsession(hass)
@@ -152,6 +163,7 @@ class WebSocketConnection:
             return {}
 
         msg = await self._connection.receive()
+        received = SERVER_CLOCK.local_timestamp()
         if msg:
             msg_type: WSMsgType = msg.type
         else:
@@ -164,13 +176,20 @@ class WebSocketConnection:
         ):
             raise WebSocketClosure
 
-        msg_data: dict = json.loads(msg.data)
+        if self.recorder is not None:
+            self.recorder.add(msg.data)
+
+        with self._latency.measure("decode"):
+            msg_data: dict = json.loads(msg.data)
 
         if msg_type == WSMsgType.ERROR:
             handle_error = await self._handle_error(msg_data)
             if not handle_error:
                 raise WebSocketException
 
+        # Both ntp and data frames are stamped with the server time
+        SERVER_CLOCK.sync(msg_data.get("time", 0), received)
+
         data_type = msg_data.get("type")
         if data_type == WebSocketEvent.VERIFY.value:
             self._access_token = await self._fetchToken(credentials=self._credentials)
@@ -184,6 +203,13 @@ class WebSocketConnection:
             data: dict = await asyncio.wait_for(self._wait_for_verify(), timeout=60)
             self._subscrib_service = data.get("list", [])
         elif data_type == "data":
+            # The offset is estimated from the fastest recent frame, so the one-way
+            # delay itself can not be measured, only how much later this frame is
+            if msgTime := msg_data.get("time", 0):
+                self._latency.record(
+                    "jitter", received + SERVER_CLOCK.offset - msgTime / 1000
+                )
+
             data: dict = msg_data.get("data")
             eventType: dict = data.get("type")
 
@@ -218,6 +244,8 @@ class WebSocketConnection:
         while True:
             msg = await self._connection.receive()
             if msg:
+                if self.recorder is not None:
+                    self.recorder.add(msg.data)
                 msg_data: dict = json.loads(msg.data)
             else:
                 continue
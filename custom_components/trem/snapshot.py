@@ -0,0 +1,52 @@
+"""Warm restart snapshot for the Taiwan Real-time Earthquake Monitoring."""
+
+from __future__ import annotations
+
+import logging
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, SNAPSHOT_MAX_AGE, SNAPSHOT_VERSION
+from .earthquake.clock import SERVER_CLOCK
+from .earthquake.model import restore_wave_models
+from .update_coordinator import tremUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def get_snapshot_store(hass: HomeAssistant, entry_id: str) -> Store:
+    """Return the snapshot store of a config entry."""
+
+    return Store(hass, SNAPSHOT_VERSION, f"{DOMAIN}.{entry_id}.snapshot")
+
+
+async def async_restore_snapshot(
+    hass: HomeAssistant, store: Store, coordinator: tremUpdateCoordinator
+) -> None:
+    """Restore the snapshot to the coordinator and save the later snapshots."""
+
+    coordinator.snapshot = store
+    data: dict | None = await store.async_load()
+    if not data:
+        return
+
+    restored = await hass.async_add_executor_job(
+        restore_wave_models, data.get("wave_models", {})
+    )
+    coordinator.exposure.restore(data.get("exposure", {}))
+
+    # Resume the EEW in progress, the countdowns continue from the server clock
+    eewData: dict | None = data.get("eew")
+    if eewData is not None:
+        age = SERVER_CLOCK.timestamp() - eewData["eq"]["time"] / 1000
+        if age < SNAPSHOT_MAX_AGE.total_seconds():
+            coordinator.earthquakeData = [eewData]
+            await coordinator.async_update_eew(eewData, record=False, fire=False)
+
+    _LOGGER.debug(
+        "Restored the snapshot, %s wave models, EEW %s",
+        restored,
+        coordinator.eew.id if coordinator.eew else None,
+    )
+
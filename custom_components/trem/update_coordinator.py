@@ -15,8 +15,9 @@ import validators
 
 from homeassistant.components import persistent_notification
 from homeassistant.const import CONF_EMAIL, CONTENT_TYPE_JSON
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .const import (
@@ -26,13 +27,27 @@ from .const import (
     CONF_PASS,
     CUSTOMIZE_PLAN,
     DOMAIN,
+    EVENT_EEW,
+    EVENT_RTS,
+    EVENT_TSUNAMI,
+    EXPOSURE_MAX_AGE,
+    EXPOSURE_MAX_EVENTS,
     FREE_PLAN,
     HA_USER_AGENT,
     REQUEST_TIMEOUT,
+    SNAPSHOT_DELAY,
     SUBSCRIBE_PLAN,
 )
+from .earthquake.clock import SERVER_CLOCK
 from .earthquake.eew import EEW
+from .earthquake.location import REGIONS, RegionLocation
+from .earthquake.model import export_wave_models
 from .exceptions import UnknownError, WebSocketClosure, WebSocketException
+from .exposure import ExposureTracker
+from .history import HistoryStore
+from .latency import LatencyTracker
+from .profiler import ProfileSession
+from .replay import FrameRecorder
 from .session import WebSocketConnection
 
 _LOGGER = logging.getLogger(__name__)
@@ -46,6 +61,7 @@ class tremUpdateCoordinator(DataUpdateCoordinator):
         hass: HomeAssistant,
         base_info: str | dict,
         update_interval: timedelta,
+        regions: list[RegionLocation] | None = None,
     ) -> None:
         """Initialize the data object."""
 
@@ -56,8 +72,15 @@ class tremUpdateCoordinator(DataUpdateCoordinator):
         self.status: str = "http"
         self.retry: int = 0
 
+        # Instrumentation
+        self.latency = LatencyTracker()
+        self.profiler: ProfileSession | None = None
+
         # Websocket data
         self.connection: WebSocketConnection | None = None
+        self.recorder: FrameRecorder | None = None
+        self.history: HistoryStore | None = None
+        self.snapshot: Store | None = None
         self.session = async_get_clientsession(hass)
         self._credentials: dict | None = None
 
@@ -102,6 +125,17 @@ class tremUpdateCoordinator(DataUpdateCoordinator):
 
         # Earthquake data
         self.eew: EEW | None = None
+        self.regions: list[RegionLocation] = regions or []
+        self.calc_regions: list[RegionLocation] = [
+            *REGIONS.values(),
+            *(region for region in self.regions if region.code not in REGIONS),
+        ]
+        self.exposure = ExposureTracker(
+            self.regions, EXPOSURE_MAX_EVENTS, EXPOSURE_MAX_AGE
+        )
+        self._tsunamiSerial: str = ""
+        self._intensitySerial: str = ""
+        self._rtsTime: int | None = None
 
         super().__init__(
             hass,
@@ -122,8 +156,11 @@ class tremUpdateCoordinator(DataUpdateCoordinator):
             try:
                 if self.connection is None:
                     self.connection = WebSocketConnection(
-                        self._hass, self._ws_url, self._credentials
+                        self._hass, self._ws_url, self._credentials, self.latency
                     )
+                    self.connection.recorder = self.recorder
+                    # Keep the restored EEW until the server sends a new one
+                    self.connection.earthquakeData = self.earthquakeData
                     self._hass.async_create_task(self.connection.connect())
 
                 if self.connection.is_running:
@@ -142,6 +179,7 @@ class tremUpdateCoordinator(DataUpdateCoordinator):
                             self.intensity = self.connection.intensity
                             self.rtsData = self.connection.rtsData
                             self.tsunamiData = self.connection.tsunamiData
+                            await self._async_dispatch_events()
 
                             self.status = SUBSCRIBE_PLAN
                         else:
@@ -237,6 +275,7 @@ class tremUpdateCoordinator(DataUpdateCoordinator):
 
                     resp = await response.json()
                     self.earthquakeData = resp
+                    await self._async_dispatch_events()
                 else:
                     self.retry = self.retry + 1
 
@@ -270,6 +309,188 @@ class tremUpdateCoordinator(DataUpdateCoordinator):
 
         return self
 
+    def get_eew(self, data: dict) -> EEW | None:
+        """Return the parsed EEW of the data if it is the current serial."""
+
+        if self.eew is not None and (self.eew.id, self.eew.serial) == (
+            data["id"],
+            data["serial"],
+        ):
+            return self.eew
+        return None
+
+    def parse_eew(self, data: dict) -> tuple[EEW, float, float]:
+        """Parse the EEW and calculate the expected intensity, return the stage times.
+
+        Runs in the executor, the wave model of a new depth takes a few hundred ms.
+        """
+
+        start = time.perf_counter()
+        eew = EEW.from_dict(data)
+        parsed = time.perf_counter()
+        eew.earthquake.calc_expected_intensity(self.calc_regions)
+        return eew, parsed - start, time.perf_counter() - parsed
+
+    async def async_update_eew(
+        self, data: dict, record: bool = True, fire: bool = True
+    ) -> bool:
+        """Parse the EEW in the executor and fire the event if it is a new serial."""
+
+        if self.get_eew(data) is not None:
+            return False
+
+        eew, parseSec, intensitySec = await self._hass.async_add_executor_job(
+            self.parse_eew, data
+        )
+        # Another update may have set the same serial meanwhile
+        if self.get_eew(data) is not None:
+            return False
+
+        self.latency.record("parse", parseSec)
+        self.latency.record("intensity", intensitySec)
+        if self.eew is not None:
+            self.eew.earthquake.release_maps()
+        self.eew = eew
+
+        # Simulated EEW are not part of the exposure statistics and the snapshot
+        if record:
+            self.exposure.record(eew)
+            self._async_schedule_snapshot()
+            self._async_record("eew", data["id"], data["serial"], data)
+        if fire:
+            self.async_fire_eew()
+        return True
+
+    @callback
+    def async_fire_eew(self) -> None:
+        """Fire the EEW event with the expected intensity of the monitored regions."""
+
+        eew = self.eew
+        if eew is None:
+            return
+
+        earthquake = eew.earthquake
+        expected_intensity = earthquake._expected_intensity  # noqa: SLF001
+        regions: dict = {}
+        for region in self.regions:
+            expected = expected_intensity.get(region.code)
+            if expected is None:
+                continue
+
+            estimate = int(expected.distance.s_left_time().total_seconds())
+            regions[region.code] = {
+                "name": region.name,
+                "intensity": expected.level,
+                "estimate": estimate if estimate > 0 else 0,
+                "p_arrival_time": expected.distance.p_arrival_time.isoformat(),
+                "s_arrival_time": expected.distance.s_arrival_time.isoformat(),
+            }
+
+        self._hass.bus.async_fire(
+            EVENT_EEW,
+            {
+                "id": eew.id,
+                "serial": eew.serial,
+                "final": eew.final,
+                "provider": eew.provider.name,
+                "time": earthquake.time.isoformat(),
+                "longitude": earthquake.lon,
+                "latitude": earthquake.lat,
+                "depth": earthquake.depth,
+                "magnitude": earthquake.mag,
+                "location": earthquake.location.display_name or "",
+                "regions": regions,
+                # The regions that the P wave has reached when the event is fired
+                "affected_regions": [
+                    region.code for region in earthquake.get_affected_regions()
+                ],
+                "city_max_intensity": {
+                    city: expected.level
+                    for city, expected in earthquake._city_max_intensity.items()  # noqa: SLF001
+                },
+            },
+        )
+
+    async def _async_dispatch_events(self) -> None:
+        """Fire the events of the new received data."""
+
+        if isinstance(self.earthquakeData, list) and len(self.earthquakeData) > 0:
+            await self.async_update_eew(self.earthquakeData[0])
+
+        intensity = self.intensity
+        if intensity.get("id", False):
+            intensitySerial = f"{intensity["id"]} (Serial {intensity.get("serial", 0)})"
+            if intensitySerial != self._intensitySerial:
+                self._intensitySerial = intensitySerial
+                self._async_record(
+                    "intensity", intensity["id"], intensity.get("serial", 0), intensity
+                )
+
+        rts: list = self.rtsData.get("int", [])
+        rtsTime = self.rtsData.get("time")
+        if len(rts) > 0 and rtsTime != self._rtsTime:
+            self._rtsTime = rtsTime
+            self._hass.bus.async_fire(
+                EVENT_RTS,
+                {
+                    "time": rtsTime,
+                    "max_intensity": max(k["i"] for k in rts),
+                    "intensity": {k["code"]: k["i"] for k in rts},
+                },
+            )
+
+        tsunami = self.tsunamiData
+        if tsunami.get("id", False):
+            tsunamiSerial = f"{tsunami["id"]} (Serial {tsunami["serial"]})"
+            if tsunamiSerial != self._tsunamiSerial:
+                self._tsunamiSerial = tsunamiSerial
+                self._async_record("tsunami", tsunami["id"], tsunami["serial"], tsunami)
+                self._hass.bus.async_fire(
+                    EVENT_TSUNAMI,
+                    {
+                        "id": tsunami["id"],
+                        "serial": tsunami["serial"],
+                        "provider": tsunami.get("author", ""),
+                        "time": tsunami.get("time"),
+                        "content": tsunami.get("content", ""),
+                    },
+                )
+
+    @callback
+    def _async_schedule_snapshot(self) -> None:
+        """Save the warm restart snapshot after a delay."""
+
+        if self.snapshot is not None:
+            self.snapshot.async_delay_save(self.snapshot_data, SNAPSHOT_DELAY)
+
+    def snapshot_data(self) -> dict:
+        """Return the warm restart snapshot data."""
+
+        eewData = (
+            self.earthquakeData[0]
+            if isinstance(self.earthquakeData, list) and len(self.earthquakeData) > 0
+            else None
+        )
+        return {
+            "eew": eewData,
+            "exposure": self.exposure.export(),
+            "wave_models": export_wave_models(),
+        }
+
+    @callback
+    def _async_record(
+        self, event_type: str, event_id: str, serial: int, data: dict
+    ) -> None:
+        """Append the received event to the history store."""
+
+        if self.history is None:
+            return
+
+        received = int(SERVER_CLOCK.timestamp() * 1000)
+        self._hass.async_add_executor_job(
+            self.history.append, event_type, str(event_id), int(serial), data, received
+        )
+
     def get_route(self, exclude: dict | None = None):
         """Random the node for fetching data."""
 
@@ -1,5 +1,6 @@
 """utils for the Taiwan Real-time Earthquake Monitoring."""
 
+import re
 from typing import Any
 
 
@@ -23,3 +24,33 @@ class _Missing:
 
 
 MISSING: Any = _Missing()
+
+
+def parse_coordinates(value: str) -> list[tuple[str, float, float]]:
+    """
+    Parse the user-defined coordinates.
+
+    Entries are separated by `;` or new line, each entry is `name,latitude,longitude`
+    or `latitude,longitude`.
+
+    :param value: The coordinates string.
+    :type value: str
+    :return: List of (name, latitude, longitude).
+    :rtype: list[tuple[str, float, float]]
+    :raises ValueError: If the coordinates are invalid.
+    """
+    coordinates: list[tuple[str, float, float]] = []
+    for entry in re.split(r"[;\n]", value or ""):
+        fields = [field.strip() for field in entry.split(",")]
+        if fields == [""]:
+            continue
+        if len(fields) == 2:
+            fields.insert(0, f"{fields[0]},{fields[1]}")
+        if len(fields) != 3 or not fields[0]:
+            raise ValueError(f"Invalid coordinate: {entry}")
+
+        name, lat, lon = fields[0], float(fields[1]), float(fields[2])
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            raise ValueError(f"Coordinate out of range: {entry}")
+        coordinates.append((name, lat, lon))
+    return coordinates
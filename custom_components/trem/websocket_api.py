@@ -0,0 +1,65 @@
+"""Websocket API for the Taiwan Real-time Earthquake Monitoring."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN, TREM_COORDINATOR
+from .earthquake.clock import SERVER_CLOCK
+from .earthquake.layer import IntensityLayer
+from .update_coordinator import tremUpdateCoordinator
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the TREM websocket commands."""
+
+    websocket_api.async_register_command(hass, websocket_subscribe_layer)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/layer/subscribe",
+        vol.Required("entry_id"): str,
+    }
+)
+@callback
+def websocket_subscribe_layer(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Subscribe to the vector intensity layer of the EEW."""
+
+    domain_data: dict | None = hass.data.get(DOMAIN, {}).get(msg["entry_id"])
+    if domain_data is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Config entry not found"
+        )
+        return
+
+    coordinator: tremUpdateCoordinator = domain_data[TREM_COORDINATOR]
+    layer = IntensityLayer()
+
+    @callback
+    def _send_layer() -> None:
+        """Send the changes of the layer since the last message."""
+
+        eew = coordinator.eew
+        if eew is None:
+            return
+
+        time = (SERVER_CLOCK.now() - eew.earthquake.time).total_seconds()
+        message = layer.update(eew, time)
+        if message["type"] == "waves" and "waves" not in message:
+            return
+        connection.send_message(websocket_api.event_message(msg["id"], message))
+
+    connection.subscriptions[msg["id"]] = coordinator.async_add_listener(_send_layer)
+    connection.send_result(msg["id"])
+    _send_layer()
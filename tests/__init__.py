@@ -0,0 +1 @@
+"""Tests for the Taiwan Real-time Earthquake Monitoring integration."""
@@ -0,0 +1,54 @@
+"""Tests for the batch catalog evaluation."""
+
+import numpy as np
+import pytest
+
+from custom_components.trem.earthquake.batch import evaluate_catalog
+from custom_components.trem.earthquake.eew import EarthquakeData
+from custom_components.trem.earthquake.location import REGIONS
+from custom_components.trem.earthquake.scenario import (
+    generate_catalog,
+    generate_serials,
+    simulate,
+)
+
+REGION_LIST = list(REGIONS.values())[::10]
+
+
+@pytest.fixture(scope="module")
+def eews() -> list[dict]:
+    """The serials of a small seeded catalog."""
+
+    rng = np.random.default_rng(7)
+    return [
+        eew
+        for event in generate_catalog(12, rng=rng)
+        for eew in generate_serials(event, serials=2, rng=rng)
+    ]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_evaluate_catalog_matches_simulate(eews: list[dict], max_workers: int) -> None:
+    """The columnar evaluation matches the per-EEW simulator, in the catalog order."""
+
+    earthquakes = [EarthquakeData.from_dict(eew["eq"]) for eew in eews]
+    results = evaluate_catalog(
+        earthquakes, REGION_LIST, max_workers=max_workers, chunk_size=5
+    )
+    columns = results.to_columns()
+    rows = simulate(eews, REGION_LIST)
+
+    assert results.intensity.shape == (len(eews), len(REGION_LIST))
+    assert columns["code"].tolist() == rows["code"]
+    # The simulator rounds the distance and travel times to 2 and the intensity to 3 decimals
+    np.testing.assert_allclose(columns["distance"], rows["distance"], atol=0.005)
+    np.testing.assert_allclose(columns["intensity"], rows["intensity"], atol=0.0005)
+    np.testing.assert_allclose(columns["p_travel"], rows["p_travel"], atol=0.005)
+    np.testing.assert_allclose(columns["s_travel"], rows["s_travel"], atol=0.005)
+
+
+def test_evaluate_catalog_empty() -> None:
+    """An empty catalog gives empty matrices."""
+
+    results = evaluate_catalog([], REGION_LIST)
+    assert results.intensity.shape == (0, len(REGION_LIST))
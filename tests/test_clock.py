@@ -0,0 +1,83 @@
+"""Tests for the server clock."""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.trem.earthquake import clock
+from custom_components.trem.earthquake.clock import ServerClock
+
+
+@pytest.fixture
+def fake_time(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    """A wall clock and a monotonic clock set by the test."""
+
+    now = SimpleNamespace(wall=1_700_000_000.0, monotonic=100.0)
+    monkeypatch.setattr(
+        clock,
+        "time",
+        SimpleNamespace(time=lambda: now.wall, monotonic=lambda: now.monotonic),
+    )
+    return now
+
+
+def _advance(now: SimpleNamespace, seconds: float, step: float = 0.0) -> None:
+    """Advance both clocks, then step the wall clock."""
+
+    now.wall += seconds + step
+    now.monotonic += seconds
+
+
+def test_offset_smallest_delay(fake_time: SimpleNamespace) -> None:
+    """The sample with the smallest network delay (largest offset) is used."""
+
+    server_clock = ServerClock(max_samples=3)
+    assert not server_clock.synced
+    assert server_clock.offset == 0
+
+    base = fake_time.wall
+    server_clock.sync((base + 2.0) * 1000, base + 0.5)
+    server_clock.sync((base + 3.0) * 1000, base + 1.2)
+    server_clock.sync((base + 4.0) * 1000, base + 2.9)
+    assert server_clock.synced
+    assert server_clock.offset == pytest.approx(1.8)
+
+    # The best sample leaves the window of the recent samples
+    server_clock.sync((base + 5.0) * 1000, base + 3.6)
+    server_clock.sync((base + 6.0) * 1000, base + 4.5)
+    assert server_clock.offset == pytest.approx(1.5)
+
+
+def test_sync_ignores_missing_server_time(fake_time: SimpleNamespace) -> None:
+    """A frame without the server time is not a sample."""
+
+    server_clock = ServerClock()
+    server_clock.sync(0)
+    assert not server_clock.synced
+
+
+def test_wall_clock_before_sync(fake_time: SimpleNamespace) -> None:
+    """Before the first sample the wall clock is followed, including its steps."""
+
+    server_clock = ServerClock()
+    _advance(fake_time, 5, step=3600)
+    assert server_clock.local_timestamp() == fake_time.wall
+    assert server_clock.timestamp() == fake_time.wall
+
+
+def test_monotonic_after_sync(fake_time: SimpleNamespace) -> None:
+    """Once synchronized the clock is anchored at the first sample and ignores the steps."""
+
+    server_clock = ServerClock()
+    _advance(fake_time, 5, step=3600)
+    anchor = fake_time.wall
+    server_clock.sync((anchor + 0.25) * 1000)
+    assert server_clock.offset == pytest.approx(0.25)
+
+    _advance(fake_time, 10, step=-120)
+    assert server_clock.local_timestamp() == pytest.approx(anchor + 10)
+    assert server_clock.timestamp() == pytest.approx(anchor + 10.25)
+    assert server_clock.now() == datetime.fromtimestamp(
+        anchor + 10.25, tz=timezone.utc
+    )
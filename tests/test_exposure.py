@@ -0,0 +1,68 @@
+"""Tests for the exposure statistics."""
+
+from custom_components.trem.const import EXPOSURE_MAX_AGE, EXPOSURE_MAX_EVENTS
+from custom_components.trem.earthquake.model import INTENSITY_DISPLAY
+from custom_components.trem.exposure import RegionExposure
+
+DAY = 86400.0
+
+
+def _exposure() -> RegionExposure:
+    return RegionExposure(EXPOSURE_MAX_EVENTS, EXPOSURE_MAX_AGE)
+
+
+def test_interleaved_serials() -> None:
+    """Serials of concurrent events are deduplicated by event id."""
+
+    exposure = _exposure()
+    exposure.record(0, "A", 2, 10.0)
+    exposure.record(1, "B", 4, 20.0)
+    exposure.record(0, "A", 3, 5.0)
+
+    summary = exposure.summary()
+    assert summary["count"] == 2
+    assert sum(summary["counts"].values()) == 2
+    assert summary["counts"][INTENSITY_DISPLAY[3]] == 1
+    assert summary["counts"][INTENSITY_DISPLAY[2]] == 0
+    assert summary["max_intensity"] == INTENSITY_DISPLAY[4]
+    # The ETA of the first serial of A is kept
+    assert summary["mean_eta"] == 15.0
+    assert exposure.export() == [(0, "A", 3, 10.0), (1, "B", 4, 20.0)]
+
+
+def test_max_events() -> None:
+    """The oldest event is evicted beyond the max events."""
+
+    exposure = _exposure()
+    for i in range(EXPOSURE_MAX_EVENTS + 1):
+        exposure.record(i, str(i), i % 3, 1.0)
+
+    summary = exposure.summary()
+    assert summary["count"] == EXPOSURE_MAX_EVENTS
+    assert sum(summary["counts"].values()) == EXPOSURE_MAX_EVENTS
+    assert summary["mean_eta"] == 1.0
+    assert exposure.export()[0][1] == "1"
+    # A new serial of the evicted event is a new entry
+    exposure.record(EXPOSURE_MAX_EVENTS + 1, "0", 1, 1.0)
+    assert exposure.count == EXPOSURE_MAX_EVENTS
+    assert exposure.export()[0][1] == "2"
+
+
+def test_max_age() -> None:
+    """The events older than the max age expire."""
+
+    exposure = _exposure()
+    exposure.record(0, "old", 5, 3.0)
+    exposure.record(DAY, "recent", 1, 7.0)
+    exposure.record(30 * DAY, "now", 1, 8.0)
+    assert exposure.count == 3
+
+    exposure.expire(30 * DAY + 1)
+    assert [entry[1] for entry in exposure.export()] == ["recent", "now"]
+    summary = exposure.summary()
+    assert summary["max_intensity"] == INTENSITY_DISPLAY[1]
+    assert summary["mean_eta"] == 7.5
+
+    exposure.expire(100 * DAY)
+    assert exposure.count == 0
+    assert exposure.summary()["mean_eta"] is None
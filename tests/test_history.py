@@ -0,0 +1,94 @@
+"""Tests for the persistent event history."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from custom_components.trem.history import HistoryStore
+
+
+def _ms(moment: datetime) -> int:
+    return int(moment.timestamp() * 1000)
+
+
+@pytest.fixture
+def store(tmp_path):
+    """An opened store with a 7 day retention."""
+
+    store = HistoryStore(str(tmp_path / "trem" / "history.db"), timedelta(days=7))
+    store.open()
+    yield store
+    store.close()
+
+
+def test_append_dedupe(store: HistoryStore) -> None:
+    """A serial is recorded once per event type and id."""
+
+    now = _ms(datetime.now())
+    assert store.append("eew", "1", 1, {"serial": 1}, now)
+    assert not store.append("eew", "1", 1, {"serial": 1, "dup": True}, now + 1)
+    assert store.append("eew", "1", 2, {"serial": 2}, now + 2)
+    # The same id and serial of another type is another event
+    assert store.append("intensity", "1", 1, {"serial": 1}, now + 3)
+
+    events = store.query(limit=10)
+    assert [(event["type"], event["serial"]) for event in events] == [
+        ("intensity", 1),
+        ("eew", 2),
+        ("eew", 1),
+    ]
+    assert events[2]["data"] == {"serial": 1}
+
+
+def test_query_filters(store: HistoryStore) -> None:
+    """The events are filtered by time range, type and id, newest first."""
+
+    base = datetime.now() - timedelta(hours=1)
+    for i, (event_type, event_id) in enumerate(
+        [("eew", "a"), ("eew", "b"), ("tsunami", "a"), ("eew", "a"), ("intensity", "c")]
+    ):
+        store.append(event_type, event_id, i, {"i": i}, _ms(base + timedelta(minutes=i)))
+
+    def serials(**kwargs) -> list[int]:
+        return [event["serial"] for event in store.query(**kwargs)]
+
+    assert serials() == [4, 3, 2, 1, 0]
+    assert serials(event_type="eew") == [3, 1, 0]
+    assert serials(event_id="a") == [3, 2, 0]
+    assert serials(event_type="eew", event_id="a") == [3, 0]
+    assert serials(start=base + timedelta(minutes=1)) == [4, 3, 2, 1]
+    assert serials(end=base + timedelta(minutes=2)) == [2, 1, 0]
+    assert serials(
+        start=base + timedelta(minutes=1), end=base + timedelta(minutes=3)
+    ) == [3, 2, 1]
+    assert serials(limit=2) == [4, 3]
+    assert serials(event_type="eew", limit=1) == [3]
+
+
+def test_prune(store: HistoryStore) -> None:
+    """The events older than the retention are deleted."""
+
+    now = datetime.now()
+    store.append("eew", "old", 1, {}, _ms(now - timedelta(days=8)))
+    store.append("eew", "edge", 1, {}, _ms(now - timedelta(days=6)))
+    store.append("eew", "new", 1, {}, _ms(now))
+
+    assert store.prune() == 1
+    assert [event["id"] for event in store.query()] == ["new", "edge"]
+    assert store.prune() == 0
+
+
+def test_closed(tmp_path) -> None:
+    """A closed store ignores the appends and returns no events."""
+
+    store = HistoryStore(str(tmp_path / "history.db"), timedelta(days=7))
+    assert not store.append("eew", "1", 1, {}, _ms(datetime.now()))
+    assert store.query() == []
+    assert store.prune() == 0
+
+    store.open()
+    store.append("eew", "1", 1, {}, _ms(datetime.now()))
+    store.close()
+    store.open()
+    assert len(store.query()) == 1
+    store.close()
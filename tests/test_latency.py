@@ -0,0 +1,85 @@
+"""Tests for the latency histograms."""
+
+import pytest
+
+from custom_components.trem.latency import (
+    _BUCKET_BOUNDS,
+    LATENCY_STAGES,
+    LatencyHistogram,
+    LatencyTracker,
+)
+
+
+def test_empty() -> None:
+    """An empty histogram has no statistics."""
+
+    histogram = LatencyHistogram()
+    assert histogram.percentile(50) is None
+    assert histogram.summary() == {
+        "count": 0,
+        "mean": None,
+        "p50": None,
+        "p95": None,
+        "p99": None,
+        "max": None,
+    }
+
+
+def test_bucket_bounds() -> None:
+    """A latency on a bucket bound is in that bucket, the percentile is capped by the max."""
+
+    histogram = LatencyHistogram()
+    histogram.record(_BUCKET_BOUNDS[10])
+    assert histogram.percentile(100) == _BUCKET_BOUNDS[10]
+
+    histogram = LatencyHistogram()
+    latency = (_BUCKET_BOUNDS[10] + _BUCKET_BOUNDS[11]) / 2
+    histogram.record(latency)
+    assert histogram.percentile(50) == latency
+
+
+def test_percentiles() -> None:
+    """The percentiles are the upper bounds of their buckets, within one 12.5% step."""
+
+    histogram = LatencyHistogram()
+    for ms in range(1, 101):
+        histogram.record(ms / 1000)
+
+    assert histogram.count == 100
+    for q in (50, 95, 99):
+        assert q / 1000 <= histogram.percentile(q) <= q / 1000 * 1.125
+    assert histogram.percentile(100) == pytest.approx(0.1)
+    assert 0.001 <= histogram.percentile(0) <= 0.001 * 1.125
+
+    summary = histogram.summary()
+    assert summary["count"] == 100
+    assert summary["mean"] == 50.5
+    assert summary["max"] == 100.0
+    assert summary["p50"] <= summary["p95"] <= summary["p99"] <= summary["max"]
+
+
+def test_overflow() -> None:
+    """A latency over the last bucket bound is reported as the max."""
+
+    histogram = LatencyHistogram()
+    histogram.record(0.01)
+    histogram.record(_BUCKET_BOUNDS[-1] * 2)
+    assert histogram.percentile(100) == _BUCKET_BOUNDS[-1] * 2
+    assert histogram.percentile(50) <= 0.01 * 1.125
+
+
+def test_tracker() -> None:
+    """The tracker has one histogram per stage."""
+
+    tracker = LatencyTracker()
+    tracker.record("parse", 0.002)
+    with tracker.measure("render"):
+        pass
+
+    summary = tracker.summary()
+    assert list(summary) == LATENCY_STAGES
+    assert summary["parse"]["count"] == 1
+    assert summary["render"]["count"] == 1
+    assert summary["state"]["count"] == 0
+    with pytest.raises(KeyError):
+        tracker.record("unknown", 1)
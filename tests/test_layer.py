@@ -0,0 +1,99 @@
+"""Tests for the vector intensity layer messages."""
+
+import numpy as np
+
+from custom_components.trem.earthquake.eew import EEW
+from custom_components.trem.earthquake.layer import (
+    TOWN_KEYS,
+    WAVE_MAX_DISTANCE,
+    IntensityLayer,
+    town_levels,
+)
+
+
+def _eew(event_id: str, serial: int, mag: float) -> EEW:
+    eew = EEW.from_dict(
+        {
+            "author": "cwa",
+            "id": event_id,
+            "serial": serial,
+            "final": 0,
+            "eq": {
+                "time": 1712102038000,
+                "lon": 121.67,
+                "lat": 23.77,
+                "depth": 15,
+                "mag": mag,
+                "loc": "",
+            },
+            "time": 1712102056000,
+        }
+    )
+    eew.earthquake.calc_expected_intensity()
+    return eew
+
+
+def _apply(levels: np.ndarray, message: dict) -> np.ndarray:
+    """Apply the towns of a message to the levels of the client."""
+
+    levels = levels.copy() if message["type"] == "delta" else np.zeros_like(levels)
+    rows = {key: row for row, key in enumerate(TOWN_KEYS)}
+    for code, level in zip(message["towns"]["code"], message["towns"]["level"]):
+        levels[rows[code]] = level
+    return levels
+
+
+def test_full_delta_waves() -> None:
+    """The first serial is a full frame, the later serials are deltas."""
+
+    layer = IntensityLayer()
+    first = _eew("1", 1, 6.0)
+    message = layer.update(first)
+    assert message["type"] == "full"
+    assert message["serial"] == 1
+    assert message["epicenter"] == [121.67, 23.77]
+    assert "waves" not in message
+    # The full frame only carries the towns with a level
+    assert 0 not in message["towns"]["level"]
+    client = _apply(np.zeros(len(TOWN_KEYS), dtype=np.int8), message)
+    assert np.array_equal(client, town_levels(first.earthquake))
+
+    # A serial whose town levels do not change has an empty delta
+    message = layer.update(_eew("1", 2, 6.0))
+    assert message["type"] == "delta"
+    assert message["towns"] == {"code": [], "level": []}
+
+    stronger = _eew("1", 3, 7.0)
+    message = layer.update(stronger)
+    assert message["type"] == "delta"
+    assert 0 < len(message["towns"]["code"]) < len(TOWN_KEYS)
+    client = _apply(client, message)
+    assert np.array_equal(client, town_levels(stronger.earthquake))
+
+    # The same serial only carries the waves
+    message = layer.update(stronger, 10)
+    assert message == {
+        "id": "1",
+        "serial": 3,
+        "type": "waves",
+        "waves": message["waves"],
+    }
+    assert message["waves"]["time"] == 10
+    assert 0 < message["waves"]["s"] < message["waves"]["p"] < WAVE_MAX_DISTANCE
+
+    # A new event is a full frame again
+    message = layer.update(_eew("2", 1, 5.0))
+    assert message["type"] == "full"
+    assert message["id"] == "2"
+
+
+def test_waves_omitted() -> None:
+    """The radii are omitted before the origin and after the S wave passed the max distance."""
+
+    layer = IntensityLayer()
+    eew = _eew("1", 1, 6.0)
+    layer.update(eew)
+    assert "waves" not in layer.update(eew, 0)
+    assert "waves" in layer.update(eew, 60)
+    assert "waves" not in layer.update(eew, 400)
+    assert layer.update(eew, 400)["type"] == "waves"
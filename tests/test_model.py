@@ -0,0 +1,95 @@
+"""Tests for the intensity model."""
+
+import math
+
+import numpy as np
+import pytest
+
+from custom_components.trem.earthquake.model import (
+    INTENSITY_THRESHOLDS,
+    _calculate_intensity,
+    _calculate_intensity_array,
+    classify_intensity,
+    round_intensity,
+)
+
+
+def _sweep() -> list[float]:
+    """Values on, just below and just above every threshold, and out of range."""
+
+    values = [-math.inf, -10.0, -0.5, -1e-9, 0.0, 0.49, 7.0, 10.0, math.inf]
+    for threshold in INTENSITY_THRESHOLDS:
+        values += [
+            math.nextafter(threshold, -math.inf),
+            threshold,
+            math.nextafter(threshold, math.inf),
+            threshold - 0.01,
+            threshold + 0.01,
+        ]
+    return values
+
+
+def test_thresholds() -> None:
+    """A value on a threshold belongs to the upper level."""
+
+    for level, threshold in enumerate(INTENSITY_THRESHOLDS, start=1):
+        assert round_intensity(threshold) == level
+        assert round_intensity(math.nextafter(threshold, -math.inf)) == level - 1
+    assert round_intensity(0.5) == 1
+    assert round_intensity(2.5) == 3
+    assert round_intensity(4.4) == 4
+    assert round_intensity(6.4) == 8
+
+
+@pytest.mark.parametrize("value", [-math.inf, -10.0, -1e-9])
+def test_negative(value: float) -> None:
+    """Negative values are level 0."""
+
+    assert round_intensity(value) == 0
+    assert classify_intensity(np.array([value])).tolist() == [0]
+
+
+def test_nan() -> None:
+    """NaN is level 0 in the scalar and the array versions."""
+
+    assert round_intensity(math.nan) == 0
+    assert classify_intensity(np.array([math.nan, 3.0])).tolist() == [0, 3]
+
+
+def test_scalar_array_agree() -> None:
+    """The scalar and the array versions agree across every threshold."""
+
+    values = _sweep() + [math.nan]
+    levels = classify_intensity(np.array(values))
+    assert levels.dtype == np.int8
+    assert levels.tolist() == [round_intensity(value) for value in values]
+    assert max(levels.tolist()) == len(INTENSITY_THRESHOLDS)
+
+
+@pytest.mark.parametrize(("magnitude", "depth"), [(3.5, 5), (5.8, 20), (7.3, 10), (8.5, 60)])
+def test_intensity_array_matches_scalar(magnitude: float, depth: int) -> None:
+    """The array formula matches the scalar one in the PGA-only and the PGV (i > 3) regions."""
+
+    distance = np.geomspace(depth, 1500, 400)
+    site_effect = np.resize([0.8, 1.2, 1.751, 2.4], distance.shape)
+    expected = np.array(
+        [
+            _calculate_intensity(d, magnitude, depth, s)
+            for d, s in zip(distance.tolist(), site_effect.tolist())
+        ]
+    )
+    actual = _calculate_intensity_array(distance, magnitude, depth, site_effect)
+    np.testing.assert_allclose(actual, expected, rtol=0, atol=1e-9)
+
+
+def test_intensity_array_covers_both_formulas() -> None:
+    """The sampled range reaches both the PGA-only and the PGV formula."""
+
+    distance = np.geomspace(10, 1500, 400)
+    site_effect = np.full(distance.shape, 1.751)
+    pga = 2 * np.log10(1.657 * np.exp(1.533 * 7.3) * distance**-1.607 * site_effect) + 0.7
+    assert (pga > 3).any() and (pga <= 3).any()
+    np.testing.assert_allclose(
+        _calculate_intensity_array(distance, 7.3, 10, site_effect)[pga <= 3],
+        pga[pga <= 3],
+    )
@@ -0,0 +1,117 @@
+"""Tests for the earthquake scenario simulator."""
+
+import csv
+
+import numpy as np
+import pytest
+
+from custom_components.trem.earthquake.location import REGIONS
+from custom_components.trem.earthquake.scenario import (
+    MAX_SCENARIO_EEWS,
+    SCENARIO_COLUMNS,
+    generate_catalog,
+    generate_serials,
+    simulate,
+    simulate_catalog,
+    write_table,
+)
+from custom_components.trem.earthquake.table import IntensityTable
+from custom_components.trem.utils import MISSING
+
+EVENT = {
+    "id": "1",
+    "time": 1700000000000,
+    "lon": 121.6,
+    "lat": 23.8,
+    "depth": 15,
+    "mag": 6.3,
+    "loc": "",
+}
+
+
+@pytest.fixture(scope="module")
+def eews() -> list[dict]:
+    """The serials of a synthetic event."""
+
+    return generate_serials(EVENT, serials=3, rng=np.random.default_rng(0))
+
+
+def test_simulate_exact(eews: list[dict]) -> None:
+    """Without a table the exact formula is used, one row per EEW and region."""
+
+    rows = simulate(eews)
+    assert list(rows) == SCENARIO_COLUMNS
+    assert len(rows["code"]) == len(eews) * len(REGIONS)
+    assert all(len(column) == len(rows["code"]) for column in rows.values())
+    assert max(rows["level"]) > 0
+
+
+def test_simulate_table(eews: list[dict]) -> None:
+    """The table path stays within the error bound of the exact path."""
+
+    table = IntensityTable()
+    exact = simulate(eews)
+    approximate = simulate(eews, table=table)
+    assert approximate["code"] == exact["code"]
+    assert approximate["p_travel"] == exact["p_travel"]
+    error = np.abs(np.array(approximate["intensity"]) - np.array(exact["intensity"]))
+    # The intensities are rounded to 3 decimals
+    assert np.max(error) <= table.max_error + 0.001
+
+
+def test_simulate_catalog(tmp_path) -> None:
+    """The streamed batch run writes the same table as the per-EEW simulator."""
+
+    regions = list(REGIONS.values())[::20]
+    catalog = generate_catalog(4, rng=np.random.default_rng(1))
+    rows = simulate_catalog(
+        catalog,
+        str(tmp_path / "batch.csv"),
+        serials=3,
+        regions=regions,
+        rng=np.random.default_rng(2),
+        max_workers=1,
+    )
+
+    rng = np.random.default_rng(2)
+    eews = [eew for event in catalog for eew in generate_serials(event, 3, rng=rng)]
+    assert rows == write_table(simulate(eews, regions), str(tmp_path / "exact.csv"))
+    with (
+        open(tmp_path / "batch.csv", encoding="utf-8") as batch,
+        open(tmp_path / "exact.csv", encoding="utf-8") as exact,
+    ):
+        assert list(csv.reader(batch)) == list(csv.reader(exact))
+
+
+def test_simulate_catalog_limit(tmp_path) -> None:
+    """A run over the EEW limit is rejected before anything is written."""
+
+    catalog = generate_catalog(MAX_SCENARIO_EEWS // 10 + 1)
+    with pytest.raises(ValueError):
+        simulate_catalog(catalog, str(tmp_path / "table.csv"), serials=10)
+    assert not (tmp_path / "table.csv").exists()
+
+
+def test_simulate_catalog_table(tmp_path) -> None:
+    """The streamed run with the lookup table stays within its error bound."""
+
+    regions = list(REGIONS.values())[::20]
+    catalog = generate_catalog(4, rng=np.random.default_rng(1))
+    table = IntensityTable()
+    for name, run_table in (("exact.csv", MISSING), ("table.csv", table)):
+        simulate_catalog(
+            catalog,
+            str(tmp_path / name),
+            serials=3,
+            regions=regions,
+            table=run_table,
+            rng=np.random.default_rng(2),
+            max_workers=1,
+        )
+
+    intensities = []
+    for name in ("exact.csv", "table.csv"):
+        with open(tmp_path / name, encoding="utf-8") as f:
+            intensities.append([float(row["intensity"]) for row in csv.DictReader(f)])
+    error = np.abs(np.array(intensities[0]) - np.array(intensities[1]))
+    assert np.max(error) <= table.max_error + 0.001
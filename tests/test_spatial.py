@@ -0,0 +1,152 @@
+"""Tests for the region spatial index, against a brute-force haversine over the regions."""
+
+from datetime import timedelta
+import math
+
+import numpy as np
+import pytest
+
+from custom_components.trem.earthquake.eew import EEW
+from custom_components.trem.earthquake.location import REGIONS, Location
+from custom_components.trem.earthquake.model import EARTH_RADIUS
+from custom_components.trem.earthquake.spatial import REGION_INDEX
+
+LOCATIONS = [
+    Location(121.56, 25.03),  # Taipei
+    Location(120.68, 24.15),  # Taichung
+    Location(121.67, 23.77),  # Offshore Hualien
+    Location(122.5, 23.5),  # Pacific
+    Location(118.3, 24.43),  # Kinmen
+    Location(119.58, 23.57),  # Penghu
+]
+
+
+def _distances(location: Location) -> np.ndarray:
+    """The haversine distance in kilometers of every region to the location."""
+
+    lon = np.radians([region.lon for region in REGIONS.values()])
+    lat = np.radians([region.lat for region in REGIONS.values()])
+    lon0, lat0 = math.radians(location.lon), math.radians(location.lat)
+    a = (
+        np.sin((lat - lat0) / 2) ** 2
+        + np.cos(lat) * math.cos(lat0) * np.sin((lon - lon0) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(a))
+
+
+@pytest.mark.parametrize("location", LOCATIONS)
+@pytest.mark.parametrize("radius", [5.0, 30.0, 120.0, 500.0])
+def test_query_radius(location: Location, radius: float) -> None:
+    """The regions within the radius, in the order of the regions."""
+
+    distances = _distances(location)
+    result = REGION_INDEX.query_radius(location, radius)
+    regions = list(REGIONS.values())
+    rows = {region.code: row for row, region in enumerate(regions)}
+    assert [rows[region.code] for region in result] == sorted(
+        rows[region.code] for region in result
+    )
+
+    codes = {region.code for region in result}
+    for region, distance in zip(regions, distances):
+        # Skip the regions on the boundary, where the rounding may differ
+        if abs(distance - radius) > 1e-6:
+            assert (region.code in codes) == (distance < radius)
+
+
+def test_query_radius_empty() -> None:
+    """No region is within a non-positive radius."""
+
+    assert REGION_INDEX.query_radius(LOCATIONS[0], 0) == []
+    assert REGION_INDEX.query_radius(LOCATIONS[0], -10) == []
+    assert len(REGION_INDEX.query_radius(LOCATIONS[0], 2 * math.pi * EARTH_RADIUS)) == len(
+        REGIONS
+    )
+
+
+@pytest.mark.parametrize("location", LOCATIONS)
+def test_query_nearest(location: Location) -> None:
+    """The k nearest regions ordered by distance."""
+
+    distances = _distances(location)
+    expected = np.sort(distances)
+    rows = {region.code: row for row, region in enumerate(REGIONS.values())}
+    for k in (1, 5, 20):
+        result = REGION_INDEX.query_nearest(location, k)
+        assert len(result) == k
+        np.testing.assert_allclose(
+            [distances[rows[region.code]] for region in result], expected[:k]
+        )
+
+    assert REGION_INDEX.query_nearest(location, 0) == []
+    assert len(REGION_INDEX.query_nearest(location, len(REGIONS) + 10)) == len(REGIONS)
+
+
+def test_query_point() -> None:
+    """The region of the town polygon containing the location."""
+
+    regions = list(REGIONS.values())
+    found = [REGION_INDEX.query_point(region) for region in regions]
+    # The representative point of a few towns lies outside their polygon
+    assert sum(region is town for region, town in zip(regions, found)) >= len(regions) - 10
+    assert REGION_INDEX.query_point(Location(122.5, 23.5)) is None
+
+
+@pytest.mark.parametrize("location", LOCATIONS)
+def test_locate(location: Location) -> None:
+    """The region containing the location, or the nearest region offshore."""
+
+    region = REGION_INDEX.locate(location)
+    town = REGION_INDEX.query_point(location)
+    if town is not None:
+        assert region is town
+    else:
+        nearest = list(REGIONS.values())[int(np.argmin(_distances(location)))]
+        assert region is nearest
+
+
+def test_get_affected_regions() -> None:
+    """The regions reached by the P wave of the earthquake."""
+
+    earthquake = EEW.from_dict(
+        {
+            "author": "cwa",
+            "id": "1",
+            "serial": 1,
+            "final": 0,
+            "eq": {
+                "time": 1712102038000,
+                "lon": 121.67,
+                "lat": 23.77,
+                "depth": 15,
+                "mag": 7.1,
+                "loc": "",
+            },
+            "time": 1712102056000,
+        }
+    ).earthquake
+
+    assert earthquake.get_affected_regions(earthquake.time) == []
+    assert earthquake.get_affected_regions(earthquake.time - timedelta(seconds=1)) == []
+
+    distances = _distances(Location(121.67, 23.77))
+    regions = list(REGIONS.values())
+    previous = set()
+    for seconds in (5, 15, 30, 60):
+        p_dis, _ = earthquake.wave_model.get_arrival_distance(seconds)
+        radius = math.radians(p_dis) * EARTH_RADIUS
+        affected = {
+            region.code
+            for region in earthquake.get_affected_regions(
+                earthquake.time + timedelta(seconds=seconds)
+            )
+        }
+        expected = {
+            region.code
+            for region, distance in zip(regions, distances)
+            if distance < radius
+        }
+        assert affected == expected
+        assert previous <= affected
+        previous = affected
+    assert previous
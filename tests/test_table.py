@@ -0,0 +1,48 @@
+"""Tests for the precomputed intensity lookup table."""
+
+import numpy as np
+import pytest
+
+from custom_components.trem.earthquake.model import _calculate_intensity_array
+from custom_components.trem.earthquake.table import IntensityTable, _pgv_term
+
+
+@pytest.fixture(scope="module")
+def table() -> IntensityTable:
+    """Build the default table once."""
+
+    return IntensityTable()
+
+
+def test_max_error_bounds_dense_scan(table: IntensityTable) -> None:
+    """The bound holds on a scan 4 times denser than the validation."""
+
+    mags = np.linspace(0, 9.5, 95 * 16 + 1)
+    log_distance = np.linspace(0, np.log10(2000), 1023 * 16 + 1)
+    for mag in mags.tolist():
+        exact = _pgv_term(mag, 10**log_distance)
+        approximate = table._interpolate(np.asarray(mag), log_distance)  # noqa: SLF001
+        assert np.max(np.abs(exact - approximate)) <= table.max_error
+
+
+def test_max_error_off_cell_centers(table: IntensityTable) -> None:
+    """The bound holds at the largest error found away from the cell centers."""
+
+    distance = np.linspace(370, 385, 1501)
+    exact = _calculate_intensity_array(distance, 9.45, 10, np.full(distance.shape, 1.751))
+    approximate = table.lookup(distance, 9.45, 10, 1.751)
+    assert np.max(np.abs(exact - approximate)) > 0.085
+    assert np.max(np.abs(exact - approximate)) <= table.max_error
+
+
+def test_lookup_matches_exact(table: IntensityTable) -> None:
+    """Random lookups within the table ranges stay within the bound."""
+
+    rng = np.random.default_rng(0)
+    distance = rng.uniform(1, 2000, 10000)
+    site_effect = rng.uniform(0.5, 3, 10000)
+    for magnitude in rng.uniform(0, 9.5, 20).tolist():
+        depth = int(rng.integers(1, 300))
+        exact = _calculate_intensity_array(distance, magnitude, depth, site_effect)
+        approximate = table.lookup(distance, magnitude, depth, site_effect)
+        assert np.max(np.abs(exact - approximate)) <= table.max_error
@@ -0,0 +1,42 @@
+"""Tests for the integration utils."""
+
+import pytest
+
+from custom_components.trem.utils import parse_coordinates
+
+
+def test_parse_coordinates() -> None:
+    """Entries are separated by `;` or new lines, the name is optional."""
+
+    assert parse_coordinates("") == []
+    assert parse_coordinates(None) == []
+    assert parse_coordinates("Home, 25.03, 121.56") == [("Home", 25.03, 121.56)]
+    assert parse_coordinates("Home,25.03,121.56;Office,24.1,120.6\n\n23.5,121") == [
+        ("Home", 25.03, 121.56),
+        ("Office", 24.1, 120.6),
+        ("23.5,121", 23.5, 121.0),
+    ]
+    assert parse_coordinates("Edge,-90,180;\n") == [("Edge", -90.0, 180.0)]
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "Home 25.03 121.56",  # bad separator
+        "Home|25.03|121.56",
+        "Home,25.03,121.56,10",  # extra field
+        "25.03",
+        ",25.03,121.56",  # missing name
+        "Home,north,121.56",  # not a number
+        "Home,91,121.56",  # out of range latitude
+        "Home,25.03,-180.5",  # out of range longitude
+        "Home,nan,121.56",
+        "Home,25.03,inf",
+        "Home,25.03,121.56;Bad,1",  # one bad entry
+    ],
+)
+def test_parse_coordinates_invalid(value: str) -> None:
+    """Malformed entries raise ValueError."""
+
+    with pytest.raises(ValueError):
+        parse_coordinates(value)